@@ -4,10 +4,10 @@ La classe Arène
 Représente la zone où les dés sont lancés
 """
 
-import colorama
 from de import De
 from lancer import Lancer
 from joueur import Joueur
+from rendu_console import cases_trajectoire, cellule, ligne_exterieure, ligne_interieure, rangee
 
 
 class Arene:
@@ -68,7 +68,7 @@ class Arene:
         Args:
             lancer (Lancer): contient les informations sur le lancer à effectuer
         """
-        self.relancer_des_accroches(lancer.trajectoire)
+        self.relancer_des_accroches(lancer.cases_trajectoire())
         self.placer_nouveau_de(De(), lancer.trajectoire[-1])
 
 
@@ -80,12 +80,12 @@ class Arene:
         se trouve à cet emplacement, s'il y en a un.
 
         Args:
-            trajectoire (list): Liste des coordonnées où l'on doit relancer
+            trajectoire (list ou set): Les coordonnées où l'on doit relancer
         """
         # Torben
-        for i in self.des:
-            if i in trajectoire:
-                self.des[i].lancer()
+        # L'intersection avec les cases occupées évite de chercher chaque dé dans la trajectoire.
+        for i in self.des.keys() & trajectoire:
+            self.des[i].lancer()
 
 
     def placer_nouveau_de(self, de: De, emplacement_final: tuple):
@@ -209,12 +209,11 @@ class Arene:
 
         """
         # Torben
+        # Un seul parcours des dés: la valeur de chaque dé donne directement son compte.
         liste_a_rendre = []
-        for i in comptes:
-            if comptes[i] > 1:
-                for j in self.des:
-                    if self.des[j].valeur == i:
-                        liste_a_rendre.append(j)
+        for j in self.des:
+            if comptes[self.des[j].valeur] > 1:
+                liste_a_rendre.append(j)
 
         for i in liste_a_rendre:
             self.rendre_au_joueur(i, joueur_en_cours)
@@ -292,46 +291,21 @@ class Arene:
         trajectoire d'un lancer au besoin
 
         Args:
-            lancer (optionel): Une liste correspondand à une trajectoire
+            lancer (optionel): Un lancer, ou une liste ou un ensemble de coordonnées
+                correspondant à une trajectoire
 
         Returns:
             str: la représentation en chaîne de caractères
         """
-        if lancer is None:
-            trajectoire = []
-        elif type(lancer) is list:
-            trajectoire = lancer
-        else:
-            trajectoire = lancer.trajectoire
-
-        ligne_exterieure = '{:s}  |'
-        for x in list(range(self.dimension)):
-            ligne_exterieure += '{:^3d}'.format(x)
-        ligne_exterieure += "|  {:s}\n"
-
-        ligne_interieure = "----" + "|" + "-" * 3 * self.dimension + "|----\n"
-
-        m = "\n"
-        m += ligne_exterieure.format('NO', 'NE')
-        m += ligne_interieure
+        trajectoire = cases_trajectoire(lancer)
+        lignes = [ligne_exterieure(self.dimension, 'NO', 'NE'), ligne_interieure(self.dimension)]
         for i in range(self.dimension):
-            m += "{:>3d} |".format(i)
-            for j in range(self.dimension):
-                if (i, j) in trajectoire:
-                    m += colorama.Back.LIGHTYELLOW_EX + colorama.Fore.RED
-
-                if (i, j) in self.des:
-                    m += "{:^3s}".format(self.afficher_de((i, j)))
-                else:
-                    m += "   "
-
-                if (i, j) in trajectoire:
-                    m += colorama.Fore.RESET + colorama.Back.RESET
-
-            m += "| {:<3d} \n".format(i)
-        m += ligne_interieure
-        m += ligne_exterieure.format('SO', 'SE')
-        return m
+            cellules = [cellule(self.afficher_de((i, j)) if (i, j) in self.des else None, (i, j) in trajectoire)
+                        for j in range(self.dimension)]
+            lignes.append(rangee(i, cellules))
+        lignes.append(ligne_interieure(self.dimension))
+        lignes.append(ligne_exterieure(self.dimension, 'SO', 'SE'))
+        return "\n" + "\n".join(lignes) + "\n"
 
     def __str__(self):
         """
@@ -7,6 +7,7 @@ Il est déconseillé de modifier cette classe car cela pourrait facilement
 briser le fonctionnement du jeu (à l'exception des méthodes qui vous sont demandées!).
 """
 from joueur import Joueur
+from rendu_console import RenduConsole
 
 
 class Gladeateur:
@@ -17,17 +18,20 @@ class Gladeateur:
         arene (Arene): L'arène du jeu.
         joueur_index (int): L'index du joueur actif.
         premier_lancer (bool): False si le joueur actif a fait son premier lancé de dé, False sinon.
+        rendu (RenduConsole): L'affichage de l'arène, qui ne réécrit que ce qui a changé.
     """
-    def __init__(self, liste_joueurs, arene):
+    def __init__(self, liste_joueurs, arene, rendu=None):
         """
         Constructeur de la classe Gladeateur.
 
         Args:
             liste_joueurs (list): La liste des joueurs
             arene (Arene): L'arène du jeu
+            rendu (RenduConsole, optional): L'affichage de l'arène. Défaut: un RenduConsole sur sys.stdout
         """
         self.liste_joueurs = liste_joueurs
         self.arene = arene
+        self.rendu = RenduConsole() if rendu is None else rendu
         self.joueur_index = 0
         self.premier_lancer = True
 
@@ -36,6 +40,9 @@ class Gladeateur:
         Point d'entrée de la boucle de jeu. On commence par une sélection d'action.
 
         Voir les commentaires dans le code.
+
+        Returns:
+            Joueur: Le joueur victorieux
         """
         vainqueur = None
 
@@ -65,9 +72,11 @@ class Gladeateur:
             vainqueur = self.calculer_victoire()
 
         # Si le jeu est terminé, on affiche le joueur victorieux et on arrête
+        self.rendu.fermer()
         print("*" * 50)
         print(f"Victoire du {str(vainqueur)}")
         print("*" * 50)
+        return vainqueur
 
     def effectuer_tour(self, joueur):
         """
@@ -129,13 +138,13 @@ class Gladeateur:
         """
         print("Table rase! ")
         lancers = joueur.table_rase()
-        trajectoires = []
+        trajectoires = set()
         for lancer in lancers:
             print("Trajectoire : ", str(lancer))
-            trajectoires = trajectoires + lancer.trajectoire
+            trajectoires |= lancer.cases_trajectoire()
 
         self.arene.effectuer_plusieurs_lancers(lancers)
-        print(self.arene.affichage_string(trajectoires))
+        self.rendu.afficher(self.arene, trajectoires)
         self.arene.rangement(joueur)
 
     def afficher_arene(self, joueur, lancer=None):
@@ -147,7 +156,7 @@ class Gladeateur:
             joueur (Joueur): le joueur dont c'est le tour (None si c'est un rangement de dés)
             lancer (Lancer): le lancer venant d'être produit, s'il y a lieu.
         """
-        print(self.arene.affichage_string(lancer))
+        self.rendu.afficher(self.arene, lancer)
         if joueur is None:
             print("Rangement des dés...")
         else:
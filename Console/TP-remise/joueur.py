@@ -272,11 +272,24 @@ class Joueur:
         entree_traitee = None
 
         while entree_traitee is None:
-            entree = input(question)
+            entree = self.lire_entree(question)
             entree_traitee = traitement_entree(entree)
 
         return entree_traitee
 
+    def lire_entree(self, question):
+        """
+        Pose une question à l'utilisateur en console et donne sa réponse.
+        Les joueurs qui ne répondent pas au clavier (script_partie.JoueurScripte) la redéfinissent.
+
+        Args:
+            question (str): La question à poser à l'utilisateur
+
+        Returns:
+            str: La réponse
+        """
+        return input(question)
+
     def est_elimine(self):
         """
         Vérifie si le joueur est éliminé, i.e. s'il n'a plus de dés
@@ -62,6 +62,16 @@ class Lancer:
             trajectoire.append(emplacement)
         return trajectoire
 
+    def cases_trajectoire(self):
+        """
+        Donne les cases de la trajectoire sous forme d'ensemble, pour des tests
+        d'appartenance en temps constant.
+
+        Returns:
+            frozenset: Les coordonnées de la trajectoire
+        """
+        return frozenset(self.trajectoire)
+
     def obtenir_direction(self, angle):
         """
         À partir d'un point cardinal, retourne la différence entre l'emplacement précédent et
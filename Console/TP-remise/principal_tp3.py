@@ -2,15 +2,31 @@
 Point d'entrée du TP3.
 
 Les dés, l'arène, les joueurs, et la partie y sont générés.
+
+Sans argument, la partie est interactive. Avec --script, les paramètres et les coups des
+joueurs sont lus d'un script (voir script_partie), et plusieurs parties peuvent être jouées
+à la suite, sans affichage (--silencieux), avec le temps passé dans chaque phase à la fin.
+Par exemple, mille parties au hasard de deux joueurs:
+
+    printf '1\n5\n2\n10\n' | python principal_tp3.py --script - --parties 1000 --automatique --silencieux
 """
 
+import argparse
+import io
+import random
+import sys
+from collections import Counter
+from contextlib import redirect_stdout
+
 from joueur import Joueur
 from arene import Arene
 from de import De
 from gladeateur import Gladeateur
+from rendu_console import RenduSilencieux
+from script_partie import ScriptEntrees, JoueurScripte, Chronometre, lire_script
 
 
-def demander_entier(nom_entier, valeur_defaut, entier_minimum=None, entier_maximum=None):
+def demander_entier(nom_entier, valeur_defaut, entier_minimum=None, entier_maximum=None, lire=input):
     """
     Cette fonction permet de demander à l'utilisateur un entier entre des bornes, possiblement
     absentes, avec validation de l'entrée. Elle inclut aussi une valeur par défaut si l'utilisateur
@@ -21,6 +37,7 @@ def demander_entier(nom_entier, valeur_defaut, entier_minimum=None, entier_maxim
         valeur_defaut (int): La valeur à prendre si rien n'est écrit
         entier_minimum (int, optional): La borne inférieure. Défaut: None (pas de borne inférieure)
         entier_maximum (int, optional): La borne supérieure. Défaut: None (pas de borne inférieure)
+        lire (fonction, optional): La fonction qui pose la question et donne la réponse. Défaut: input
 
     Returns:
         int: L'entier entré par l'utilisateur
@@ -28,7 +45,7 @@ def demander_entier(nom_entier, valeur_defaut, entier_minimum=None, entier_maxim
     entree_invalide = True
     entier = None
     while entree_invalide:
-        entree = input("Veuillez entrer {} [{} par défaut]: ".format(nom_entier, valeur_defaut))
+        entree = lire("Veuillez entrer {} [{} par défaut]: ".format(nom_entier, valeur_defaut))
         if entree == "":
             return valeur_defaut
         elif not entree.isnumeric():
@@ -49,35 +66,132 @@ def demander_entier(nom_entier, valeur_defaut, entier_minimum=None, entier_maxim
     return entier
 
 
-print("Bienvenue aux GlaDÉateurs !!!")
+def creer_partie(lire=input, creer_joueur=Joueur, rendu=None):
+    """
+    Demande les paramètres de la partie, puis crée l'arène, les joueurs et la partie.
+
+    Args:
+        lire (fonction, optional): La fonction qui pose une question et donne la réponse. Défaut: input
+        creer_joueur (fonction, optional): Crée un joueur à partir de son numéro, ses dés et l'arène.
+            Défaut: Joueur
+        rendu (RenduConsole, optional): L'affichage de l'arène. Défaut: celui de Gladeateur
+
+    Returns:
+        Gladeateur: La partie
+    """
+    #######################
+    # CRÉATION DE L'ARÈNE #
+    #######################
+
+    mode_affichage = demander_entier(
+        "le mode d'affichage parmi: les numéros (1) ou les icônes (2)", 1, 1, 2, lire)
+    dimension = demander_entier("la dimension de l'arène", 5, 3, lire=lire)
+    arene = Arene(dimension, De(), mode_affichage)
+
+    ########################
+    # CRÉATION DES JOUEURS #
+    ########################
+
+    n_joueurs = demander_entier("le nombre de joueurs", 2, 2, 5, lire)
+    n_des_par_joueur = demander_entier("le nombre de dés par joueur", 10, 1, 15, lire)
 
-#######################
-# CRÉATION DE L'ARÈNE #
-#######################
+    joueurs = []
+    for i in range(n_joueurs):
+        des = []
+        for j in range(n_des_par_joueur):
+            des.append(De())
+        joueurs.append(creer_joueur(i + 1, des, arene))
 
-mode_affichage = demander_entier(
-    "le mode d'affichage parmi: les numéros (1) ou les icônes (2)", 1, 1, 2)
-dimension = demander_entier("la dimension de l'arène", 5, 3)
-arene = Arene(dimension, De(), mode_affichage)
+    #########################
+    # CRÉATION DE LA PARTIE #
+    #########################
 
-########################
-# CRÉATION DES JOUEURS #
-########################
+    return Gladeateur(joueurs, arene, rendu)
 
-n_joueurs = demander_entier("le nombre de joueurs", 2, 2, 5)
-n_des_par_joueur = demander_entier("le nombre de dés par joueur", 10, 1, 15)
 
-joueurs = []
-for i in range(n_joueurs):
-    des = []
-    for j in range(n_des_par_joueur):
-        des.append(De())
-    joueurs.append(Joueur(i + 1, des, arene))
+def jouer_script(texte, parties=1, automatique=False, silencieux=False):
+    """
+    Joue des parties dont les réponses viennent d'un script, puis affiche les victoires
+    et le temps passé dans chaque phase. Chaque partie reprend le script depuis le début.
+
+    Args:
+        texte (str): Le contenu du script (voir script_partie)
+        parties (int, optional): Le nombre de parties à jouer. Défaut: 1
+        automatique (bool, optional): Les joueurs dont les réponses sont épuisées jouent au hasard. Défaut: False
+        silencieux (bool, optional): N'affiche ni l'arène, ni les messages des parties. Défaut: False
+
+    Returns:
+        Chronometre: Le temps passé dans chaque phase
+    """
+    chronometre = Chronometre()
+    victoires = Counter()
+    sortie = io.StringIO() if silencieux else sys.stdout
+
+    for _ in range(parties):
+        with chronometre.phase("configuration"):
+            script = ScriptEntrees(texte)
+
+            def lire(question):
+                # En mode automatique, les paramètres absents du script prennent leur valeur par défaut.
+                return script.lire() if script.reste() or not automatique else ""
+
+            glad = creer_partie(
+                lire, lambda numero, des, arene: JoueurScripte(numero, des, arene, script, automatique),
+                RenduSilencieux() if silencieux else None)
+        chronometre.envelopper(glad.arene, "effectuer_lancer", "lancers")
+        chronometre.envelopper(glad.arene, "rangement", "rangement")
+        chronometre.envelopper(glad.rendu, "afficher", "affichage")
+        for joueur in glad.liste_joueurs:
+            chronometre.envelopper(joueur, "lire_entree", "entrées")
+
+        with chronometre.phase("partie"), redirect_stdout(sortie):
+            vainqueur = glad.jouer_partie()
+        victoires[vainqueur.numero_joueur] += 1
+        if silencieux:
+            sortie.seek(0)
+            sortie.truncate()
+
+    print("{} partie(s) jouée(s).".format(parties))
+    for numero in sorted(victoires):
+        print("Victoires du joueur # {}: {}".format(numero, victoires[numero]))
+    print(chronometre.rapport())
+    return chronometre
+
+
+def analyser_arguments(arguments=None):
+    """
+    Args:
+        arguments (list, optional): Les arguments de la ligne de commande. Défaut: sys.argv[1:]
+
+    Returns:
+        argparse.Namespace: Les options
+    """
+    analyseur = argparse.ArgumentParser(description="Les GlaDÉateurs, en console.")
+    analyseur.add_argument("--script", metavar="FICHIER",
+                           help="lire les paramètres et les coups dans ce fichier (- pour l'entrée standard)")
+    analyseur.add_argument("--parties", type=int, default=1,
+                           help="le nombre de parties à jouer avec le script")
+    analyseur.add_argument("--automatique", action="store_true",
+                           help="les joueurs dont les coups sont épuisés jouent au hasard")
+    analyseur.add_argument("--silencieux", action="store_true",
+                           help="ne pas afficher l'arène ni les messages des parties")
+    analyseur.add_argument("--graine", type=int,
+                           help="la graine du hasard, pour rejouer les mêmes parties")
+    return analyseur.parse_args(arguments)
+
 
-#########################
-# CRÉATION DE LA PARTIE #
-#########################
+if __name__ == '__main__':
+    options = analyser_arguments()
+    if options.graine is not None:
+        random.seed(options.graine)
 
-glad = Gladeateur(joueurs, arene)
-input("Appuyez sur Entrée pour débuter...")
-glad.jouer_partie()
+    if options.script is None:
+        print("Bienvenue aux GlaDÉateurs !!!")
+        glad = creer_partie()
+        input("Appuyez sur Entrée pour débuter...")
+        glad.jouer_partie()
+    else:
+        try:
+            jouer_script(lire_script(options.script), options.parties, options.automatique, options.silencieux)
+        except EOFError as erreur:
+            sys.exit("Partie interrompue: {}".format(erreur))
@@ -0,0 +1,255 @@
+"""
+La classe RenduConsole
+
+Affiche l'arène dans le terminal, image après image, en ne réécrivant que ce qui a changé.
+
+Chaque image est composée dans un tampon de rangées alloué une seule fois par dimension
+d'arène. Une rangée n'est recomposée que si ses dés ou ses cases de trajectoire ont changé
+depuis l'image précédente; les autres sont reprises telles quelles.
+
+Sur un terminal ANSI, l'arène reste en haut de l'écran: seules les cases modifiées sont
+réécrites (un déplacement du curseur, puis la case), et les messages de la partie défilent
+sous l'arène. Ailleurs (fichier, tube), l'image complète est écrite, comme print le faisait.
+Dans les deux cas, chaque image est écrite en un seul appel à write.
+"""
+
+import os
+import shutil
+import sys
+
+import colorama
+
+# Le nombre de lignes du terminal qu'on garde sous l'arène pour les messages, en mode ANSI.
+LIGNES_MESSAGES = 8
+
+# Le nombre de caractères avant la première case d'une rangée ("{:>3d} |").
+LARGEUR_MARGE = 5
+
+CASE_VIDE = "   "
+DEBUT_TRAJECTOIRE = colorama.Back.LIGHTYELLOW_EX + colorama.Fore.RED
+FIN_TRAJECTOIRE = colorama.Fore.RESET + colorama.Back.RESET
+
+
+def ligne_exterieure(dimension, gauche, droite):
+    """
+    Donne la ligne des numéros de colonnes, encadrée des points cardinaux.
+
+    Args:
+        dimension (int): La dimension de l'arène
+        gauche (str): Le point cardinal de gauche
+        droite (str): Le point cardinal de droite
+
+    Returns:
+        str: La ligne, sans saut de ligne
+    """
+    return '{:s}  |'.format(gauche) + ''.join('{:^3d}'.format(x) for x in range(dimension)) + \
+        '|  {:s}'.format(droite)
+
+
+def ligne_interieure(dimension):
+    """
+    Donne la ligne qui sépare les numéros de colonnes des cases.
+
+    Args:
+        dimension (int): La dimension de l'arène
+
+    Returns:
+        str: La ligne, sans saut de ligne
+    """
+    return "----" + "|" + "-" * 3 * dimension + "|----"
+
+
+def cellule(texte_de, dans_trajectoire):
+    """
+    Donne l'affichage d'une case.
+
+    Args:
+        texte_de (str): La représentation du dé de la case (None si la case est vide)
+        dans_trajectoire (bool): True si la case fait partie de la trajectoire affichée
+
+    Returns:
+        str: La case, sur trois caractères (plus les codes de couleur au besoin)
+    """
+    texte = CASE_VIDE if texte_de is None else "{:^3s}".format(texte_de)
+    if dans_trajectoire:
+        return DEBUT_TRAJECTOIRE + texte + FIN_TRAJECTOIRE
+    return texte
+
+
+def rangee(i, cellules):
+    """
+    Donne une rangée de l'arène, encadrée de son numéro.
+
+    Args:
+        i (int): Le numéro de la rangée
+        cellules (list): L'affichage de chacune de ses cases (rendu_console.cellule)
+
+    Returns:
+        str: La rangée, sans saut de ligne
+    """
+    return "{:>3d} |".format(i) + "".join(cellules) + "| {:<3d} ".format(i)
+
+
+def cases_trajectoire(lancer):
+    """
+    Donne les cases d'une trajectoire à mettre en évidence.
+
+    Args:
+        lancer: Un lancer, ou une liste ou un ensemble de coordonnées (None s'il n'y en a pas)
+
+    Returns:
+        frozenset: Les coordonnées des cases
+    """
+    if lancer is None:
+        return frozenset()
+    if isinstance(lancer, (list, set, frozenset)):
+        return frozenset(lancer)
+    return lancer.cases_trajectoire()
+
+
+class RenduConsole:
+    """ Affiche les images successives d'une arène dans un flux de sortie.
+
+    Attributes:
+        flux (fichier): Le flux où les images sont écrites.
+        ansi (bool): True si le flux est un terminal qui comprend les déplacements du curseur.
+        dimension (int): La dimension de l'arène des tampons (None avant la première image).
+        cles (list): Pour chaque rangée, ses dés et ses cases de trajectoire lors de la dernière image.
+        cellules (list): Pour chaque rangée, l'affichage de ses cases lors de la dernière image.
+        rangees (list): Le tampon des lignes de la dernière image: les numéros de colonnes
+            et les séparateurs, puis une ligne par rangée de l'arène.
+        ecran_initialise (bool): True une fois l'arène dessinée en haut de l'écran (mode ANSI).
+        images (int): Le nombre d'images affichées.
+        octets (int): Le nombre de caractères écrits.
+    """
+
+    def __init__(self, flux=None, ansi=None):
+        """
+        Constructeur de la classe RenduConsole.
+
+        Args:
+            flux (fichier, optional): Le flux de sortie. Défaut: sys.stdout
+            ansi (bool, optional): Force ou empêche le mode ANSI. Défaut: None, pour le
+                détecter (un terminal, autre que « dumb »)
+        """
+        self.flux = sys.stdout if flux is None else flux
+        if ansi is None:
+            ansi = hasattr(self.flux, 'isatty') and self.flux.isatty() and os.environ.get('TERM') != 'dumb'
+        self.ansi = ansi
+        self.dimension = None
+        self.cles = []
+        self.cellules = []
+        self.rangees = []
+        self.ecran_initialise = False
+        self.images = 0
+        self.octets = 0
+
+    def preparer(self, dimension):
+        """
+        Alloue les tampons pour une dimension d'arène. En mode ANSI, le mode n'est gardé que
+        si le terminal est assez haut pour l'arène et les messages.
+
+        Args:
+            dimension (int): La dimension de l'arène
+        """
+        self.dimension = dimension
+        self.cles = [None] * dimension
+        self.cellules = [[CASE_VIDE] * dimension for _ in range(dimension)]
+        self.rangees = [ligne_exterieure(dimension, 'NO', 'NE'), ligne_interieure(dimension)] + \
+            [None] * dimension + [ligne_interieure(dimension), ligne_exterieure(dimension, 'SO', 'SE')]
+        self.ecran_initialise = False
+        if self.ansi and shutil.get_terminal_size().lines < len(self.rangees) + LIGNES_MESSAGES:
+            self.ansi = False
+
+    def afficher(self, arene, lancer=None):
+        """
+        Affiche l'arène, en mettant en évidence la trajectoire d'un lancer au besoin.
+
+        Args:
+            arene (Arene): L'arène à afficher
+            lancer (optionel): Un lancer, ou une liste ou un ensemble de coordonnées
+                correspondant à une trajectoire
+        """
+        dimension = arene.dimension
+        if dimension != self.dimension:
+            self.preparer(dimension)
+
+        des_par_rangee = {}
+        for (i, j) in arene.des:
+            if 0 <= j < dimension:
+                des_par_rangee.setdefault(i, []).append((j, arene.afficher_de((i, j))))
+        trajectoire_par_rangee = {}
+        for (i, j) in cases_trajectoire(lancer):
+            if 0 <= i < dimension and 0 <= j < dimension:
+                trajectoire_par_rangee.setdefault(i, []).append(j)
+
+        morceaux = []
+        for i in range(dimension):
+            cle = (tuple(sorted(des_par_rangee.get(i, ()))), tuple(sorted(trajectoire_par_rangee.get(i, ()))))
+            if cle == self.cles[i]:
+                continue
+            self.cles[i] = cle
+            textes = [None] * dimension
+            for j, texte_de in cle[0]:
+                textes[j] = texte_de
+            colonnes_trajectoire = set(cle[1])
+            nouvelles = [cellule(textes[j], j in colonnes_trajectoire) for j in range(dimension)]
+            if self.ansi and self.ecran_initialise:
+                anciennes = self.cellules[i]
+                for j in range(dimension):
+                    if nouvelles[j] != anciennes[j]:
+                        morceaux.append("\x1b[{};{}H".format(i + 3, LARGEUR_MARGE + 3 * j + 1) + nouvelles[j])
+            self.cellules[i] = nouvelles
+            self.rangees[i + 2] = rangee(i, nouvelles)
+
+        if not self.ansi:
+            texte = "\n" + "\n".join(self.rangees) + "\n\n"
+        elif not self.ecran_initialise:
+            # On efface l'écran, on dessine l'arène en haut, puis on limite le défilement
+            # aux lignes sous l'arène, où le curseur est laissé pour les messages.
+            hauteur = len(self.rangees)
+            texte = "\x1b[2J\x1b[H" + "\n".join(self.rangees) + \
+                "\x1b[{};{}r".format(hauteur + 2, shutil.get_terminal_size().lines) + \
+                "\x1b[{};1H".format(hauteur + 2)
+            self.ecran_initialise = True
+        elif len(morceaux) > 0:
+            # Le curseur est sauvegardé puis restauré, pour que les messages continuent là où ils étaient.
+            texte = "\x1b7" + "".join(morceaux) + "\x1b8"
+        else:
+            texte = ""
+        if texte:
+            self.flux.write(texte)
+            if self.ansi:
+                self.flux.flush()
+        self.images += 1
+        self.octets += len(texte)
+
+    def fermer(self):
+        """
+        Rend au terminal sa zone de défilement complète (mode ANSI).
+        """
+        if self.ansi and self.ecran_initialise:
+            self.flux.write("\x1b7\x1b[r\x1b8")
+            self.flux.flush()
+            self.ecran_initialise = False
+
+
+class RenduSilencieux(RenduConsole):
+    """ Un affichage qui n'écrit rien: les images sont seulement comptées. Sert aux parties
+    scriptées (script_partie), où seul le résultat compte.
+    """
+
+    def afficher(self, arene, lancer=None):
+        """
+        Compte l'image, sans l'afficher.
+
+        Args:
+            arene (Arene): L'arène à afficher
+            lancer (optionel): Un lancer, ou une liste ou un ensemble de coordonnées
+        """
+        self.images += 1
+
+    def fermer(self):
+        """
+        Il n'y a rien à rendre au terminal.
+        """
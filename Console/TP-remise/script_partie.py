@@ -0,0 +1,222 @@
+"""
+Les parties scriptées
+
+Permet de jouer des parties sans clavier: les réponses aux questions de principal_tp3.py
+et des joueurs sont lues d'avance dans un script (un fichier, ou l'entrée standard lue
+d'un coup), plutôt qu'une à une avec input().
+
+Format du script, une réponse par ligne:
+  - une ligne « J<n>: réponse » est une réponse du joueur n (coordonnées, angle,
+    puissance, L ou T), dans l'ordre où il les donnera;
+  - toute autre ligne est une réponse générale: les paramètres de la partie, puis, une fois
+    ceux-ci lus, les réponses de n'importe quel joueur dont les réponses sont épuisées;
+  - une ligne vide est une réponse vide (la valeur par défaut des paramètres);
+  - les lignes qui commencent par # sont ignorées.
+Une transcription de partie interactive, réponse par réponse, est donc un script valide.
+"""
+
+import sys
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from time import perf_counter
+
+from joueur import Joueur
+
+
+class ScriptEntrees:
+    """ Les réponses d'un script, prêtes à être lues.
+
+    Attributes:
+        generales (deque): Les réponses générales, dans l'ordre.
+        par_joueur (dict): Les réponses de chaque joueur, par numéro de joueur.
+    """
+
+    def __init__(self, texte):
+        """
+        Constructeur de la classe ScriptEntrees.
+
+        Args:
+            texte (str): Le contenu du script
+        """
+        self.generales = deque()
+        self.par_joueur = defaultdict(deque)
+        for ligne in texte.splitlines():
+            ligne = ligne.strip()
+            if ligne.startswith('#'):
+                continue
+            prefixe, deux_points, reponse = ligne.partition(':')
+            if deux_points and prefixe[:1] in ('J', 'j') and prefixe[1:].strip().isdigit():
+                self.par_joueur[int(prefixe[1:])].append(reponse.strip())
+            else:
+                self.generales.append(ligne)
+
+    def reste(self, numero_joueur=None):
+        """
+        Args:
+            numero_joueur (int, optional): Le numéro du joueur qui répond. Défaut: None (réponse générale)
+
+        Returns:
+            bool: True s'il reste une réponse pour ce joueur (ou une réponse générale)
+        """
+        return len(self.generales) > 0 or (numero_joueur is not None and len(self.par_joueur[numero_joueur]) > 0)
+
+    def lire(self, numero_joueur=None):
+        """
+        Donne la prochaine réponse d'un joueur, ou la prochaine réponse générale.
+
+        Args:
+            numero_joueur (int, optional): Le numéro du joueur qui répond. Défaut: None (réponse générale)
+
+        Returns:
+            str: La réponse
+
+        Raises:
+            EOFError: S'il ne reste plus de réponse, comme input() à la fin de l'entrée
+        """
+        if numero_joueur is not None and len(self.par_joueur[numero_joueur]) > 0:
+            return self.par_joueur[numero_joueur].popleft()
+        if len(self.generales) > 0:
+            return self.generales.popleft()
+        raise EOFError("Le script ne contient plus de réponse.")
+
+
+def lire_script(chemin):
+    """
+    Lit un script au complet, d'un coup.
+
+    Args:
+        chemin (str): Le chemin du script, ou « - » pour l'entrée standard
+
+    Returns:
+        str: Le contenu du script
+    """
+    if chemin == '-':
+        return sys.stdin.read()
+    with open(chemin, encoding='utf-8') as fichier:
+        return fichier.read()
+
+
+class JoueurScripte(Joueur):
+    """ Un joueur dont les réponses viennent d'un script plutôt que du clavier.
+
+    Attributes:
+        script (ScriptEntrees): Les réponses.
+        automatique (bool): Si True, une fois ses réponses épuisées, le joueur lance au hasard
+            (Joueur.piger_coordonnees, etc.) et termine son tour dès qu'il le peut.
+    """
+
+    def __init__(self, numero_joueur, des_initiaux, arene, script, automatique=False):
+        """
+        Constructeur de la classe JoueurScripte.
+
+        Args:
+            numero_joueur (int): Le numéro identifiant le joueur
+            des_initiaux (list): Les dés en possession du joueur en début de partie
+            arene (Arene): l'arène du jeu
+            script (ScriptEntrees): Les réponses
+            automatique (bool, optional): Jouer au hasard une fois les réponses épuisées. Défaut: False
+        """
+        super().__init__(numero_joueur, des_initiaux, arene)
+        self.script = script
+        self.automatique = automatique
+
+    def lire_entree(self, question):
+        """
+        Donne la prochaine réponse du joueur dans le script, sans afficher la question.
+
+        Args:
+            question (str): La question (ignorée)
+
+        Returns:
+            str: La réponse
+        """
+        return self.script.lire(self.numero_joueur)
+
+    def joue_au_hasard(self):
+        """
+        Returns:
+            bool: True si le joueur doit décider seul (réponses épuisées en mode automatique)
+        """
+        return self.automatique and not self.script.reste(self.numero_joueur)
+
+    def choisir_continuer(self):
+        if self.joue_au_hasard():
+            return False
+        return super().choisir_continuer()
+
+    def choisir_coordonnees(self):
+        if self.joue_au_hasard():
+            return self.piger_coordonnees()
+        return super().choisir_coordonnees()
+
+    def choisir_angle(self):
+        if self.joue_au_hasard():
+            return self.piger_angle()
+        return super().choisir_angle()
+
+    def choisir_puissance(self):
+        if self.joue_au_hasard():
+            return self.piger_puissance()
+        return super().choisir_puissance()
+
+
+class Chronometre:
+    """ Cumule le temps passé dans chaque phase d'une ou de plusieurs parties.
+
+    Attributes:
+        durees (dict): Le temps cumulé de chaque phase, en secondes.
+        appels (dict): Le nombre de passages dans chaque phase.
+    """
+
+    def __init__(self):
+        """
+        Constructeur de la classe Chronometre.
+        """
+        self.durees = defaultdict(float)
+        self.appels = defaultdict(int)
+
+    @contextmanager
+    def phase(self, nom):
+        """
+        Mesure le temps passé dans le bloc with.
+
+        Args:
+            nom (str): Le nom de la phase
+        """
+        debut = perf_counter()
+        try:
+            yield
+        finally:
+            self.durees[nom] += perf_counter() - debut
+            self.appels[nom] += 1
+
+    def envelopper(self, objet, nom_methode, phase):
+        """
+        Remplace une méthode d'un objet (l'objet seulement, pas sa classe) par une version
+        qui mesure le temps passé dans chacun de ses appels.
+
+        Args:
+            objet: L'objet
+            nom_methode (str): Le nom de la méthode
+            phase (str): Le nom de la phase à laquelle le temps est attribué
+        """
+        methode = getattr(objet, nom_methode)
+
+        def methode_mesuree(*args, **kwargs):
+            with self.phase(phase):
+                return methode(*args, **kwargs)
+
+        setattr(objet, nom_methode, methode_mesuree)
+
+    def rapport(self):
+        """
+        Donne le tableau des phases, de la plus longue à la plus courte.
+
+        Returns:
+            str: Le tableau
+        """
+        lignes = ["{:<16s}{:>12s}{:>10s}{:>14s}".format("Phase", "Total (ms)", "Appels", "Moyenne (µs)")]
+        for nom in sorted(self.durees, key=self.durees.get, reverse=True):
+            duree, appels = self.durees[nom], self.appels[nom]
+            lignes.append("{:<16s}{:>12.1f}{:>10d}{:>14.1f}".format(nom, duree * 1000, appels, duree / appels * 1e6))
+        return "\n".join(lignes)
@@ -0,0 +1,5 @@
+"""
+Banc d'essai des GlaDÉateurs: mesure la vitesse des chemins critiques du jeu
+(banc_essai.scenarios) et rapporte le nombre d'opérations par seconde, avec un
+intervalle de confiance, en JSON. S'exécute avec python -m banc_essai.
+"""
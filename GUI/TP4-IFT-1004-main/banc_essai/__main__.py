@@ -0,0 +1,61 @@
+"""
+Exécute le banc d'essai et écrit les résultats en JSON.
+
+Voir banc_essai.execution pour le balayage des paramètres, et banc_essai.historique pour
+suivre les résultats d'un commit à l'autre.
+
+Exemples:
+    python -m banc_essai
+    python -m banc_essai --scenarios rangement table_rase --dimensions 5 64 --des 1 15 --sortie banc.json
+"""
+
+import argparse
+import json
+import sys
+
+from banc_essai.execution import executer_banc, DIMENSIONS, NOMBRES_DES
+from banc_essai.mesure import DUREE_ESSAI
+from banc_essai.scenarios import SCENARIOS
+
+
+def analyser_arguments():
+    """
+    Lit les arguments de la ligne de commande.
+
+    Returns:
+        argparse.Namespace: Les arguments
+    """
+    parseur = argparse.ArgumentParser(prog='python -m banc_essai',
+                                      description="Banc d'essai des chemins critiques des GlaDÉateurs.")
+    parseur.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS),
+                         help="Scénarios à mesurer (défaut: tous)")
+    parseur.add_argument('--dimensions', nargs='+', type=int, default=DIMENSIONS,
+                         help="Dimensions d'arène à balayer")
+    parseur.add_argument('--des', nargs='+', type=int, default=NOMBRES_DES,
+                         help="Nombres de dés à balayer")
+    parseur.add_argument('--essais', type=int, default=10, help="Nombre d'essais mesurés (au moins 2)")
+    parseur.add_argument('--echauffement', type=int, default=2, help="Nombre d'essais d'échauffement")
+    parseur.add_argument('--duree-essai', type=float, default=DUREE_ESSAI,
+                         help="Durée minimale d'un essai, en secondes")
+    parseur.add_argument('--sortie', metavar='FICHIER', help="Écrire le JSON dans ce fichier plutôt qu'à l'écran")
+    arguments = parseur.parse_args()
+
+    if any(dimension < 3 for dimension in arguments.dimensions):
+        parseur.error("Les dimensions doivent être des entiers >= 3.")
+    if any(not 1 <= nombre_des <= 15 for nombre_des in arguments.des):
+        parseur.error("Les nombres de dés doivent être des entiers entre 1 et 15.")
+    if arguments.essais < 2:
+        parseur.error("Il faut au moins 2 essais pour calculer un intervalle de confiance.")
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = analyser_arguments()
+    rapport = executer_banc(arguments.scenarios, arguments.dimensions, arguments.des, arguments.essais,
+                            arguments.echauffement, arguments.duree_essai, sys.stderr)
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if arguments.sortie is None:
+        print(texte)
+    else:
+        with open(arguments.sortie, 'w', encoding='utf-8') as fichier:
+            fichier.write(texte + '\n')
@@ -0,0 +1,108 @@
+"""
+L'exécution du banc d'essai: mesure chaque scénario (banc_essai.scenarios) pour chaque
+dimension d'arène et chaque nombre de dés demandés, s'il dépend de ces paramètres, et
+rassemble les résultats dans un dictionnaire prêt à être écrit en JSON. Les scénarios qui
+ne peuvent pas être mesurés ici (par exemple dessiner_canvas sans affichage) sont rapportés
+comme ignorés.
+"""
+
+import os
+import platform
+import time
+
+from banc_essai.mesure import mesurer
+from banc_essai.scenarios import SCENARIOS, DIMENSION_DEFAUT, DES_DEFAUT, ScenarioIndisponible
+
+# Les dimensions d'arène et les nombres de dés balayés par défaut.
+DIMENSIONS = [3, 4, 8, 16, 32, 64, 128, 256, 512]
+NOMBRES_DES = [1, 2, 4, 8, 15]
+
+
+def decrire_machine():
+    """
+    Returns:
+        dict: La description de la machine et de l'interpréteur
+    """
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'systeme': platform.platform(),
+        'processeur': platform.processor() or platform.machine(),
+        'coeurs': os.cpu_count(),
+    }
+
+
+def combinaisons(scenario, dimensions, nombres_des):
+    """
+    Args:
+        scenario (Scenario): Le scénario
+        dimensions (list): Les dimensions demandées
+        nombres_des (list): Les nombres de dés demandés
+
+    Returns:
+        list: Les paires (dimension, nombre de dés) à mesurer pour ce scénario
+    """
+    if 'dimension' not in scenario.parametres:
+        dimensions = [DIMENSION_DEFAUT]
+    if 'des' not in scenario.parametres:
+        nombres_des = [DES_DEFAUT]
+    return [(dimension, nombre_des) for dimension in dimensions for nombre_des in nombres_des]
+
+
+def executer_banc(noms, dimensions, nombres_des, essais, echauffement, duree_essai, progression=None):
+    """
+    Mesure les scénarios demandés.
+
+    Args:
+        noms (list): Les noms des scénarios (clés de SCENARIOS)
+        dimensions (list): Les dimensions d'arène à balayer
+        nombres_des (list): Les nombres de dés à balayer
+        essais (int): Le nombre d'essais mesurés
+        echauffement (int): Le nombre d'essais d'échauffement
+        duree_essai (float): La durée minimale d'un essai, en secondes
+        progression (fichier, optional): Où écrire l'avancement. Défaut: None (rien)
+
+    Returns:
+        dict: Les résultats, prêts à être écrits en JSON
+    """
+    resultats = []
+    ignores = []
+    debut = time.perf_counter()
+    for nom in noms:
+        scenario = SCENARIOS[nom]
+        for dimension, nombre_des in combinaisons(scenario, dimensions, nombres_des):
+            try:
+                mesure = mesurer(scenario.fabrique(dimension, nombre_des), essais, echauffement, duree_essai)
+            except ScenarioIndisponible as erreur:
+                ignores.append({'scenario': nom, 'raison': str(erreur)})
+                if progression is not None:
+                    print("{}: ignoré ({})".format(nom, erreur), file=progression)
+                break
+            resultats.append({
+                'scenario': nom,
+                'dimension': dimension,
+                'des': nombre_des,
+                'operations_par_seconde': mesure.operations_par_seconde,
+                'intervalle_95': list(mesure.intervalle_95),
+                'ecart_type': mesure.ecart_type,
+                'essais': mesure.essais,
+                'repetitions': mesure.repetitions,
+                'debits': mesure.debits,
+            })
+            if progression is not None:
+                print("{:<18s} dimension {:>4d}, {:>2d} dés: {:>14,.1f} op/s ±{:.1%}".format(
+                    nom, dimension, nombre_des, mesure.operations_par_seconde,
+                    (mesure.intervalle_95[1] - mesure.operations_par_seconde) / mesure.operations_par_seconde),
+                    file=progression)
+
+    return {
+        'machine': decrire_machine(),
+        'parametres': {
+            'essais': essais,
+            'echauffement': echauffement,
+            'duree_essai': duree_essai,
+        },
+        'duree': time.perf_counter() - debut,
+        'resultats': resultats,
+        'ignores': ignores,
+    }
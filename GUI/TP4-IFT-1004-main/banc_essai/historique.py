@@ -0,0 +1,447 @@
+"""
+L'historique du banc d'essai: un fichier JSON-lines où chaque ligne est une exécution des
+chemins critiques du moteur (CHEMINS_SUIVIS), avec son commit git et l'empreinte de la machine.
+
+Chaque nouvelle exécution est comparée à la référence mobile: pour chaque chemin, les débits
+des dernières exécutions sur la même machine où ce chemin n'était pas en régression. Un chemin
+est en régression si ses débits sont significativement plus bas que ceux de la référence (test
+de Mann-Whitney unilatéral) et que sa médiane a baissé d'au moins SEUIL_RALENTISSEMENT. Le
+programme se termine alors avec le code 1, pour arrêter une intégration continue.
+
+Un ralentissement voulu (par exemple, un calcul plus exact) s'accepte avec la commande accepter,
+ou l'option --accepter: les chemins en régression de l'exécution deviennent acceptés, et elle
+devient leur nouvelle référence (les exécutions précédentes ne comptent plus pour ces chemins).
+
+Exemples:
+    python -m banc_essai.historique executer
+    python -m banc_essai.historique ajouter banc.json
+    python -m banc_essai.historique accepter
+    python -m banc_essai.historique tendance
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+import time
+from math import erf, sqrt
+from pathlib import Path
+from statistics import median
+
+from banc_essai.execution import executer_banc, decrire_machine
+
+# Les chemins suivis: (scénario, dimension de l'arène, nombre de dés).
+CHEMINS_SUIVIS = [
+    ('lancer', 5, 10),
+    ('lancer', 64, 10),
+    ('trajectoire', 64, 10),
+    ('effectuer_lancer', 5, 10),
+    ('effectuer_lancer', 64, 10),
+    ('rangement', 5, 10),
+    ('rangement', 64, 15),
+    ('table_rase', 5, 10),
+    ('partie', 5, 10),
+]
+
+FICHIER_HISTORIQUE = 'historique_banc.jsonl'
+
+# Le nombre d'exécutions précédentes (sur la même machine) qui forment la référence.
+FENETRE_REFERENCE = 5
+
+# Le seuil de signification du test.
+ALPHA = 0.01
+
+# La baisse minimale de la médiane des débits pour parler de régression (5 %).
+SEUIL_RALENTISSEMENT = 0.05
+
+
+def cle_chemin(scenario, dimension, nombre_des):
+    """
+    Returns:
+        str: La clé d'un chemin dans l'historique, par exemple « rangement/64/15 »
+    """
+    return "{}/{}/{}".format(scenario, dimension, nombre_des)
+
+
+def empreinte_machine(machine):
+    """
+    Args:
+        machine (dict): La description de la machine (banc_essai.execution.decrire_machine)
+
+    Returns:
+        str: Une empreinte courte, identique pour deux exécutions sur la même machine et le même Python
+    """
+    texte = json.dumps(machine, sort_keys=True)
+    return hashlib.sha256(texte.encode()).hexdigest()[:12]
+
+
+def commit_courant():
+    """
+    Returns:
+        str: Le commit git courant, suivi de « -dirty » si l'arbre de travail est modifié
+            (« inconnu » hors d'un dépôt git)
+    """
+    try:
+        resultat = subprocess.run(['git', 'describe', '--always', '--dirty', '--abbrev=12'],
+                                  capture_output=True, text=True, cwd=Path(__file__).resolve().parent)
+    except OSError:
+        return 'inconnu'
+    return resultat.stdout.strip() if resultat.returncode == 0 else 'inconnu'
+
+
+def creer_entree(rapport):
+    """
+    Crée une entrée d'historique à partir d'un rapport du banc d'essai (banc_essai.execution.executer_banc).
+
+    Args:
+        rapport (dict): Le rapport
+
+    Returns:
+        dict: L'entrée, dont les débits sont regroupés par clé de chemin
+    """
+    return {
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit_courant(),
+        'empreinte': empreinte_machine(rapport['machine']),
+        'machine': rapport['machine'],
+        'debits': {cle_chemin(resultat['scenario'], resultat['dimension'], resultat['des']): resultat['debits']
+                   for resultat in rapport['resultats']},
+        'regressions': [],
+        'acceptes': [],
+    }
+
+
+def lire_historique(chemin):
+    """
+    Args:
+        chemin (str): Le fichier d'historique
+
+    Returns:
+        list: Les entrées, de la plus ancienne à la plus récente (vide si le fichier n'existe pas)
+    """
+    try:
+        with open(chemin, encoding='utf-8') as fichier:
+            return [json.loads(ligne) for ligne in fichier if ligne.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def ajouter_historique(chemin, entree):
+    """
+    Ajoute une entrée à la fin du fichier d'historique.
+
+    Args:
+        chemin (str): Le fichier d'historique
+        entree (dict): L'entrée
+    """
+    with open(chemin, 'a', encoding='utf-8') as fichier:
+        fichier.write(json.dumps(entree, ensure_ascii=False) + '\n')
+
+
+def ecrire_historique(chemin, historique):
+    """
+    Réécrit tout le fichier d'historique.
+
+    Args:
+        chemin (str): Le fichier d'historique
+        historique (list): Les entrées, de la plus ancienne à la plus récente
+    """
+    with open(chemin, 'w', encoding='utf-8') as fichier:
+        for entree in historique:
+            fichier.write(json.dumps(entree, ensure_ascii=False) + '\n')
+
+
+def accepter_entree(entree):
+    """
+    Accepte les régressions d'une entrée: ses chemins en régression deviennent acceptés.
+
+    Args:
+        entree (dict): L'entrée, modifiée sur place
+
+    Returns:
+        list: Les clés des chemins acceptés
+    """
+    acceptes = list(entree['regressions'])
+    entree['acceptes'] = sorted(set(entree.get('acceptes', [])) | set(acceptes))
+    entree['regressions'] = []
+    return acceptes
+
+
+def probabilite_plus_lent(nouveaux, reference):
+    """
+    Test de Mann-Whitney unilatéral (approximation normale, avec correction pour les ex aequo):
+    la probabilité d'observer des débits aussi bas si les deux séries venaient de la même distribution.
+
+    Args:
+        nouveaux (list): Les débits de la nouvelle exécution
+        reference (list): Les débits de la référence
+
+    Returns:
+        float: La valeur p (petite si les nouveaux débits sont plus bas)
+    """
+    n1, n2 = len(nouveaux), len(reference)
+    valeurs = sorted([(valeur, 0) for valeur in nouveaux] + [(valeur, 1) for valeur in reference])
+
+    # Rangs moyens des ex aequo.
+    somme_rangs = 0.0
+    correction = 0.0
+    i = 0
+    while i < len(valeurs):
+        j = i
+        while j + 1 < len(valeurs) and valeurs[j + 1][0] == valeurs[i][0]:
+            j += 1
+        rang = (i + j) / 2 + 1
+        somme_rangs += rang * sum(1 for k in range(i, j + 1) if valeurs[k][1] == 0)
+        egaux = j - i + 1
+        correction += egaux ** 3 - egaux
+        i = j + 1
+
+    u = somme_rangs - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 + 0.5) / sqrt(variance)
+    return 0.5 * (1 + erf(z / sqrt(2)))
+
+
+def reference_mobile(historique, empreinte, fenetre=FENETRE_REFERENCE):
+    """
+    Pour chaque chemin, retient les débits des dernières exécutions sur la même machine où
+    ce chemin n'était pas en régression (les autres chemins de ces exécutions comptent). On
+    remonte au plus jusqu'à la dernière exécution où le chemin a été accepté.
+
+    Args:
+        historique (list): Les entrées précédentes
+        empreinte (str): L'empreinte de la machine
+        fenetre (int, optional): Le nombre d'exécutions retenues par chemin. Défaut: FENETRE_REFERENCE
+
+    Returns:
+        dict: Les débits de la référence, par clé de chemin
+    """
+    reference = {}
+    retenues = {}
+    termines = set()
+    for entree in reversed(historique):
+        if entree['empreinte'] != empreinte:
+            continue
+        for cle, debits in entree['debits'].items():
+            if cle in termines or cle in entree['regressions']:
+                continue
+            reference.setdefault(cle, []).extend(debits)
+            retenues[cle] = retenues.get(cle, 0) + 1
+            if retenues[cle] >= fenetre or cle in entree.get('acceptes', []):
+                termines.add(cle)
+    return reference
+
+
+def comparer(entree, reference, alpha=ALPHA, seuil=SEUIL_RALENTISSEMENT):
+    """
+    Compare chaque chemin de l'entrée à la référence.
+
+    Args:
+        entree (dict): La nouvelle entrée
+        reference (dict): Les débits de la référence, par clé de chemin
+        alpha (float, optional): Le seuil de signification. Défaut: ALPHA
+        seuil (float, optional): La baisse minimale de la médiane. Défaut: SEUIL_RALENTISSEMENT
+
+    Returns:
+        list: Pour chaque chemin, (clé, variation de la médiane, valeur p, régression)
+            (variation et valeur p sont None sans référence)
+    """
+    comparaisons = []
+    for cle, debits in entree['debits'].items():
+        if cle not in reference:
+            comparaisons.append((cle, None, None, False))
+            continue
+        variation = median(debits) / median(reference[cle]) - 1
+        p = probabilite_plus_lent(debits, reference[cle])
+        comparaisons.append((cle, variation, p, p < alpha and variation <= -seuil))
+    return comparaisons
+
+
+def afficher_comparaisons(entree, comparaisons):
+    """
+    Affiche la comparaison d'une entrée à sa référence.
+
+    Args:
+        entree (dict): L'entrée
+        comparaisons (list): Le résultat de comparer
+    """
+    print("Commit {}, machine {}".format(entree['commit'], entree['empreinte']))
+    print("{:<28}{:>16}{:>12}{:>10}".format('Chemin', 'Médiane (op/s)', 'Variation', 'p'))
+    for cle, variation, p, regression in comparaisons:
+        texte_variation = '—' if variation is None else '{:+.1%}'.format(variation)
+        texte_p = '—' if p is None else '{:.4f}'.format(p)
+        print("{:<28}{:>16,.1f}{:>12}{:>10}{}".format(cle, median(entree['debits'][cle]), texte_variation,
+                                                   texte_p, '  RÉGRESSION' if regression else ''))
+
+
+def afficher_tendance(historique, nombre=8):
+    """
+    Affiche un tableau de la médiane des débits de chaque chemin sur les dernières exécutions,
+    une colonne par exécution, et la variation entre la première et la dernière.
+
+    Args:
+        historique (list): Les entrées
+        nombre (int, optional): Le nombre d'exécutions affichées. Défaut: 8
+    """
+    entrees = historique[-nombre:]
+    if len(entrees) == 0:
+        print("L'historique est vide.")
+        return
+    cles = []
+    for entree in entrees:
+        cles.extend(cle for cle in entree['debits'] if cle not in cles)
+
+    print("{:<28}".format('Chemin') + ''.join('{:>14}'.format(entree['commit'][:12]) for entree in entrees) +
+          '{:>10}'.format('Total'))
+    for cle in cles:
+        medianes = [median(entree['debits'][cle]) if cle in entree['debits'] else None for entree in entrees]
+        cellules = ''.join('{:>14}'.format('—' if valeur is None else '{:,.0f}'.format(valeur)) for valeur in medianes)
+        connues = [valeur for valeur in medianes if valeur is not None]
+        total = '{:+.1%}'.format(connues[-1] / connues[0] - 1) if len(connues) > 1 else '—'
+        marque = '  !' if any(cle in entree['regressions'] for entree in entrees) else ''
+        if any(cle in entree.get('acceptes', []) for entree in entrees):
+            marque += '  (accepté)'
+        print("{:<28}".format(cle) + cellules + '{:>10}'.format(total) + marque)
+
+
+def enregistrer(rapport, chemin, fenetre, alpha, seuil, accepter=False):
+    """
+    Compare un rapport du banc d'essai à la référence mobile, l'affiche, puis l'ajoute à l'historique.
+
+    Args:
+        rapport (dict): Le rapport (banc_essai.execution.executer_banc)
+        chemin (str): Le fichier d'historique
+        fenetre (int): Le nombre d'exécutions de la référence
+        alpha (float): Le seuil de signification
+        seuil (float): La baisse minimale de la médiane
+        accepter (bool, optional): Si True, les régressions sont acceptées (accepter_entree). Défaut: False
+
+    Returns:
+        bool: True si au moins un chemin est en régression (et n'a pas été accepté)
+    """
+    historique = lire_historique(chemin)
+    entree = creer_entree(rapport)
+    comparaisons = comparer(entree, reference_mobile(historique, entree['empreinte'], fenetre), alpha, seuil)
+    entree['regressions'] = [cle for cle, _, _, regression in comparaisons if regression]
+    afficher_comparaisons(entree, comparaisons)
+    if accepter:
+        afficher_acceptes(accepter_entree(entree))
+    ajouter_historique(chemin, entree)
+    return len(entree['regressions']) > 0
+
+
+def accepter_derniere(chemin, commit=None):
+    """
+    Accepte les régressions de la dernière exécution de l'historique (ou de la dernière
+    exécution d'un commit donné), puis réécrit l'historique.
+
+    Args:
+        chemin (str): Le fichier d'historique
+        commit (str, optional): Le commit de l'exécution à accepter. Défaut: None (la dernière)
+
+    Returns:
+        bool: True si une exécution a été trouvée
+    """
+    historique = lire_historique(chemin)
+    for entree in reversed(historique):
+        if commit is None or entree['commit'].startswith(commit):
+            afficher_acceptes(accepter_entree(entree), entree)
+            ecrire_historique(chemin, historique)
+            return True
+    return False
+
+
+def afficher_acceptes(acceptes, entree=None):
+    """
+    Affiche les chemins dont la régression vient d'être acceptée.
+
+    Args:
+        acceptes (list): Les clés des chemins acceptés
+        entree (dict, optional): L'entrée acceptée, pour afficher son commit. Défaut: None
+    """
+    origine = '' if entree is None else " (commit {}, {})".format(entree['commit'], entree['date'])
+    if len(acceptes) == 0:
+        print("Aucune régression à accepter{}.".format(origine))
+    else:
+        print("Nouvelle référence pour {}{}.".format(', '.join(acceptes), origine))
+
+
+def executer_chemins_suivis(essais, duree_essai):
+    """
+    Mesure les chemins suivis (CHEMINS_SUIVIS).
+
+    Args:
+        essais (int): Le nombre d'essais mesurés
+        duree_essai (float): La durée minimale d'un essai, en secondes
+
+    Returns:
+        dict: Le rapport, au format de banc_essai.execution.executer_banc
+    """
+    rapport = None
+    for scenario, dimension, nombre_des in CHEMINS_SUIVIS:
+        partiel = executer_banc([scenario], [dimension], [nombre_des], essais, 2, duree_essai, sys.stderr)
+        if rapport is None:
+            rapport = partiel
+        else:
+            rapport['resultats'].extend(partiel['resultats'])
+            rapport['ignores'].extend(partiel['ignores'])
+    return rapport
+
+
+def analyser_arguments():
+    """
+    Lit les arguments de la ligne de commande.
+
+    Returns:
+        argparse.Namespace: Les arguments
+    """
+    parseur = argparse.ArgumentParser(prog='python -m banc_essai.historique',
+                                      description="Historique du banc d'essai des GlaDÉateurs.")
+    parseur.add_argument('--historique', default=FICHIER_HISTORIQUE, help="Fichier d'historique (JSON-lines)")
+    sous_parseurs = parseur.add_subparsers(dest='commande', required=True)
+
+    commande_executer = sous_parseurs.add_parser('executer', help="Mesurer les chemins suivis et les comparer")
+    commande_executer.add_argument('--essais', type=int, default=10, help="Nombre d'essais mesurés")
+    commande_executer.add_argument('--duree-essai', type=float, default=0.1,
+                                   help="Durée minimale d'un essai, en secondes")
+    commande_ajouter = sous_parseurs.add_parser('ajouter', help="Comparer et ajouter un rapport de python -m banc_essai")
+    commande_ajouter.add_argument('rapport', help="Le fichier JSON du rapport")
+    for commande in (commande_executer, commande_ajouter):
+        commande.add_argument('--fenetre', type=int, default=FENETRE_REFERENCE,
+                              help="Nombre d'exécutions précédentes formant la référence")
+        commande.add_argument('--alpha', type=float, default=ALPHA, help="Seuil de signification du test")
+        commande.add_argument('--seuil', type=float, default=SEUIL_RALENTISSEMENT,
+                              help="Baisse minimale de la médiane pour une régression (0.05 pour 5 %%)")
+        commande.add_argument('--accepter', action='store_true',
+                              help="Accepter les régressions: l'exécution devient la nouvelle référence")
+
+    commande_accepter = sous_parseurs.add_parser('accepter',
+                                                 help="Accepter les régressions de la dernière exécution")
+    commande_accepter.add_argument('--commit', help="Accepter plutôt la dernière exécution de ce commit")
+
+    commande_tendance = sous_parseurs.add_parser('tendance', help="Afficher l'évolution des chemins suivis")
+    commande_tendance.add_argument('--nombre', type=int, default=8, help="Nombre d'exécutions affichées")
+    return parseur.parse_args()
+
+
+if __name__ == '__main__':
+    arguments = analyser_arguments()
+    if arguments.commande == 'tendance':
+        afficher_tendance(lire_historique(arguments.historique), arguments.nombre)
+    elif arguments.commande == 'accepter':
+        if not accepter_derniere(arguments.historique, arguments.commit):
+            sys.exit("Aucune exécution à accepter dans {}.".format(arguments.historique))
+    else:
+        if arguments.commande == 'executer':
+            rapport = executer_chemins_suivis(arguments.essais, arguments.duree_essai)
+        else:
+            with open(arguments.rapport, encoding='utf-8') as fichier:
+                rapport = json.load(fichier)
+            rapport['machine'] = rapport.get('machine', decrire_machine())
+        if enregistrer(rapport, arguments.historique, arguments.fenetre, arguments.alpha, arguments.seuil,
+                       arguments.accepter):
+            sys.exit(1)
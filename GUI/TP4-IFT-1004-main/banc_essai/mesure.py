@@ -0,0 +1,110 @@
+"""
+La mesure d'un scénario du banc d'essai: échauffement, essais répétés, puis le nombre
+d'opérations par seconde et son intervalle de confiance à 95 %.
+
+Un scénario est une fonction qui reçoit un nombre de répétitions, prépare tout ce dont
+elle a besoin (hors chronomètre), puis donne une fonction sans paramètre qui effectue
+ces répétitions. Seul l'appel de cette dernière est chronométré.
+"""
+
+import gc
+from collections import namedtuple
+from math import sqrt
+from statistics import mean, stdev
+from time import perf_counter
+
+# Le quantile 97,5 % de la loi de Student, par nombre de degrés de liberté (1 à 30).
+# Au-delà, on utilise celui de la loi normale.
+QUANTILES_STUDENT = [12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                     2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                     2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042]
+QUANTILE_NORMAL = 1.960
+
+# La durée minimale d'un essai, en secondes: les répétitions sont ajustées pour l'atteindre.
+DUREE_ESSAI = 0.05
+
+Mesure = namedtuple('Mesure', ['operations_par_seconde', 'intervalle_95', 'ecart_type',
+                               'essais', 'repetitions', 'debits'])
+
+
+def quantile_student(degres_liberte):
+    """
+    Args:
+        degres_liberte (int): Le nombre de degrés de liberté (au moins 1)
+
+    Returns:
+        float: Le quantile 97,5 % de la loi de Student
+    """
+    if degres_liberte <= len(QUANTILES_STUDENT):
+        return QUANTILES_STUDENT[degres_liberte - 1]
+    return QUANTILE_NORMAL
+
+
+def chronometrer(scenario, repetitions):
+    """
+    Prépare puis effectue les répétitions d'un scénario. Le ramasse-miettes est
+    suspendu pendant la mesure, comme le fait timeit.
+
+    Args:
+        scenario (fonction): Le scénario
+        repetitions (int): Le nombre de répétitions
+
+    Returns:
+        float: La durée des répétitions, en secondes
+    """
+    executer = scenario(repetitions)
+    gc_actif = gc.isenabled()
+    gc.disable()
+    try:
+        debut = perf_counter()
+        executer()
+        return perf_counter() - debut
+    finally:
+        if gc_actif:
+            gc.enable()
+
+
+def calibrer(scenario, duree_essai=DUREE_ESSAI):
+    """
+    Trouve le nombre de répétitions (1, 2, 5, 10, 20, 50, ...) pour qu'un essai dure au
+    moins duree_essai. Les essais de calibration servent aussi d'échauffement.
+
+    Args:
+        scenario (fonction): Le scénario
+        duree_essai (float, optional): La durée minimale d'un essai, en secondes. Défaut: DUREE_ESSAI
+
+    Returns:
+        int: Le nombre de répétitions
+    """
+    puissance = 1
+    while True:
+        for facteur in (1, 2, 5):
+            repetitions = facteur * puissance
+            if chronometrer(scenario, repetitions) >= duree_essai:
+                return repetitions
+        puissance *= 10
+
+
+def mesurer(scenario, essais=10, echauffement=2, duree_essai=DUREE_ESSAI):
+    """
+    Mesure un scénario: calibration, essais d'échauffement (ignorés), puis essais mesurés.
+
+    Args:
+        scenario (fonction): Le scénario
+        essais (int, optional): Le nombre d'essais mesurés (au moins 2). Défaut: 10
+        echauffement (int, optional): Le nombre d'essais ignorés après la calibration. Défaut: 2
+        duree_essai (float, optional): La durée minimale d'un essai, en secondes. Défaut: DUREE_ESSAI
+
+    Returns:
+        Mesure: Le nombre moyen d'opérations par seconde, son intervalle de confiance et
+            le débit de chaque essai
+    """
+    repetitions = calibrer(scenario, duree_essai)
+    for _ in range(echauffement):
+        chronometrer(scenario, repetitions)
+    debits = [repetitions / max(chronometrer(scenario, repetitions), 1e-9) for _ in range(max(2, essais))]
+
+    moyenne = mean(debits)
+    ecart_type = stdev(debits)
+    marge = quantile_student(len(debits) - 1) * ecart_type / sqrt(len(debits))
+    return Mesure(moyenne, (moyenne - marge, moyenne + marge), ecart_type, len(debits), repetitions, debits)
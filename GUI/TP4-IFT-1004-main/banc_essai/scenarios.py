@@ -0,0 +1,282 @@
+"""
+Les scénarios du banc d'essai: un par chemin critique du jeu.
+
+Chaque fabrique de scénario reçoit la dimension de l'arène et le nombre de dés, et donne
+un scénario au sens de banc_essai.mesure: une fonction qui reçoit un nombre de répétitions,
+prépare les données (arènes, lancers, joueurs) hors chronomètre, puis donne la fonction
+chronométrée. Tout le hasard vient d'un GenerateurAleatoire semé: deux exécutions du banc
+mesurent exactement le même travail.
+
+SCENARIOS associe à chaque nom sa fabrique et les paramètres qu'elle balaie; les autres
+paramètres gardent leur valeur par défaut (DIMENSION_DEFAUT, DES_DEFAUT).
+"""
+
+import sys
+from collections import namedtuple
+from importlib import import_module
+from pathlib import Path
+
+from jeu.arene import Arene
+from jeu.de import De
+from jeu.hasard import GenerateurAleatoire
+from jeu.joueur import Joueur
+from jeu.lancer import ANGLES, Lancer
+
+# Le dossier de la version console du jeu, pour le scénario affichage_string.
+CHEMIN_CONSOLE = Path(__file__).resolve().parents[3] / 'Console' / 'TP-remise'
+
+DIMENSION_DEFAUT = 5
+DES_DEFAUT = 10
+GRAINE = 0
+
+# Nombre de lancers après lequel une partie du scénario partie est déclarée nulle.
+LIMITE_LANCERS = 2000
+
+Scenario = namedtuple('Scenario', ['fabrique', 'parametres', 'description'])
+
+
+class ScenarioIndisponible(Exception):
+    """ Le scénario ne peut pas être mesuré ici (pas d'affichage, module manquant, ...). """
+
+
+def generateur(*cles):
+    """
+    Args:
+        *cles: Les clés du sous-flux (le nom du scénario et ses paramètres)
+
+    Returns:
+        GenerateurAleatoire: Un flux aléatoire propre au scénario
+    """
+    return GenerateurAleatoire(GRAINE).sous_flux(*cles)
+
+
+def remplir_arene(arene, nombre_des, hasard):
+    """
+    Lance des dés à des emplacements au hasard de l'arène (un même emplacement peut être
+    pigé deux fois: l'arène contient alors moins de dés).
+
+    Args:
+        arene (Arene): L'arène à remplir
+        nombre_des (int): Le nombre de dés à lancer
+        hasard (random.Random): Le générateur aléatoire
+    """
+    for _ in range(nombre_des):
+        emplacement = hasard.randrange(arene.dimension), hasard.randrange(arene.dimension)
+        arene.placer_nouveau_de(De(), emplacement)
+
+
+def parametres_lancers(dimension, nombre, hasard):
+    """
+    Pige des paramètres de lancers comme le ferait JoueurOrdinateur.
+
+    Args:
+        dimension (int): La dimension de l'arène
+        nombre (int): Le nombre de lancers
+        hasard (random.Random): Le générateur aléatoire
+
+    Returns:
+        list: Les paramètres (emplacement, angle, puissance) de chaque lancer
+    """
+    angles = list(ANGLES.keys())
+    return [((hasard.randrange(dimension), hasard.randrange(dimension)), hasard.choice(angles),
+             hasard.randint(1, max(1, dimension // 4))) for _ in range(nombre)]
+
+
+def scenario_lancer(dimension, nombre_des):
+    """ Construction d'un Lancer, trajectoire et déviations comprises. """
+    def scenario(repetitions):
+        hasard = generateur('lancer', dimension)
+        parametres = parametres_lancers(dimension, repetitions, hasard)
+        de = De()
+
+        def executer():
+            for emplacement, angle, puissance in parametres:
+                Lancer(de, emplacement, angle, puissance, hasard)
+        return executer
+    return scenario
+
+
+def scenario_trajectoire(dimension, nombre_des):
+    """ Lancer.obtenir_trajectoire seul, sur un lancer déjà construit. """
+    def scenario(repetitions):
+        hasard = generateur('trajectoire', dimension)
+        parametres = parametres_lancers(dimension, repetitions, hasard)
+        lancer = Lancer(De(), (0, 0), 'N', 1, hasard)
+
+        def executer():
+            for emplacement, angle, puissance in parametres:
+                lancer.obtenir_trajectoire(emplacement, angle, puissance)
+        return executer
+    return scenario
+
+
+def scenario_effectuer_lancer(dimension, nombre_des):
+    """ Arene.effectuer_lancer, chaque fois sur une nouvelle arène qui contient nombre_des dés. """
+    def scenario(repetitions):
+        hasard = generateur('effectuer_lancer', dimension, nombre_des)
+        lancers = []
+        for emplacement, angle, puissance in parametres_lancers(dimension, repetitions, hasard):
+            arene = Arene(dimension, De(), 1, hasard)
+            remplir_arene(arene, nombre_des, hasard)
+            lancers.append((arene, Lancer(De(), emplacement, angle, puissance, hasard)))
+
+        def executer():
+            for arene, lancer in lancers:
+                arene.effectuer_lancer(lancer)
+        return executer
+    return scenario
+
+
+def scenario_rangement(dimension, nombre_des):
+    """ Arene.rangement, chaque fois sur une nouvelle arène après une table rase. """
+    def scenario(repetitions):
+        hasard = generateur('rangement', dimension, nombre_des)
+        arenes = []
+        for _ in range(repetitions):
+            arene = Arene(dimension, De(), 1, hasard)
+            remplir_arene(arene, nombre_des, hasard)
+            arenes.append(arene)
+        joueur = Joueur(1, [], arenes[0])
+
+        def executer():
+            for arene in arenes:
+                arene.rangement(joueur)
+        return executer
+    return scenario
+
+
+def scenario_table_rase(dimension, nombre_des):
+    """ Joueur.table_rase: un lancer au hasard pour chacun des dés du joueur. """
+    def scenario(repetitions):
+        hasard = generateur('table_rase', dimension, nombre_des)
+        arene = Arene(dimension, De(), 1, hasard)
+        joueurs = [Joueur(1, [De() for _ in range(nombre_des)], arene) for _ in range(repetitions)]
+
+        def executer():
+            for joueur in joueurs:
+                joueur.table_rase()
+        return executer
+    return scenario
+
+
+def scenario_partie(dimension, nombre_des):
+    """ Une partie complète entre deux JoueurOrdinateur, sans affichage (tournoi.jouer_partie). """
+    from tournoi import jouer_partie
+
+    def scenario(repetitions):
+        taches = [{
+            'numero': numero,
+            'graine': GRAINE,
+            'strategies': [('ordinateur', {}), ('ordinateur', {})],
+            'arene': 'dictionnaire',
+            'dimension': dimension,
+            'nombre_des': nombre_des,
+            'limite_lancers': LIMITE_LANCERS,
+            'rotation': True,
+            'journal': False,
+        } for numero in range(repetitions)]
+
+        def executer():
+            for tache in taches:
+                jouer_partie(tache)
+        return executer
+    return scenario
+
+
+def importer_console():
+    """
+    Importe le module arene de la version console du jeu.
+
+    Returns:
+        tuple: Les modules arene et de de la version console
+
+    Raises:
+        ScenarioIndisponible: Si la version console est absente ou ne peut pas être importée
+    """
+    if str(CHEMIN_CONSOLE) not in sys.path:
+        sys.path.append(str(CHEMIN_CONSOLE))
+    try:
+        return import_module('arene'), import_module('de')
+    except ImportError as erreur:
+        raise ScenarioIndisponible("Version console introuvable: {}".format(erreur))
+
+
+def scenario_affichage_string(dimension, nombre_des):
+    """ Arene.affichage_string de la version console, avec une trajectoire en évidence. """
+    arene_console, de_console = importer_console()
+
+    def scenario(repetitions):
+        hasard = generateur('affichage_string', dimension, nombre_des)
+        arene = arene_console.Arene(dimension, de_console.De(), 1)
+        for _ in range(nombre_des):
+            de = de_console.De()
+            de.valeur = hasard.randint(1, 6)
+            arene.des[(hasard.randrange(dimension), hasard.randrange(dimension))] = de
+        trajectoire = [(i, i) for i in range(min(dimension, 8))]
+
+        def executer():
+            for _ in range(repetitions):
+                arene.affichage_string(trajectoire)
+        return executer
+    return scenario
+
+
+# La fenêtre Tk partagée par les scénarios d'affichage (créée au premier besoin).
+fenetre_tk = None
+
+
+def obtenir_fenetre_tk():
+    """
+    Returns:
+        Tk: Une fenêtre Tk cachée
+
+    Raises:
+        ScenarioIndisponible: S'il n'y a pas d'affichage (ou pas de Tk)
+    """
+    global fenetre_tk
+    if fenetre_tk is None:
+        try:
+            from tkinter import Tk, TclError
+        except ImportError as erreur:
+            raise ScenarioIndisponible("Tkinter indisponible: {}".format(erreur))
+        try:
+            fenetre_tk = Tk()
+        except TclError as erreur:
+            raise ScenarioIndisponible("Aucun affichage: {}".format(erreur))
+        fenetre_tk.withdraw()
+    return fenetre_tk
+
+
+def scenario_dessiner_canvas(dimension, nombre_des):
+    """ Création de tous les items d'un CanvasArene (CanvasArene.creer_cases, puis dessiner_canvas). """
+    fenetre = obtenir_fenetre_tk()
+    from interface.canvas_arene import CanvasArene
+
+    def scenario(repetitions):
+        hasard = generateur('dessiner_canvas', dimension, nombre_des)
+        arene = Arene(dimension, De(), 1, hasard)
+        remplir_arene(arene, nombre_des, hasard)
+        canvas = CanvasArene(fenetre, arene)
+
+        def executer():
+            for _ in range(repetitions):
+                canvas.creer_cases()
+                canvas.dessiner_canvas(lambda: None)
+            canvas.update_idletasks()
+        return executer
+    return scenario
+
+
+SCENARIOS = {
+    'lancer': Scenario(scenario_lancer, ('dimension',), scenario_lancer.__doc__.strip()),
+    'trajectoire': Scenario(scenario_trajectoire, ('dimension',), scenario_trajectoire.__doc__.strip()),
+    'effectuer_lancer': Scenario(scenario_effectuer_lancer, ('dimension', 'des'),
+                                 scenario_effectuer_lancer.__doc__.strip()),
+    'rangement': Scenario(scenario_rangement, ('dimension', 'des'), scenario_rangement.__doc__.strip()),
+    'table_rase': Scenario(scenario_table_rase, ('dimension', 'des'), scenario_table_rase.__doc__.strip()),
+    'partie': Scenario(scenario_partie, ('dimension', 'des'), scenario_partie.__doc__.strip()),
+    'affichage_string': Scenario(scenario_affichage_string, ('dimension', 'des'),
+                                 scenario_affichage_string.__doc__.strip()),
+    'dessiner_canvas': Scenario(scenario_dessiner_canvas, ('dimension', 'des'),
+                                scenario_dessiner_canvas.__doc__.strip()),
+}
@@ -5,9 +5,19 @@ et de gérer les clics.
 from math import ceil, floor
 from tkinter import Canvas, ALL, LAST
 
-# Cette constante donne la hauteur totale de l'arène, en pixels.
+from interface.ordonnanceur_animation import OrdonnanceurAnimation
+from interface.sprites_des import CacheSprites
+
+# Cette constante donne la hauteur totale de la vue de l'arène, en pixels.
 DIMENSION_BASE = 300
 
+# Les tailles extrêmes d'une case, en pixels, permises par le zoom.
+TAILLE_CASE_MINIMALE = 4
+TAILLE_CASE_MAXIMALE = 100
+
+# Le facteur appliqué à la taille des cases à chaque cran de la molette.
+FACTEUR_ZOOM = 1.25
+
 
 class CanvasArene(Canvas):
     def __init__(self, master, arene):
@@ -16,6 +26,11 @@ class CanvasArene(Canvas):
         en fonction des dimensions de l'arène, dessine l'arène dans l'interface
         et associe le clic de souris à la méthode selectionner_case.
 
+        Le canvas est une vue de DIMENSION_BASE pixels sur l'arène: si l'arène est trop grande
+        pour que ses cases y tiennent à TAILLE_CASE_MINIMALE pixels, on n'en voit qu'une partie.
+        La molette change la taille des cases (zoom) et le bouton droit, glissé, déplace la vue.
+        Seules les cases visibles ont des items dans le canvas (CanvasArene.actualiser_vue).
+
         Args:
             master (Tk): Le widget TKinter dans lequel le canvas s'intègre.
             arene (Arene): L'arène des GlaDéateurs à afficher.
@@ -28,26 +43,45 @@ class CanvasArene(Canvas):
 
         self.suite_clic = None
         self.coordonnees_cliquables = lambda coordonnees: False
-        self.dimension_case = self.dimension_canvas // self.arene.dimension
+        self.dimension_case = min(TAILLE_CASE_MAXIMALE,
+                                  max(TAILLE_CASE_MINIMALE, self.dimension_canvas // self.arene.dimension))
+        self.sprites = CacheSprites(self)
+        # Les items conservés d'un dessin à l'autre (CanvasArene.creer_cases).
+        self.cases_visibles = None
+        self.items_cases = {}
+        self.reserve_cases = []
+        self.textes_des = {}
+        self.items_faces = {}
+        self.cases_roses = set()
+        self.cliquables_dessinees = None
+        self.fleches = []
+        self.ordonnanceur = OrdonnanceurAnimation(self)
         self.bind("<Button-1>", self.selectionner_case)
+        self.bind("<ButtonPress-3>", lambda event: self.scan_mark(event.x, event.y))
+        self.bind("<B3-Motion>", self.deplacer_vue)
+        self.bind("<MouseWheel>", self.zoomer)
+        self.bind("<Button-4>", self.zoomer)
+        self.bind("<Button-5>", self.zoomer)
         self.dessiner_canvas(lambda: None)
 
     def pixel_vers_coordonnees(self, x, y):
         """
-        Cette méthode convertit la position d'un clic en coordonnées de l'arène.
+        Cette méthode convertit la position d'un clic en coordonnées de l'arène,
+        en tenant compte du déplacement de la vue et du zoom.
 
         Args:
-            x: La position du clic, en x (de haut en bas)
-            y: La position du clic, en y (de gauche à droite)
+            x: La position du clic dans la vue, en x (de haut en bas)
+            y: La position du clic dans la vue, en y (de gauche à droite)
 
         Returns:
             tuple: Les coordonnées de la case cliquée.
         """
-        return x // self.dimension_case, y // self.dimension_case
+        return int(self.canvasy(x) // self.dimension_case), int(self.canvasx(y) // self.dimension_case)
 
     def coordonnees_vers_pixels(self, x, y, milieu=False):
         """
-        Cette méthode des coordonnées de l'arène en position en pixels
+        Cette méthode des coordonnées de l'arène en position en pixels, dans le repère
+        du canvas (avant le déplacement de la vue).
 
         Args:
             x (int): La coordonnée en x
@@ -75,71 +109,275 @@ class CanvasArene(Canvas):
         """
         x, y = event.y, event.x  # nos coordonnées sont transposées par rapport aux pixels
         coordonnees = self.pixel_vers_coordonnees(x, y)
-        if self.suite_clic is not None and self.coordonnees_cliquables(coordonnees):
+        if self.suite_clic is not None and self.arene.dans_arene(coordonnees) \
+                and self.coordonnees_cliquables(coordonnees):
             self.suite_clic(coordonnees)
 
     def dessiner_canvas(self, suite):
         """
-        Cette méthode dessine l'arène.
+        Cette méthode dessine l'arène. Les items du canvas sont conservés d'un dessin à
+        l'autre: seuls les items des cases visibles qui ont changé depuis le dernier dessin
+        (dé ajouté, retiré ou de valeur différente, case devenue cliquable ou non) sont modifiés.
+        Les flèches du dernier lancer sont effacées.
 
         Args:
             suite (fonction): La suite du programme
         """
+        if self.cases_visibles is None:
+            self.creer_cases()
+        self.effacer_trajectoire()
+        self.actualiser_cliquables()
+        for coordonnees in list(self.textes_des):
+            if coordonnees not in self.arene.des:
+                self.actualiser_de(coordonnees)
+        for coordonnees in self.arene.des:
+            if coordonnees in self.items_cases:
+                self.actualiser_de(coordonnees)
+        self.tag_raise('bordure')
+        suite()
+
+    def creer_cases(self):
+        """
+        Efface le canvas, ajuste la zone défilable à la taille des cases et crée la bordure
+        de l'arène, puis les items des cases visibles (CanvasArene.actualiser_vue).
+        """
         self.delete(ALL)
-        for i in range(self.arene.dimension ** 2):
-            x, y = i // self.arene.dimension, i % self.arene.dimension
+        self.cases_visibles = None
+        self.items_cases = {}
+        self.reserve_cases = []
+        self.textes_des = {}
+        self.items_faces = {}
+        self.cases_roses = set()
+        self.cliquables_dessinees = self.coordonnees_cliquables
+        taille_arene = self.arene.dimension * self.dimension_case
+        self.configure(scrollregion=(0, 0, taille_arene + 1, taille_arene + 1))
+        self.create_rectangle(0, 0, taille_arene, taille_arene,
+                              outline='black', width=5, tags='bordure')
+        self.actualiser_vue()
+        fleches, self.fleches = self.fleches, []
+        for depart, arrivee in fleches:
+            self.dessiner_fleche(depart, arrivee)
+
+    def calculer_cases_visibles(self):
+        """
+        Donne les rangées et les colonnes de l'arène qui sont dans la vue.
+
+        Returns:
+            tuple: La première rangée, la rangée suivant la dernière, puis la même chose pour les colonnes
+        """
+        dimension = self.arene.dimension
+        haut, gauche = self.canvasy(0), self.canvasx(0)
+        x_debut = max(0, int(haut // self.dimension_case))
+        x_fin = min(dimension, int((haut + self.dimension_canvas) // self.dimension_case) + 1)
+        y_debut = max(0, int(gauche // self.dimension_case))
+        y_fin = min(dimension, int((gauche + self.dimension_canvas) // self.dimension_case) + 1)
+        return x_debut, x_fin, y_debut, y_fin
+
+    def actualiser_vue(self):
+        """
+        Crée les items des cases qui viennent d'entrer dans la vue et retire ceux des cases
+        qui en sont sorties. Les rectangles des cases sorties sont cachés et gardés en réserve,
+        pour être déplacés vers les prochaines cases qui entrent plutôt que d'en créer d'autres.
+        """
+        cases_visibles = self.calculer_cases_visibles()
+        if cases_visibles == self.cases_visibles:
+            return
+        x_debut, x_fin, y_debut, y_fin = cases_visibles
+        visibles = {(x, y) for x in range(x_debut, x_fin) for y in range(y_debut, y_fin)}
+
+        for coordonnees in [coordonnees for coordonnees in self.items_cases if coordonnees not in visibles]:
+            item = self.items_cases.pop(coordonnees)
+            self.itemconfigure(item, state='hidden')
+            self.reserve_cases.append(item)
+            self.cases_roses.discard(coordonnees)
+            if coordonnees in self.textes_des:
+                self.delete(self.etiquette_case(coordonnees))
+                del self.textes_des[coordonnees]
+                self.items_faces.pop(coordonnees, None)
+
+        for coordonnees in visibles:
+            if coordonnees in self.items_cases:
+                continue
+            x, y = coordonnees
             haut, gauche = self.coordonnees_vers_pixels(x, y)
             bas, droite = self.coordonnees_vers_pixels(x + 1, y + 1)
-            if self.coordonnees_cliquables((x, y)):
+            if self.coordonnees_cliquables(coordonnees):
                 remplissage = 'pink'
+                self.cases_roses.add(coordonnees)
             else:
                 remplissage = 'white'
-            self.create_rectangle(gauche, haut, droite, bas,
-                                  outline='gray', fill=remplissage, width=1)
-            if (x, y) in self.arene.des:
-                self.dessiner_de((x, y), gauche + 5, haut + 5, droite - 5, bas - 5)
+            if len(self.reserve_cases) > 0:
+                item = self.reserve_cases.pop()
+                self.coords(item, gauche, haut, droite, bas)
+                self.itemconfigure(item, fill=remplissage, state='normal')
+            else:
+                item = self.create_rectangle(gauche, haut, droite, bas,
+                                             outline='gray', fill=remplissage, width=1)
+            self.items_cases[coordonnees] = item
+            if coordonnees in self.arene.des:
+                self.actualiser_de(coordonnees)
 
-        self.create_rectangle(0, 0, self.dimension_canvas, self.dimension_canvas,
-                              outline='black', width=5)
-        suite()
+        self.cases_visibles = cases_visibles
+        self.tag_raise('bordure')
+        self.tag_raise('trajectoire')
 
-    def dessiner_de(self, coordonnees, gauche, haut, droite, bas):
-        self.create_rectangle(gauche, haut, droite, bas, fill='white',
-                              outline='black', width=3)
-        texte_de = self.arene.afficher_de(coordonnees)
-        if texte_de.isnumeric() or texte_de == 'X':
-            self.create_text((gauche + droite) // 2, (haut + bas) // 2, fill='black',
-                             font="Times 20 bold", text=texte_de)
+    def deplacer_vue(self, event):
+        """
+        Déplace la vue en suivant la souris (bouton droit enfoncé).
+
+        Args:
+            event (tkinter.Event): L'événement de déplacement de la souris
+        """
+        self.scan_dragto(event.x, event.y, gain=1)
+        self.actualiser_vue()
+
+    def zoomer(self, event):
+        """
+        Agrandit ou rapetisse les cases selon le sens de la molette, en gardant sous la
+        souris le même point de l'arène.
+
+        Args:
+            event (tkinter.Event): L'événement de la molette
+        """
+        if event.num == 5 or getattr(event, 'delta', 0) < 0:
+            self.changer_zoom(1 / FACTEUR_ZOOM, event.x, event.y)
+        else:
+            self.changer_zoom(FACTEUR_ZOOM, event.x, event.y)
+
+    def changer_zoom(self, facteur, x_vue=0, y_vue=0):
+        """
+        Multiplie la taille des cases par un facteur (bornée par TAILLE_CASE_MINIMALE et
+        TAILLE_CASE_MAXIMALE), puis recrée les items des cases visibles.
+
+        Args:
+            facteur (float): Le facteur de zoom
+            x_vue (int, optional): La position horizontale, dans la vue, du point fixe. Défaut: 0
+            y_vue (int, optional): La position verticale, dans la vue, du point fixe. Défaut: 0
+        """
+        dimension_case = round(self.dimension_case * facteur)
+        if dimension_case == self.dimension_case:
+            dimension_case += 1 if facteur > 1 else -1
+        dimension_case = max(TAILLE_CASE_MINIMALE, min(TAILLE_CASE_MAXIMALE, dimension_case))
+        if dimension_case == self.dimension_case:
+            return
+        point_x = self.canvasx(x_vue) / self.dimension_case
+        point_y = self.canvasy(y_vue) / self.dimension_case
+        self.dimension_case = dimension_case
+        taille_arene = self.arene.dimension * dimension_case + 1
+        self.configure(scrollregion=(0, 0, taille_arene, taille_arene))
+        self.xview_moveto(max(0.0, (point_x * dimension_case - x_vue) / taille_arene))
+        self.yview_moveto(max(0.0, (point_y * dimension_case - y_vue) / taille_arene))
+        self.creer_cases()
+
+    def actualiser_cliquables(self):
+        """
+        Colore en rose les cases cliquables. Les cases visibles ne sont reparcourues que si
+        la fonction qui les détermine a changé (CanvasArene.permettre_clics,
+        CanvasArene.afficher_lancer), et seules celles dont l'état a changé sont recolorées.
+        """
+        if self.coordonnees_cliquables is self.cliquables_dessinees:
+            return
+        cases_roses = {coordonnees for coordonnees in self.items_cases if self.coordonnees_cliquables(coordonnees)}
+        for coordonnees in cases_roses ^ self.cases_roses:
+            remplissage = 'pink' if coordonnees in cases_roses else 'white'
+            self.itemconfigure(self.items_cases[coordonnees], fill=remplissage)
+        self.cases_roses = cases_roses
+        self.cliquables_dessinees = self.coordonnees_cliquables
+
+    def actualiser_de(self, coordonnees):
+        """
+        Met le dessin du dé d'une case en accord avec l'arène. Rien n'est fait si le dé dessiné
+        est déjà le bon; si la face reste du même genre (texte ou image), son item est modifié
+        sur place; autrement, les items du dé sont effacés puis recréés.
+
+        Args:
+            coordonnees ((int, int)): La case
+        """
+        ancien_texte = self.textes_des.get(coordonnees)
+        if coordonnees in self.arene.des and coordonnees in self.items_cases:
+            texte = self.arene.afficher_de(coordonnees)
+        else:
+            texte = None
+        if texte == ancien_texte:
+            return
+        if ancien_texte is not None and texte is not None and \
+                self.sprites.contient(texte) == self.sprites.contient(ancien_texte):
+            item = self.items_faces[coordonnees]
+            if self.sprites.contient(texte):
+                self.itemconfigure(item, image=self.sprites.obtenir(texte, self.dimension_case - 2 * self.marge_de()))
+            else:
+                self.itemconfigure(item, text=texte)
+        else:
+            self.delete(self.etiquette_case(coordonnees))
+            self.items_faces.pop(coordonnees, None)
+            if texte is not None:
+                x, y = coordonnees
+                haut, gauche = self.coordonnees_vers_pixels(x, y)
+                bas, droite = self.coordonnees_vers_pixels(x + 1, y + 1)
+                marge = self.marge_de()
+                self.dessiner_de(coordonnees, gauche + marge, haut + marge, droite - marge, bas - marge,
+                                 self.etiquette_case(coordonnees))
+        if texte is None:
+            del self.textes_des[coordonnees]
         else:
+            self.textes_des[coordonnees] = texte
+
+    def marge_de(self):
+        """
+        Returns:
+            int: L'espace entre le bord d'une case et son dé, en pixels
+        """
+        return min(5, self.dimension_case // 6)
+
+    def etiquette_case(self, coordonnees):
+        """
+        Donne l'étiquette des items du dé d'une case.
+
+        Args:
+            coordonnees ((int, int)): La case
+
+        Returns:
+            str: L'étiquette
+        """
+        return 'de_{}_{}'.format(*coordonnees)
+
+    def redessiner_cases(self, cases):
+        """
+        Redessine seulement les dés des cases données (par exemple celles qu'un rejeu vient de
+        modifier), sans parcourir les autres. La trajectoire reste par-dessus.
+
+        Args:
+            cases (iterable): Les coordonnées des cases à redessiner
+        """
+        for coordonnees in cases:
+            self.actualiser_de(coordonnees)
+        self.tag_raise('bordure')
+        self.tag_raise('trajectoire')
+
+    def dessiner_de(self, coordonnees, gauche, haut, droite, bas, etiquette=()):
+        """
+        Dessine le dé d'une case. Une face dessinée (mode d'affichage 2) est une seule image,
+        tirée du cache de sprites; un nombre ou un X est un rectangle et un texte.
+        L'item qui porte la face est retenu, pour être modifié sur place si la valeur change.
+
+        Args:
+            coordonnees ((int, int)): La case du dé
+            gauche, haut, droite, bas (int): Les limites du dé, en pixels
+            etiquette (str): L'étiquette des items du dé
+        """
+        texte_de = self.arene.afficher_de(coordonnees)
+        if self.sprites.contient(texte_de):
             #### DÉBUT DÉFI DESSINER DÉS ####
-            # Commencez par supprimer la ligne du raise.
-            l = (droite - gauche) // 10
-            if texte_de == "⚁":
-                self.create_oval(gauche+l, haut+l, gauche+3*l, haut+3*l, fill="black")
-                self.create_oval(gauche+7*l, haut+7*l, gauche+9*l, haut+9*l, fill="black")
-            if texte_de == "⚂":
-                self.create_oval(gauche + l, haut + l, gauche + 3 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + 7 * l, gauche + 9 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + 4 * l, haut + 4 * l, gauche + 6 * l, haut + 6 * l, fill="black")
-            if texte_de == "⚃":
-                self.create_oval(gauche + l, haut + l, gauche + 3 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + 7 * l, gauche + 9 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + l, haut + 7 * l, gauche + 3 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + l, gauche + 9 * l, haut + 3 * l, fill="black")
-            if texte_de == "⚄":
-                self.create_oval(gauche + l, haut + l, gauche + 3 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + 7 * l, gauche + 9 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + l, haut + 7 * l, gauche + 3 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + l, gauche + 9 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + 4 * l, haut + 4 * l, gauche + 6 * l, haut + 6 * l, fill="black")
-            if texte_de == "⚅":
-                self.create_oval(gauche + l, haut + l, gauche + 3 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + 7 * l, gauche + 9 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + l, haut + 7 * l, gauche + 3 * l, haut + 9 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + l, gauche + 9 * l, haut + 3 * l, fill="black")
-                self.create_oval(gauche + l, haut + 4 * l, gauche + 3 * l, haut + 6 * l, fill="black")
-                self.create_oval(gauche + 7 * l, haut + 4 * l, gauche + 9 * l, haut + 6 * l, fill="black")
+            image = self.sprites.obtenir(texte_de, droite - gauche)
+            item = self.create_image((gauche + droite) // 2, (haut + bas) // 2, image=image, tags=etiquette)
             #### FIN DÉFI DESSINER DÉS ####
+        else:
+            self.create_rectangle(gauche, haut, droite, bas, fill='white',
+                                  outline='black', width=3, tags=etiquette)
+            taille_police = max(1, min(20, self.dimension_case * 2 // 3))
+            item = self.create_text((gauche + droite) // 2, (haut + bas) // 2, fill='black',
+                                    font=("Times", taille_police, "bold"), text=texte_de, tags=etiquette)
+        self.items_faces[coordonnees] = item
 
     def permettre_clics(self, case_cliquable, suite_clic):
         """
@@ -163,13 +401,54 @@ class CanvasArene(Canvas):
             temps_attente (int): Temps en millisecondes avant d'exécuter la suite
             suite (fonction): la suite du programme
         """
+        self.afficher_lancers([lancer], temps_attente, suite)
+
+    def afficher_lancers(self, lancers, temps_attente, suite):
+        """
+        Désactive les clics et anime toutes les trajectoires en même temps
+        (OrdonnanceurAnimation), sur la durée du temps d'attente.
+
+        Args:
+            lancers (list): les lancers à afficher
+            temps_attente (int): Durée de l'animation en millisecondes, avant d'exécuter la suite
+            suite (fonction): la suite du programme
+        """
         self.suite_clic = None
         self.coordonnees_cliquables = lambda _: False
-        traj = lancer.trajectoire
+        if len(lancers) == 0:
+            suite()
+        else:
+            self.ordonnanceur.animer([lancer.trajectoire for lancer in lancers], temps_attente, suite)
+
+    def dessiner_trajectoire(self, traj):
+        """
+        Dessine d'un coup les flèches d'une trajectoire.
+
+        Args:
+            traj (list): Les coordonnées successives du dé
+        """
         for i in range(len(traj) - 1):
-            x1, y1 = traj[i]
-            x2, y2 = traj[i + 1]
-            self.create_line(*self.coordonnees_vers_pixels(y1, x1, True),
-                             *self.coordonnees_vers_pixels(y2, x2, True),
-                             arrow=LAST)
-        self.after(temps_attente, suite)
+            self.dessiner_fleche(traj[i], traj[i + 1])
+
+    def dessiner_fleche(self, depart, arrivee):
+        """
+        Dessine une flèche d'une trajectoire, avec l'étiquette 'trajectoire'. La flèche
+        est retenue pour être redessinée après un zoom.
+
+        Args:
+            depart ((int, int)): La case de départ
+            arrivee ((int, int)): La case d'arrivée
+        """
+        self.fleches.append((depart, arrivee))
+        x1, y1 = depart
+        x2, y2 = arrivee
+        self.create_line(*self.coordonnees_vers_pixels(y1, x1, True),
+                         *self.coordonnees_vers_pixels(y2, x2, True),
+                         arrow=LAST, tags='trajectoire')
+
+    def effacer_trajectoire(self):
+        """
+        Efface les flèches des trajectoires affichées.
+        """
+        self.fleches = []
+        self.delete('trajectoire')
@@ -9,6 +9,8 @@ from tkinter import IntVar, Button, Label, Entry, Frame, messagebox, RIDGE, Topl
 from jeu.arene import Arene
 from jeu.de import De
 from interface.joueur_ordinateur import JoueurOrdinateur
+from interface.joueur_ordinateur_esperance import JoueurOrdinateurEsperance
+from interface.joueur_ordinateur_mcts import JoueurOrdinateurMCTS
 from interface.joueur_humain_tk import JoueurHumainTk
 
 import os
@@ -118,6 +120,10 @@ class FrameJoueurs(Frame):
                 joueurs.append(JoueurHumainTk(i + 1, des, arene, fenetre_jeu))
             elif bouton_joueur['text'] == "Ordinateur":
                 joueurs.append(JoueurOrdinateur(i + 1, des, arene))
+            elif bouton_joueur['text'] == "Expert":
+                joueurs.append(JoueurOrdinateurEsperance(i + 1, des, arene))
+            elif bouton_joueur['text'] == "Stratège":
+                joueurs.append(JoueurOrdinateurMCTS(i + 1, des, arene))
         if len(joueurs) < 2:
             raise ValueError("Trop peu de joueurs!")
         return joueurs
@@ -134,6 +140,10 @@ class FrameJoueurs(Frame):
             self.boutons_joueur[i]['text'] = "Humain"
         elif self.boutons_joueur[i]['text'] == "Humain":
             self.boutons_joueur[i]['text'] = "Ordinateur"
+        elif self.boutons_joueur[i]['text'] == "Ordinateur":
+            self.boutons_joueur[i]['text'] = "Expert"
+        elif self.boutons_joueur[i]['text'] == "Expert":
+            self.boutons_joueur[i]['text'] = "Stratège"
         else:
             self.boutons_joueur[i]['text'] = "Inactif"
 
@@ -0,0 +1,88 @@
+"""
+Module contenant la classe FenetreMoniteur, la fenêtre de débogage qui affiche les
+mesures d'un MoniteurBoucle: la dérive de la boucle d'événements et les blocages.
+"""
+
+from tkinter import Toplevel, Label, Button, Frame, Listbox, END
+
+# L'intervalle entre deux mises à jour de la fenêtre, en millisecondes.
+DELAI_ACTUALISATION = 500
+
+
+def decrire_blocage(blocage):
+    """
+    Args:
+        blocage (Blocage): Le blocage
+
+    Returns:
+        str: Une ligne décrivant le blocage
+    """
+    if blocage.rappel is None:
+        return "{:>7.0f} ms  (hors du code du jeu)".format(blocage.duree)
+    if blocage.fonction == blocage.rappel:
+        return "{:>7.0f} ms  {}".format(blocage.duree, blocage.rappel)
+    return "{:>7.0f} ms  {}  >  {}".format(blocage.duree, blocage.rappel, blocage.fonction)
+
+
+class FenetreMoniteur(Toplevel):
+    def __init__(self, master, moniteur):
+        """
+        Constructeur de la classe FenetreMoniteur. Affiche les statistiques du moniteur,
+        les pires blocages et les derniers, mis à jour toutes les DELAI_ACTUALISATION millisecondes.
+
+        Args:
+            master (Tk): La fenêtre principale
+            moniteur (MoniteurBoucle): Le moniteur à afficher
+        """
+        super().__init__(master)
+        self.title("Les GlaDÉateurs - Boucle d'événements")
+        self.moniteur = moniteur
+
+        self.label_statistiques = Label(self, text="", justify='left')
+        self.label_statistiques.grid(row=0, column=0, columnspan=2, sticky='w', padx=10, pady=10)
+
+        Label(self, text="Pires blocages").grid(row=1, column=0, sticky='w', padx=10)
+        self.liste_pires = Listbox(self, width=70, height=10, font=('Courier', 10))
+        self.liste_pires.grid(row=2, column=0, columnspan=2, padx=10)
+        Label(self, text="Derniers blocages").grid(row=3, column=0, sticky='w', padx=10)
+        self.liste_recents = Listbox(self, width=70, height=10, font=('Courier', 10))
+        self.liste_recents.grid(row=4, column=0, columnspan=2, padx=10)
+
+        self.frame_boutons = Frame(self)
+        Button(self.frame_boutons, text="Réinitialiser", command=self.reinitialiser).grid(row=0, column=0, padx=5)
+        Button(self.frame_boutons, text="Fermer", command=self.fermer).grid(row=0, column=1, padx=5)
+        self.frame_boutons.grid(row=5, column=0, columnspan=2, pady=10)
+
+        self.protocol("WM_DELETE_WINDOW", self.fermer)
+        self.identifiant_actualisation = None
+        self.actualiser()
+
+    def actualiser(self):
+        """
+        Met à jour les statistiques et les listes de blocages, puis se replanifie.
+        """
+        moniteur = self.moniteur
+        self.label_statistiques["text"] = \
+            f"Battement: {moniteur.periode} ms, seuil de blocage: {moniteur.seuil} ms\n" \
+            f"Battements: {moniteur.battements}, dérive moyenne: {moniteur.derive_moyenne():.1f} ms, " \
+            f"dérive maximale: {moniteur.derive_maximale:.0f} ms"
+        for liste, blocages in ((self.liste_pires, moniteur.pires), (self.liste_recents, reversed(moniteur.recents))):
+            liste.delete(0, END)
+            for blocage in blocages:
+                liste.insert(END, decrire_blocage(blocage))
+        self.identifiant_actualisation = self.after(DELAI_ACTUALISATION, self.actualiser)
+
+    def reinitialiser(self):
+        """
+        Oublie les mesures du moniteur.
+        """
+        self.moniteur.reinitialiser()
+
+    def fermer(self):
+        """
+        Arrête les mises à jour et ferme la fenêtre (le moniteur continue de mesurer).
+        """
+        if self.identifiant_actualisation is not None:
+            self.after_cancel(self.identifiant_actualisation)
+            self.identifiant_actualisation = None
+        self.destroy()
@@ -3,13 +3,17 @@ Module contenant la classe FenetrePrincipale et ses classes utilitaires FrameAtt
 et FrameJoueurActif. Cette fenêtre permet de jouer au jeu.
 """
 
-from tkinter import Tk, Button, Label, messagebox
+from tkinter import Tk, Button, Label, messagebox, filedialog, simpledialog
 
 from jeu.gladeateur import Gladeateur
+from jeu.index_rejeu import indexer_journal
 from interface.joueur_ordinateur import JoueurOrdinateur
 from interface.gestionnaire_io_interface import GestionnaireIOInterface
 from interface.canvas_arene import CanvasArene
 from interface.fenetre_introduction import FenetreIntroduction
+from interface.fenetre_rejeu import FenetreRejeu
+from interface.fenetre_moniteur import FenetreMoniteur
+from interface.moniteur_boucle import MoniteurBoucle
 from interface.frames_fenetre_principale import FrameDescription, FrameJoueurActif, FrameTableauJoueurs, \
     FrameTempsAttente
 
@@ -25,8 +29,15 @@ class FenetrePrincipale(Tk):
         self.title("Les GlaDÉateurs")
         self.label_bienvenue = Label(text="Bienvenue aux GlaDéateurs!")
         self.bouton_commencer = Button(text="Commencer", width=20, command=self.lancer_fenetre_introduction)
+        self.bouton_rejeu = Button(text="Revoir une partie", width=20, command=self.lancer_fenetre_rejeu)
         self.label_bienvenue.grid(row=0, column=0, padx=10, pady=10)
         self.bouton_commencer.grid(row=1, column=0, padx=10, pady=10)
+        self.bouton_rejeu.grid(row=2, column=0, padx=10, pady=10)
+
+        # La boucle d'événements est surveillée en tout temps; F12 en affiche les blocages.
+        self.moniteur = MoniteurBoucle(self)
+        self.moniteur.demarrer()
+        self.bind_all("<F12>", lambda _: self.lancer_fenetre_moniteur())
 
     def lancer_fenetre_introduction(self):
         """
@@ -38,6 +49,31 @@ class FenetrePrincipale(Tk):
         if arene is not None and joueurs is not None:
             self.demarrer(arene, joueurs)
 
+    def lancer_fenetre_rejeu(self):
+        """
+        Ouvre un journal de parties (par exemple celui de tournoi.py --journal) et la
+        fenêtre qui permet d'en revoir une partie.
+        """
+        chemin = filedialog.askopenfilename(parent=self, title="Journal de parties")
+        if not chemin:
+            return
+        numero_partie = simpledialog.askinteger("Revoir une partie", "Numéro de la partie dans le journal:",
+                                                parent=self, initialvalue=1, minvalue=1)
+        if numero_partie is None:
+            return
+        try:
+            index = indexer_journal(chemin, numero_partie - 1)
+        except (OSError, ValueError) as erreur:
+            messagebox.showerror("Erreur", f"Impossible de revoir cette partie: {erreur}")
+            return
+        FenetreRejeu(self, index)
+
+    def lancer_fenetre_moniteur(self):
+        """
+        Ouvre la fenêtre de débogage de la boucle d'événements (MoniteurBoucle).
+        """
+        FenetreMoniteur(self, self.moniteur)
+
     def demarrer(self, arene, joueurs):
         """
         Lance une partie.
@@ -48,6 +84,7 @@ class FenetrePrincipale(Tk):
         """
         self.label_bienvenue.destroy()
         self.bouton_commencer.destroy()
+        self.bouton_rejeu.destroy()
 
         self.joueurs = joueurs
         self.arene = arene
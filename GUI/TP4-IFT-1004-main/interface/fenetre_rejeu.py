@@ -0,0 +1,212 @@
+"""
+Module contenant la classe FenetreRejeu, qui permet de revoir une partie journalisée
+(jeu.journal_partie) et de se rendre à n'importe quel lancer, dans les deux sens.
+"""
+
+from tkinter import Toplevel, Frame, Label, Button, Scale, Entry, HORIZONTAL, IntVar
+
+from jeu.journal_partie import EvenementLancer, EvenementRangement, EvenementTableRase, EvenementFinTour, \
+    EvenementVictoire
+from interface.canvas_arene import CanvasArene, DIMENSION_BASE
+
+# Le temps entre deux étapes lorsque le rejeu avance tout seul, en millisecondes.
+DELAI_LECTURE = 100
+
+COULEURS_JOUEURS = ['blue', 'green', 'red', 'orange', 'purple']
+
+
+class FenetreRejeu(Toplevel):
+    def __init__(self, master, index):
+        """
+        Constructeur de la classe FenetreRejeu. Affiche l'arène de l'index, une glissière
+        couvrant toutes les étapes de la partie et les boutons pour la parcourir.
+
+        Args:
+            master (Tk): La fenêtre principale
+            index (IndexRejeu): L'index de la partie à revoir
+        """
+        super().__init__(master)
+        self.title("Les GlaDÉateurs - Rejeu")
+        self.index = index
+        self.identifiant_lecture = None
+
+        self.canvas_arene = CanvasArene(self, index.arene)
+        self.canvas_arene.grid(row=0, column=0, padx=20, pady=20)
+
+        self.frame_joueurs = Frame(self)
+        self.labels_joueurs = []
+        for i in range(len(index.evenement_partie.joueurs)):
+            label = Label(self.frame_joueurs, text="", fg=COULEURS_JOUEURS[i % len(COULEURS_JOUEURS)])
+            label.grid(row=i, column=0, sticky='w')
+            self.labels_joueurs.append(label)
+        self.frame_joueurs.grid(row=0, column=1, padx=10, pady=10)
+
+        self.label_description = Label(self, text="")
+        self.label_description.grid(row=1, column=0, columnspan=2)
+
+        self.etape_var = IntVar(value=0)
+        self.glissiere = Scale(self, orient=HORIZONTAL, from_=0, to=index.nombre_etapes() - 1,
+                               length=DIMENSION_BASE, showvalue=False, variable=self.etape_var,
+                               command=self.glisser)
+        self.glissiere.grid(row=2, column=0, columnspan=2, padx=10)
+
+        self.frame_boutons = Frame(self)
+        Button(self.frame_boutons, text="<<", width=3, command=lambda: self.aller_a(0)).grid(row=0, column=0)
+        Button(self.frame_boutons, text="<", width=3, command=self.reculer).grid(row=0, column=1)
+        self.bouton_lecture = Button(self.frame_boutons, text="Lecture", width=8, command=self.basculer_lecture)
+        self.bouton_lecture.grid(row=0, column=2)
+        Button(self.frame_boutons, text=">", width=3, command=self.avancer).grid(row=0, column=3)
+        Button(self.frame_boutons, text=">>", width=3,
+               command=lambda: self.aller_a(self.index.nombre_etapes() - 1)).grid(row=0, column=4)
+        Label(self.frame_boutons, text="Lancer: ").grid(row=0, column=5, padx=(10, 0))
+        self.entry_lancer = Entry(self.frame_boutons, width=7)
+        self.entry_lancer.grid(row=0, column=6)
+        self.entry_lancer.bind("<Return>", lambda _: self.aller_au_lancer())
+        Button(self.frame_boutons, text="Aller", command=self.aller_au_lancer).grid(row=0, column=7)
+        self.frame_boutons.grid(row=3, column=0, columnspan=2, padx=10, pady=10)
+
+        self.bind("<Left>", lambda _: self.reculer())
+        self.bind("<Right>", lambda _: self.avancer())
+        self.bind("<space>", lambda _: self.basculer_lecture())
+        self.protocol("WM_DELETE_WINDOW", self.fermer)
+
+        self.afficher(set())
+
+    def aller_a(self, etape):
+        """
+        Se rend à une étape et ne redessine que les cases qui ont changé.
+
+        Args:
+            etape (int): L'étape visée
+        """
+        self.afficher(self.index.aller_a(etape))
+
+    def avancer(self):
+        """
+        Avance d'une étape.
+        """
+        self.afficher(self.index.avancer())
+
+    def reculer(self):
+        """
+        Recule d'une étape.
+        """
+        self.afficher(self.index.reculer())
+
+    def glisser(self, valeur):
+        """
+        Suit la glissière. Tkinter appelle aussi cette méthode lorsque l'affichage déplace
+        la glissière: on ne fait alors rien, puisqu'on est déjà à la bonne étape.
+
+        Args:
+            valeur (str): La position de la glissière
+        """
+        if int(valeur) != self.index.position:
+            self.aller_a(int(valeur))
+
+    def aller_au_lancer(self):
+        """
+        Se rend juste après le lancer dont le numéro est inscrit.
+        """
+        try:
+            numero_lancer = int(self.entry_lancer.get())
+        except ValueError:
+            return
+        self.aller_a(self.index.etape_du_lancer(numero_lancer))
+
+    def basculer_lecture(self):
+        """
+        Démarre ou arrête l'avance automatique.
+        """
+        if self.identifiant_lecture is None:
+            self.bouton_lecture["text"] = "Pause"
+            self.lire()
+        else:
+            self.arreter_lecture()
+
+    def lire(self):
+        """
+        Avance d'une étape, puis se replanifie, jusqu'à la fin de la partie.
+        """
+        if self.index.position >= self.index.nombre_etapes() - 1:
+            self.arreter_lecture()
+            return
+        self.avancer()
+        self.identifiant_lecture = self.after(DELAI_LECTURE, self.lire)
+
+    def arreter_lecture(self):
+        """
+        Arrête l'avance automatique.
+        """
+        if self.identifiant_lecture is not None:
+            self.after_cancel(self.identifiant_lecture)
+            self.identifiant_lecture = None
+        self.bouton_lecture["text"] = "Lecture"
+
+    def fermer(self):
+        """
+        Arrête l'avance automatique et ferme la fenêtre.
+        """
+        self.arreter_lecture()
+        self.destroy()
+
+    def afficher(self, cases):
+        """
+        Met à jour l'affichage de l'étape courante.
+
+        Args:
+            cases (set): Les cases à redessiner
+        """
+        etape = self.index.etape_courante()
+        self.canvas_arene.effacer_trajectoire()
+        self.canvas_arene.redessiner_cases(cases)
+        if etape.trajectoire is not None:
+            self.canvas_arene.dessiner_trajectoire(etape.trajectoire)
+
+        for i, (label, nombre_des) in enumerate(zip(self.labels_joueurs, etape.des_joueurs)):
+            numero = self.numero_joueur(i)
+            etat = f"{nombre_des} dés" if nombre_des > 0 else "ÉLIMINÉ"
+            marque = "> " if i == etape.joueur_index else "  "
+            label["text"] = f"{marque}Joueur # {numero} : {etat}"
+
+        self.label_description["text"] = \
+            f"Étape {self.index.position} / {self.index.nombre_etapes() - 1}, " \
+            f"lancer {etape.nombre_lancers}. {self.decrire(etape)}"
+        self.etape_var.set(self.index.position)
+
+    def numero_joueur(self, joueur_index):
+        """
+        Args:
+            joueur_index (int): L'index du joueur dans la partie
+
+        Returns:
+            int: Le numéro du joueur
+        """
+        return self.index.evenement_partie.joueurs[joueur_index][0]
+
+    def decrire(self, etape):
+        """
+        Décrit l'événement d'une étape.
+
+        Args:
+            etape (EtapeRejeu): L'étape
+
+        Returns:
+            str: La description
+        """
+        evenement = etape.evenement
+        if isinstance(evenement, EvenementLancer):
+            return f"Le joueur # {self.numero_joueur(etape.joueur_index)} lance vers {evenement.angle}."
+        if isinstance(evenement, EvenementRangement):
+            if evenement.correspondance:
+                return f"Rangement: {evenement.des_rendus} dé(s) rendu(s)."
+            return f"Rangement: aucune correspondance, {evenement.x_retires} X retiré(s)."
+        if isinstance(evenement, EvenementTableRase):
+            return f"Table rase pour le joueur # {self.numero_joueur(evenement.joueur_index)}!"
+        if isinstance(evenement, EvenementFinTour):
+            return f"Fin du tour. Au tour du joueur # {self.numero_joueur(evenement.joueur_index)}."
+        if isinstance(evenement, EvenementVictoire):
+            if evenement.joueur_index is None:
+                return "Partie interrompue."
+            return f"Victoire du joueur # {self.numero_joueur(evenement.joueur_index)}!"
+        return "Début de la partie."
@@ -6,6 +6,8 @@ Ainsi, les classes du jeu peuvent simplement exprimer par exemple qu'il faut aff
 sans avoir à se soucier de comment ce sera affiché.
 """
 
+from jeu.traceur import tracer
+
 
 class GestionnaireIOInterface:
     def __init__(self, fenetre_principale, canvas_arene, frame_description):
@@ -91,17 +93,13 @@ class GestionnaireIOInterface:
 
     def afficher_plusieurs_lancers(self, lancers, suite):
         """
-        Affiche récursivement plusieurs lancers sur le canvas
+        Affiche plusieurs lancers sur le canvas, tous animés en même temps
 
         Args:
-            lancers (list): Les lancers restants à afficher
+            lancers (list): Les lancers à afficher
             suite (fonction): La fonction à exécuter suite à l'affichage
         """
-        if len(lancers) == 0:
-            suite()
-        else:
-            self.afficher_lancer(lancers[0],
-                                 lambda: self.afficher_plusieurs_lancers(lancers[1:], suite))
+        self.canvas_arene.afficher_lancers(lancers, self.temps_attente(), suite)
 
     def afficher_victoire(self, joueur):
         """
@@ -110,3 +108,10 @@ class GestionnaireIOInterface:
             joueur (Joueur): Le joueur ayant remporté la partie
         """
         self.fenetre_principale.afficher_gagnant(joueur)
+
+
+# Points de trace (jeu.traceur), sans effet tant que le traceur n'est pas activé. L'attente de
+# chaque suite (Tk.after, animations) est aussi mesurée.
+tracer(GestionnaireIOInterface, ['afficher_jeu', 'afficher_table_rase', 'afficher_fin_tour', 'afficher_rangement',
+                                 'afficher_tour', 'afficher_lancer', 'afficher_plusieurs_lancers',
+                                 'afficher_victoire'], 'affichage', attente=True)
@@ -4,7 +4,6 @@ La classe JoueurOrdinateur
 Hérite de Joueur et contient une "intelligence artificielle" extrêmement rudimentaire.
 """
 
-from random import randint, choice
 from jeu.joueur import Joueur
 from jeu.lancer import ANGLES
 
@@ -12,25 +11,33 @@ from jeu.lancer import ANGLES
 #### DÉBUT DÉFI JOUEUR ORDINATEUR ####
 
 class JoueurOrdinateur(Joueur):  # N'oubliez pas d'hériter de Joueur !!
-    def __init__(self, numero_joueur, des_initiaux, arene):
+    def __init__(self, numero_joueur, des_initiaux, arene, probabilite_arret=0.25):
+        """
+        Constructeur de la classe JoueurOrdinateur.
+
+        Args:
+            numero_joueur (int): Le numéro identifiant le joueur
+            des_initiaux (list): Les dés en possession du joueur en début de partie
+            arene (Arene): l'arène du jeu
+            probabilite_arret (float): La probabilité de terminer son tour à chaque
+                décision de continuer. Défaut: une chance sur 4.
+        """
         super().__init__(numero_joueur, des_initiaux, arene)
+        self.probabilite_arret = probabilite_arret
 
     def decision_continuer(self):
-        decision = randint(1, 4)
-        if decision == 4:
-            return False
-        return True
+        return self.arene.generateur.random() >= self.probabilite_arret
 
     def choisir_coordonnees(self):
-        return randint(0, self.arene.dimension - 1), \
-               randint(0, self.arene.dimension - 1)
+        return self.arene.generateur.randint(0, self.arene.dimension - 1), \
+               self.arene.generateur.randint(0, self.arene.dimension - 1)
 
     def choisir_angle(self):
 
-        return choice(list(ANGLES.keys()))
+        return self.arene.generateur.choice(list(ANGLES.keys()))
 
     def choisir_puissance(self):
-        return randint(1, max(1, self.arene.dimension // 4))
+        return self.arene.generateur.randint(1, max(1, self.arene.dimension // 4))
     # Écrivez les 4 méthodes demandées.
 
 #### FIN DÉFI JOUEUR ORDINATEUR ####
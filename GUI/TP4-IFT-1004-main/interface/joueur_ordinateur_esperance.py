@@ -0,0 +1,441 @@
+"""
+La classe JoueurOrdinateurEsperance
+
+Hérite de JoueurOrdinateur, mais plutôt que de lancer au hasard, évalue chaque lancer
+permis (coordonnées, angle, puissance) par le nombre de dés qu'il peut espérer se faire
+rendre, et joue le meilleur.
+
+L'évaluation est exacte: pour chaque lancer, on calcule la probabilité de chaque
+combinaison (dés accrochés, case d'arrêt), puis l'espérance du nombre de dés rendus
+lorsque les dés accrochés et le dé lancé prennent une valeur au hasard. Pour rester
+rapide, la plupart des lancers ne sont pas évalués un à un:
+  - un lancer qui ne peut atteindre aucun dé de l'arène ne dépend que de la probabilité
+    que le dé s'arrête dans l'arène; on ne cherche donc que le meilleur d'entre eux;
+  - les autres sont regroupés par (angle, puissance) et évalués selon la position des dés
+    relativement au départ: le calcul des trajectoires est partagé par tous les départs
+    où les dés sont placés de la même façon, et gardé en mémoire, tout comme l'évaluation
+    d'un résultat selon les valeurs restantes;
+  - la meilleure décision pour un état de l'arène est aussi gardée en mémoire, dans une
+    table de transposition indexée par l'empreinte de l'arène (Arene.empreinte).
+Le calcul s'arrête enfin après un temps maximal, en gardant le meilleur lancer trouvé
+(une décision ainsi écourtée n'est pas gardée dans la table).
+"""
+
+import time
+from functools import lru_cache
+from math import comb, perm
+
+from interface.joueur_ordinateur import JoueurOrdinateur
+from jeu.distribution_lancer import distributions_relatives, directions_possibles
+from jeu.lancer import ANGLES
+from jeu.table_transposition import TableTransposition
+
+# Le nombre de cases de la table des meilleures décisions déjà calculées.
+TAILLE_CACHE_DECISIONS = 1024
+
+# Le nombre de placements de dés autour d'un départ (trajectoires_relatives, resultats_relatifs) gardés en mémoire.
+TAILLE_CACHE_RESULTATS = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def evaluer_resultat(comptes_fixes, nombre_aleatoires):
+    """
+    Évalue le rangement qui suit un lancer, lorsque certains dés gardent leur valeur
+    et que les autres (dés accrochés et dé lancé) prennent une valeur au hasard.
+
+    Pour une valeur v de 2 à 6, soit c le nombre de dés de valeur v après le lancer:
+    les dés de valeur v sont rendus si c > 1, donc on en espère E[c] - P(c = 1).
+
+    Args:
+        comptes_fixes (tuple): Le nombre de dés qui gardent leur valeur, pour chaque valeur de 2 à 6
+        nombre_aleatoires (int): Le nombre de dés qui prennent une valeur au hasard
+
+    Returns:
+        (float, float): L'espérance du nombre de dés rendus et la probabilité d'une correspondance
+    """
+    k = nombre_aleatoires
+    esperance = 0.0
+    for compte in comptes_fixes:
+        if compte == 0:
+            probabilite_un = k / 6 * (5 / 6) ** (k - 1) if k > 0 else 0.0
+        elif compte == 1:
+            probabilite_un = (5 / 6) ** k
+        else:
+            probabilite_un = 0.0
+        esperance += compte + k / 6 - probabilite_un
+
+    # Il n'y a pas de correspondance si chaque valeur libre reçoit au plus un dé aléatoire,
+    # et qu'aucun n'a la valeur d'un dé fixe (les X sont toujours permis).
+    if max(comptes_fixes) > 1:
+        probabilite_correspondance = 1.0
+    else:
+        libres = comptes_fixes.count(0)
+        sans_correspondance = sum(comb(k, j) * perm(libres, j) for j in range(min(k, libres) + 1))
+        probabilite_correspondance = 1 - sans_correspondance / 6 ** k
+    return esperance, probabilite_correspondance
+
+
+@lru_cache(maxsize=TAILLE_CACHE_RESULTATS)
+def trajectoires_relatives(angle, puissance, des_relatifs):
+    """
+    Calcule, relativement au départ d'un lancer, la probabilité de chaque paire (case d'arrêt,
+    dés accrochés), en suivant le dé pas à pas. Le résultat ne dépend que de la position des
+    dés atteignables, et pas de leurs valeurs ni des bords de l'arène: il est gardé en mémoire
+    et partagé par tous les départs où les dés sont placés de la même façon.
+
+    Args:
+        angle (str): Le point cardinal
+        puissance (int): La puissance
+        des_relatifs (tuple): Les déplacements, depuis le départ, des dés que le lancer peut
+            atteindre (le dé i correspond au bit i)
+
+    Returns:
+        tuple: Les triplets (déplacement d'arrêt, dés accrochés sous forme de masque de bits, probabilité)
+    """
+    indices = {deplacement: i for i, deplacement in enumerate(des_relatifs)}
+    directions = directions_possibles(angle)
+
+    etats = {((0, 0), 0): 1.0}
+    for _ in range(puissance):
+        suivants = {}
+        for ((x, y), accroches), probabilite in etats.items():
+            if (x, y) in indices:
+                accroches |= 1 << indices[(x, y)]
+            for (dx, dy), probabilite_pas in directions:
+                cle = ((x + dx, y + dy), accroches)
+                suivants[cle] = suivants.get(cle, 0.0) + probabilite * probabilite_pas
+        etats = suivants
+    return tuple((arrivee, accroches, probabilite) for (arrivee, accroches), probabilite in etats.items())
+
+
+@lru_cache(maxsize=TAILLE_CACHE_RESULTATS)
+def resultats_relatifs(angle, puissance, des_relatifs, arrivees_hors):
+    """
+    Regroupe les trajectoires d'un lancer (trajectoires_relatives) selon ce qu'elles changent
+    au rangement: les dés qui deviennent aléatoires, et si le dé lancé s'ajoute à l'arène.
+
+    Args:
+        angle (str): Le point cardinal
+        puissance (int): La puissance
+        des_relatifs (tuple): Les déplacements, depuis le départ, des dés que le lancer peut
+            atteindre (le dé i correspond au bit i)
+        arrivees_hors (tuple): Les déplacements d'arrêt qui sortent de l'arène
+
+    Returns:
+        tuple: Les triplets (dés devenus aléatoires, 1 si le dé lancé s'ajoute à l'arène
+            sur une case vide et 0 sinon, probabilité). Les dés devenus aléatoires sont
+            ceux accrochés et celui remplacé par le dé lancé, sous forme de masque de bits.
+    """
+    indices = {deplacement: i for i, deplacement in enumerate(des_relatifs)}
+    resultats = {}
+    for arrivee, accroches, probabilite in trajectoires_relatives(angle, puissance, des_relatifs):
+        if arrivee in arrivees_hors:
+            cle = (accroches, 0)
+        elif arrivee in indices:
+            # Le dé déjà présent à l'arrivée est remplacé par le dé lancé.
+            cle = (accroches | 1 << indices[arrivee], 0)
+        else:
+            cle = (accroches, 1)
+        resultats[cle] = resultats.get(cle, 0.0) + probabilite
+    return tuple((masque, ajoute, probabilite) for (masque, ajoute), probabilite in resultats.items())
+
+
+class JoueurOrdinateurEsperance(JoueurOrdinateur):
+    """ Joueur ordinateur qui joue le lancer dont l'espérance de dés rendus est la plus grande.
+
+    Attributes:
+        budget (float): Le temps maximal d'une décision, en secondes.
+        seuil_continuer (float): L'espérance de dés rendus à partir de laquelle le joueur continue son tour.
+        decisions (TableTransposition): Les meilleures décisions déjà calculées, par empreinte de l'arène.
+        decision_partielle (tuple): La dernière décision écourtée par le temps alloué, avec l'empreinte
+            de l'arène (elle n'est pas gardée dans decisions).
+    """
+
+    def __init__(self, numero_joueur, des_initiaux, arene, budget_ms=40, seuil_continuer=1.0):
+        """
+        Constructeur de la classe JoueurOrdinateurEsperance.
+
+        Args:
+            numero_joueur (int): Le numéro identifiant le joueur
+            des_initiaux (list): Les dés en possession du joueur en début de partie
+            arene (Arene): l'arène du jeu
+            budget_ms (int): Le temps maximal d'une décision, en millisecondes (un premier lancer
+                est toujours évalué, même si ce temps est écoulé)
+            seuil_continuer (float): L'espérance de dés rendus à partir de laquelle le joueur
+                continue son tour. Défaut: 1, soit au moins le dé qu'il s'apprête à lancer.
+        """
+        super().__init__(numero_joueur, des_initiaux, arene)
+        self.budget = budget_ms / 1000
+        self.seuil_continuer = seuil_continuer
+        self.decisions = TableTransposition(TAILLE_CACHE_DECISIONS, 'toujours')
+        self.decision_partielle = None
+
+    def decision_continuer(self):
+        """
+        Continue le tour si le meilleur lancer permet d'espérer au moins seuil_continuer dés rendus.
+
+        Returns:
+            bool: True si le joueur continue son tour
+        """
+        _, esperance, _ = self.meilleur_lancer()
+        return esperance >= self.seuil_continuer
+
+    def choisir_lancer(self, suite):
+        """
+        Crée le meilleur lancer (JoueurOrdinateurEsperance.meilleur_lancer) et déclenche la suite.
+
+        Args:
+            suite (fonction): La fonction à exécuter pour la suite du programme.
+                Prend en argument le lancer créé et le joueur.
+        """
+        (coordonnees, angle, puissance), _, _ = self.meilleur_lancer()
+        lancer = self.creer_lancer(coordonnees, angle, puissance)
+        suite(lancer, self)
+
+    def puissance_maximale(self):
+        """
+        Donne la plus grande puissance permise, la même que pour JoueurOrdinateur.choisir_puissance.
+
+        Returns:
+            int: La puissance maximale
+        """
+        return max(1, self.arene.dimension // 4)
+
+    def meilleur_lancer(self):
+        """
+        Trouve le lancer dont l'espérance de dés rendus est la plus grande, pour l'état
+        actuel de l'arène (en réutilisant la décision déjà calculée s'il y a lieu).
+
+        Returns:
+            ((tuple, str, int), float, float): Le lancer (coordonnées, angle, puissance),
+                son espérance de dés rendus et sa probabilité de correspondance
+        """
+        decision = self.decisions.consulter(self.arene.empreinte)
+        if decision is None and self.decision_partielle is not None and self.decision_partielle[0] == self.arene.empreinte:
+            decision = self.decision_partielle[1]
+        if decision is None:
+            plateau = {emplacement: de.valeur for emplacement, de in self.arene.des.items()}
+            decision, complete = self.calculer_meilleur_lancer(plateau)
+            if complete:
+                self.decisions.enregistrer(self.arene.empreinte, 0, decision)
+            else:
+                # Une décision écourtée n'est pas gardée dans la table: elle ne sert qu'à l'état
+                # actuel de l'arène (decision_continuer, puis choisir_lancer).
+                self.decision_partielle = (self.arene.empreinte, decision)
+        return decision
+
+    def calculer_meilleur_lancer(self, plateau):
+        """
+        Retourne le meilleur des lancers évalués dans le temps alloué (JoueurOrdinateurEsperance.evaluer_lancers).
+
+        Args:
+            plateau (dict): Les valeurs des dés de l'arène, par emplacement
+
+        Returns:
+            (((tuple, str, int), float, float), bool): Le meilleur lancer, son espérance et sa
+                probabilité de correspondance, puis True si tous les lancers ont été évalués
+        """
+        meilleur = None
+        candidats = self.evaluer_lancers(plateau)
+        while True:
+            try:
+                candidat = next(candidats)
+            except StopIteration as arret:
+                return meilleur, arret.value
+            meilleur = self.comparer(meilleur, candidat)
+
+    def evaluer_lancers(self, plateau, budget=None):
+        """
+        Évalue tous les lancers permis, une paire angle et puissance à la fois (les moins
+        puissantes d'abord), jusqu'à ce que le temps alloué soit écoulé. Le temps n'est vérifié
+        qu'une fois un premier lancer donné: même avec un budget nul, il y a toujours un lancer à jouer.
+
+        Pour chaque paire, on regroupe d'abord les dés par départ (chaque dé est translaté par
+        chaque case que la paire peut atteindre): un départ sans dé ne peut rien accrocher et
+        seul le meilleur d'entre eux est donné (JoueurOrdinateurEsperance.meilleur_depart_libre).
+        Les autres départs sont évalués par resultats_relatifs, qui ne dépend que de la position
+        des dés relativement au départ (et des cases d'arrêt hors de l'arène): son résultat est
+        partagé par tous les départs, et toutes les décisions, où les dés sont placés de la même façon.
+
+        Args:
+            plateau (dict): Les valeurs des dés de l'arène, par emplacement
+            budget (float, optional): Le temps alloué, en secondes. Défaut: JoueurOrdinateurEsperance.budget
+
+        Returns:
+            generator: Les lancers évalués, sous la forme ((coordonnées, angle, puissance), espérance,
+                probabilité de correspondance). Le générateur retourne True si tous les lancers
+                ont été évalués, False si le temps alloué a manqué.
+        """
+        fin = time.perf_counter() + (self.budget if budget is None else budget)
+        dimension = self.arene.dimension
+        comptes_plateau = self.compter_fixes(plateau.values())
+        esperance_libre, correspondance_libre = evaluer_resultat(comptes_plateau, 1)
+        # L'évaluation d'un placement de dés (géométrie et valeurs), pour cette décision.
+        evaluations = {}
+        # Aucun lancer n'a encore été donné: le temps alloué n'est pas encore vérifié.
+        evalue = False
+
+        for puissance in range(1, self.puissance_maximale() + 1):
+            for angle in ANGLES:
+                arrivee_relative, passage_relatif = distributions_relatives(angle, puissance)
+                portee = {deplacement for deplacement, _ in arrivee_relative + passage_relatif}
+                arrivees = [deplacement for deplacement, _ in arrivee_relative]
+                min_x, max_x = min(dx for dx, _ in arrivees), max(dx for dx, _ in arrivees)
+                min_y, max_y = min(dy for _, dy in arrivees), max(dy for _, dy in arrivees)
+
+                # Les dés que chaque départ peut atteindre, relativement au départ.
+                des_par_depart = {}
+                for (x, y), valeur in plateau.items():
+                    if evalue and time.perf_counter() > fin:
+                        return False
+                    for dx, dy in portee:
+                        depart = (x - dx, y - dy)
+                        if 0 <= depart[0] < dimension and 0 <= depart[1] < dimension:
+                            des_par_depart.setdefault(depart, []).append(((dx, dy), valeur))
+
+                for depart, des in des_par_depart.items():
+                    if evalue and time.perf_counter() > fin:
+                        return False
+                    des.sort()
+                    x, y = depart
+                    if 0 <= x + min_x and x + max_x < dimension and 0 <= y + min_y and y + max_y < dimension:
+                        arrivees_hors = ()
+                    else:
+                        arrivees_hors = tuple(sorted((dx, dy) for dx, dy in arrivees
+                                                     if not (0 <= x + dx < dimension and 0 <= y + dy < dimension)))
+                    cle = (angle, puissance, tuple(deplacement for deplacement, _ in des), arrivees_hors,
+                           tuple(valeur for _, valeur in des))
+                    evaluation = evaluations.get(cle)
+                    if evaluation is None:
+                        evaluation = self.evaluer_resultats(resultats_relatifs(*cle[:4]), cle[4], comptes_plateau)
+                        evaluations[cle] = evaluation
+                    evalue = True
+                    yield ((depart, angle, puissance), *evaluation)
+
+                depart, probabilite_arene = self.meilleur_depart_libre(arrivee_relative, des_par_depart,
+                                                                       fin if evalue else None)
+                if depart is None and evalue and time.perf_counter() > fin:
+                    return False
+                if depart is not None:
+                    evalue = True
+                    yield ((depart, angle, puissance), probabilite_arene * esperance_libre,
+                           probabilite_arene * correspondance_libre)
+        return True
+
+    def meilleur_depart_libre(self, arrivee_relative, departs_exclus, fin=None):
+        """
+        Parmi les départs qui ne peuvent atteindre aucun dé, trouve celui où le dé a le plus
+        de chances de s'arrêter dans l'arène. On cherche d'abord dans la zone où toutes les
+        cases d'arrêt possibles sont dans l'arène (probabilité 1), qui ne peut être battue.
+
+        Args:
+            arrivee_relative (tuple): Les paires (déplacement, probabilité) de l'arrêt du dé
+            departs_exclus (set ou dict): Les départs qui peuvent atteindre un dé
+            fin (float, optional): Le moment (time.perf_counter) où abandonner la recherche. Défaut: None
+
+        Returns:
+            ((int, int), float): Le meilleur départ (None s'il n'y en a aucun, ou si la recherche
+                a été abandonnée) et sa probabilité
+        """
+        dimension = self.arene.dimension
+        deplacements_x = [dx for (dx, _), _ in arrivee_relative]
+        deplacements_y = [dy for (_, dy), _ in arrivee_relative]
+        for x in range(max(0, -min(deplacements_x)), min(dimension, dimension - max(deplacements_x))):
+            for y in range(max(0, -min(deplacements_y)), min(dimension, dimension - max(deplacements_y))):
+                if (x, y) not in departs_exclus:
+                    return (x, y), 1.0
+
+        meilleur_depart, meilleure_probabilite = None, -1.0
+        for x in range(dimension):
+            if fin is not None and time.perf_counter() > fin:
+                return None, 0.0
+            for y in range(dimension):
+                if (x, y) in departs_exclus:
+                    continue
+                probabilite = sum(probabilite for (dx, dy), probabilite in arrivee_relative
+                                  if 0 <= x + dx < dimension and 0 <= y + dy < dimension)
+                if probabilite > meilleure_probabilite:
+                    meilleur_depart, meilleure_probabilite = (x, y), probabilite
+        return meilleur_depart, meilleure_probabilite
+
+    def evaluer_resultats(self, resultats, valeurs, comptes_plateau):
+        """
+        Évalue le rangement qui suit un lancer, à partir des résultats possibles de ce lancer
+        (resultats_relatifs) et des valeurs des dés qu'il peut atteindre.
+
+        Args:
+            resultats (tuple): Les triplets (dés devenus aléatoires, dé lancé ajouté, probabilité)
+            valeurs (tuple): Les valeurs des dés que le lancer peut atteindre, dans l'ordre de leurs bits
+            comptes_plateau (tuple): Le nombre de dés de chaque valeur de 2 à 6 dans toute l'arène
+
+        Returns:
+            (float, float): L'espérance de dés rendus et la probabilité de correspondance
+        """
+        esperance, correspondance = 0.0, 0.0
+        for masque, ajoute, probabilite in resultats:
+            fixes = list(comptes_plateau)
+            nombre_aleatoires = ajoute
+            for i, valeur in enumerate(valeurs):
+                if masque >> i & 1:
+                    nombre_aleatoires += 1
+                    if valeur != 1:
+                        fixes[valeur - 2] -= 1
+            esperance_resultat, correspondance_resultat = evaluer_resultat(tuple(fixes), nombre_aleatoires)
+            esperance += probabilite * esperance_resultat
+            correspondance += probabilite * correspondance_resultat
+        return esperance, correspondance
+
+    def evaluer_lancer(self, plateau, depart, angle, puissance):
+        """
+        Évalue exactement un seul lancer (JoueurOrdinateurEsperance.evaluer_lancers les évalue
+        plutôt tous ensemble).
+
+        Args:
+            plateau (dict): Les valeurs des dés de l'arène, par emplacement
+            depart ((int, int)): Les coordonnées de départ
+            angle (str): Le point cardinal
+            puissance (int): La puissance
+
+        Returns:
+            (float, float): L'espérance de dés rendus et la probabilité de correspondance
+        """
+        arrivee_relative, passage_relatif = distributions_relatives(angle, puissance)
+        portee = {deplacement for deplacement, _ in arrivee_relative + passage_relatif}
+        x, y = depart
+        des = sorted(((ex - x, ey - y), valeur) for (ex, ey), valeur in plateau.items() if (ex - x, ey - y) in portee)
+        arrivees_hors = tuple(sorted(deplacement for deplacement, _ in arrivee_relative
+                                     if not self.arene.dans_arene((x + deplacement[0], y + deplacement[1]))))
+        resultats = resultats_relatifs(angle, puissance, tuple(deplacement for deplacement, _ in des), arrivees_hors)
+        return self.evaluer_resultats(resultats, tuple(valeur for _, valeur in des), self.compter_fixes(plateau.values()))
+
+    def compter_fixes(self, valeurs):
+        """
+        Compte les dés de chaque valeur de 2 à 6 (les X sont ignorés).
+
+        Args:
+            valeurs (iterable): Les valeurs des dés
+
+        Returns:
+            tuple: Le nombre de dés de chaque valeur de 2 à 6
+        """
+        comptes = [0] * 5
+        for valeur in valeurs:
+            if valeur != 1:
+                comptes[valeur - 2] += 1
+        return tuple(comptes)
+
+    def comparer(self, meilleur, candidat):
+        """
+        Garde le meilleur de deux lancers évalués: la plus grande espérance de dés rendus,
+        puis, à égalité, la plus grande probabilité de correspondance.
+
+        Args:
+            meilleur (tuple): Le meilleur lancer jusqu'ici (None s'il n'y en a pas)
+            candidat (tuple): Le lancer à comparer
+
+        Returns:
+            tuple: Le meilleur des deux
+        """
+        if meilleur is None or candidat[1:] > meilleur[1:]:
+            return candidat
+        return meilleur
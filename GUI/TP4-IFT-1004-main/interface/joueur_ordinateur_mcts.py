@@ -0,0 +1,493 @@
+"""
+La classe JoueurOrdinateurMCTS
+
+Hérite de JoueurOrdinateurEsperance, mais décide de ses lancers et du moment de terminer
+son tour par une recherche arborescente Monte-Carlo (MCTS) sur les vraies règles du jeu.
+
+Chaque noeud de l'arbre est un état où le joueur doit décider: s'arrêter, ou jouer l'un
+des meilleurs lancers selon l'espérance de dés rendus (JoueurOrdinateurEsperance.evaluer_lancers).
+Les états sont des instantanés de la partie (Gladeateur.instantane): immuables, ils servent
+de clés dans l'arbre et s'envoient tels quels aux autres processus. Le résultat d'un lancer
+est tiré au hasard en restaurant l'état dans une partie simulée (Gladeateur.restaurer, sur
+une AreneBitboard) puis en y effectuant le lancer, suivi du rangement (Arene.rangement). Lorsque le tour se termine, ou lorsqu'on atteint un état
+encore jamais visité, la partie est jouée jusqu'au bout entre joueurs ordinateurs
+(Gladeateur et GestionnaireIONul): la valeur est 1 si le joueur gagne, 0 sinon.
+
+Les parties simulées sont envoyées par paquets à un bassin de processus, partagé par
+tous les joueurs MCTS. Pendant qu'un paquet est simulé, les visites déjà comptées
+(sans leur valeur) découragent la recherche de redescendre toujours au même endroit.
+
+L'arbre est conservé d'un lancer à l'autre pendant un même tour: après un lancer, le
+noeud correspondant à l'état obtenu, s'il a déjà été visité, devient la nouvelle racine.
+"""
+
+import atexit
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from heapq import nlargest
+from math import log, sqrt
+
+from interface.joueur_ordinateur import JoueurOrdinateur
+from interface.joueur_ordinateur_esperance import JoueurOrdinateurEsperance
+from jeu.arene import iterer_bits
+from jeu.arene_bitboard import AreneBitboard
+from jeu.de import De
+from jeu.gestionnaire_io_nul import GestionnaireIONul
+from jeu.gladeateur import Gladeateur
+from jeu.hasard import GenerateurAleatoire
+from jeu.joueur import Joueur
+from jeu.lancer import ANGLES
+from jeu.table_transposition import TableTransposition
+
+# L'action de terminer son tour, en plus des lancers.
+ARRET = 'arret'
+
+# Le nombre de parties simulées envoyées à la fois à chaque processus.
+SIMULATIONS_PAR_PAQUET = 16
+
+# Le nombre de cases de la table des lancers candidats déjà choisis.
+TAILLE_TABLE_CANDIDATS = 1 << 14
+
+# Les bassins de processus, partagés par tous les joueurs, par nombre de processus.
+_bassins = {}
+
+
+def obtenir_bassin(processus):
+    """
+    Donne le bassin de processus de la taille demandée, en le créant au besoin.
+    Il est fermé à la sortie du programme.
+
+    Les processus sont démarrés par « spawn » plutôt que par fork: un processus copié par
+    fork hériterait de l'état de Tk et de la connexion X, ainsi que des verrous tenus par
+    les autres fils d'exécution (par exemple celui de MoniteurBoucle), et pourrait bloquer.
+
+    Args:
+        processus (int): Le nombre de processus
+
+    Returns:
+        ProcessPoolExecutor: Le bassin
+    """
+    if processus not in _bassins:
+        bassin = ProcessPoolExecutor(max_workers=processus, mp_context=multiprocessing.get_context('spawn'))
+        atexit.register(bassin.shutdown, wait=False, cancel_futures=True)
+        _bassins[processus] = bassin
+    return _bassins[processus]
+
+
+def creer_partie_simulee(dimension, nombre_joueurs, generateur, classe_joueur):
+    """
+    Crée une partie sans interface (GestionnaireIONul), avec une AreneBitboard et des
+    joueurs sans dés, dans laquelle on restaure (Gladeateur.restaurer) les états à simuler.
+
+    Args:
+        dimension (int): La dimension de l'arène
+        nombre_joueurs (int): Le nombre de joueurs
+        generateur (random.Random): Le générateur aléatoire de la partie
+        classe_joueur (type): La classe des joueurs
+
+    Returns:
+        Gladeateur: La partie
+    """
+    arene = AreneBitboard(dimension, De(), 1, generateur)
+    joueurs = [classe_joueur(i + 1, [], arene) for i in range(nombre_joueurs)]
+    return Gladeateur(joueurs, arene, GestionnaireIONul())
+
+
+def terminer_tour(partie):
+    """
+    Passe au joueur suivant, comme Gladeateur.fin_du_tour_b, mais sans poursuivre la boucle
+    de jeu. Rien ne change si la partie est terminée.
+
+    Args:
+        partie (Gladeateur): La partie
+    """
+    if partie.calculer_victoire() is None:
+        partie.premier_lancer = True
+        partie.changer_joueur()
+
+
+def simuler_partie(dimension, instantane, moi, graine, limite_lancers):
+    """
+    Joue la fin d'une partie entre joueurs ordinateurs, à partir d'un état.
+
+    Args:
+        dimension (int): La dimension de l'arène
+        instantane (InstantanePartie): L'état de départ (Gladeateur.instantane)
+        moi (int): L'index du joueur pour qui la partie est évaluée
+        graine (int): La graine de la partie simulée
+        limite_lancers (int): Le nombre de lancers après lequel la partie est interrompue
+
+    Returns:
+        float: 1 si le joueur gagne, 0 s'il perd, et sa part des dés si la partie est interrompue
+    """
+    partie = creer_partie_simulee(dimension, len(instantane.des_joueurs), random.Random(graine), JoueurOrdinateur)
+    partie.restaurer(instantane)
+    gestionnaire_io = partie.gestionnaire_io
+    gestionnaire_io.limite_lancers = limite_lancers
+
+    vainqueur = gestionnaire_io.executer(partie)
+    joueurs = partie.liste_joueurs
+    if vainqueur is not None:
+        return float(vainqueur is joueurs[moi])
+    total = sum(len(joueur.des) for joueur in joueurs)
+    return len(joueurs[moi].des) / total if total > 0 else 0.0
+
+
+def simuler_paquet(paquet):
+    """
+    Joue un paquet de parties simulées (simuler_partie). Exécutée dans un processus du bassin.
+
+    Args:
+        paquet (tuple): La dimension, l'index du joueur évalué, la limite de lancers,
+            puis la liste des (état, graine) à simuler
+
+    Returns:
+        list: Les valeurs des parties, dans l'ordre
+    """
+    dimension, moi, limite_lancers, simulations = paquet
+    return [simuler_partie(dimension, instantane, moi, graine, limite_lancers)
+            for instantane, graine in simulations]
+
+
+class Noeud:
+    """ Un état de la recherche où le joueur doit décider de s'arrêter ou de lancer.
+
+    Attributes:
+        etat (InstantanePartie): L'état de la partie (Gladeateur.instantane).
+        empreinte (int): L'empreinte de Zobrist de cet état (Gladeateur.empreinte).
+        actions (list): Les actions possibles: ARRET, puis des lancers (coordonnées, angle, puissance).
+        visites (list): Le nombre de visites de chaque action.
+        valeurs (list): La somme des valeurs obtenues par chaque action.
+        enfants (list): Pour chaque action, les états déjà obtenus, sous la forme <état, Noeud>
+            (None pour un état visité une seule fois).
+        total (int): Le nombre total de visites du noeud.
+    """
+
+    def __init__(self, etat, empreinte, actions):
+        """
+        Constructeur de la classe Noeud.
+
+        Args:
+            etat (InstantanePartie): L'état du noeud
+            empreinte (int): L'empreinte de l'état (Gladeateur.empreinte)
+            actions (list): Les actions possibles
+        """
+        self.etat = etat
+        self.empreinte = empreinte
+        self.actions = actions
+        self.visites = [0] * len(actions)
+        self.valeurs = [0.0] * len(actions)
+        self.enfants = [{} for _ in actions]
+        self.total = 0
+
+    def selectionner(self, exploration):
+        """
+        Choisit l'action à explorer selon UCB1. Les actions jamais visitées sont essayées
+        d'abord, dans l'ordre de la liste.
+
+        Args:
+            exploration (float): La constante d'exploration
+
+        Returns:
+            int: L'index de l'action choisie
+        """
+        meilleure, meilleur_score = 0, -1.0
+        log_total = log(max(1, self.total))
+        for i, visites in enumerate(self.visites):
+            if visites == 0:
+                return i
+            score = self.valeurs[i] / visites + exploration * sqrt(log_total / visites)
+            if score > meilleur_score:
+                meilleure, meilleur_score = i, score
+        return meilleure
+
+    def plus_visitee(self, permettre_arret=True):
+        """
+        Donne l'action la plus visitée, le choix le plus robuste à la fin de la recherche.
+        Si le noeud n'a encore aucune visite, c'est la première action permise: les lancers
+        sont déjà classés selon leur espérance de dés rendus.
+
+        Args:
+            permettre_arret (bool): Si False, ARRET est ignorée
+
+        Returns:
+            int: L'index de l'action la plus visitée (None si aucune action n'est permise)
+        """
+        indices = [i for i, action in enumerate(self.actions) if permettre_arret or action != ARRET]
+        if len(indices) == 0:
+            return None
+        return max(indices, key=lambda i: self.visites[i])
+
+
+class JoueurOrdinateurMCTS(JoueurOrdinateurEsperance):
+    """ Joueur ordinateur qui décide par une recherche arborescente Monte-Carlo.
+
+    Attributes:
+        budget_recherche (float): Le temps maximal d'une décision, en secondes.
+        processus (int): Le nombre de processus qui simulent les parties (0 pour les simuler ici).
+        nombre_lancers (int): Le nombre de lancers considérés à la racine.
+        exploration (float): La constante d'exploration de UCB1.
+        limite_lancers (int): Le nombre de lancers après lequel une partie simulée est interrompue.
+        generateur_recherche (random.Random): Le générateur de la recherche, distinct de celui de
+            la partie pour que la recherche ne change pas les tirages de la partie.
+        racine (Noeud): La racine de l'arbre courant (None avant la première décision).
+        simulation (Gladeateur): La partie dans laquelle les lancers sont simulés (None avant la première recherche).
+        dernier_choix (int): L'index de la dernière action choisie à la racine.
+        candidats (TableTransposition): Les lancers candidats déjà choisis (après une évaluation
+            complète), par empreinte du plateau.
+            La profondeur d'une entrée est le nombre de lancers demandés: une liste choisie
+            pour un noeud intérieur ne sert pas à la racine, qui en demande plus.
+    """
+
+    def __init__(self, numero_joueur, des_initiaux, arene, budget_ms=150, processus=None,
+                 nombre_lancers=6, exploration=0.7, limite_lancers=200):
+        """
+        Constructeur de la classe JoueurOrdinateurMCTS.
+
+        Args:
+            numero_joueur (int): Le numéro identifiant le joueur
+            des_initiaux (list): Les dés en possession du joueur en début de partie
+            arene (Arene): l'arène du jeu
+            budget_ms (int): Le temps maximal d'une décision, en millisecondes.
+                Le quart sert à choisir les lancers candidats de la racine.
+            processus (int, optional): Le nombre de processus qui simulent les parties.
+                Défaut: un de moins que le nombre de processeurs, au plus 4 (0 pour tout simuler ici).
+            nombre_lancers (int): Le nombre de lancers considérés à la racine
+            exploration (float): La constante d'exploration de UCB1
+            limite_lancers (int): Le nombre de lancers après lequel une partie simulée est interrompue
+        """
+        super().__init__(numero_joueur, des_initiaux, arene, budget_ms=budget_ms / 4)
+        self.budget_recherche = budget_ms / 1000
+        if processus is None:
+            processus = min(4, (os.cpu_count() or 1) - 1)
+        self.processus = processus
+        self.nombre_lancers = nombre_lancers
+        self.exploration = exploration
+        self.limite_lancers = limite_lancers
+        if isinstance(arene.generateur, GenerateurAleatoire):
+            self.generateur_recherche = arene.generateur.sous_flux('mcts', numero_joueur)
+        else:
+            self.generateur_recherche = random.Random()
+        self.racine = None
+        self.dernier_choix = None
+        self.simulation = None
+        self.candidats = TableTransposition(TAILLE_TABLE_CANDIDATS, 'profondeur')
+
+    def decision_continuer(self):
+        """
+        Cherche la meilleure action, et continue le tour si ce n'est pas ARRET. Un joueur
+        qui vient de lancer son dernier dé (à plus de deux joueurs, la partie continue) n'a
+        plus aucun lancer à chercher: son tour se termine. Si le temps alloué n'a permis
+        aucune simulation, la décision est celle de JoueurOrdinateurEsperance.
+
+        Returns:
+            bool: True si le joueur continue son tour
+        """
+        if self.partie is None:
+            return super().decision_continuer()
+        if self.est_elimine():
+            return False
+        racine = self.rechercher(permettre_arret=True)
+        if racine.total == 0:
+            return super().decision_continuer()
+        return racine.actions[racine.plus_visitee()] != ARRET
+
+    def choisir_lancer(self, suite):
+        """
+        Crée le lancer le plus visité par la recherche et déclenche la suite. Si la recherche
+        vient d'être faite pour cet état (JoueurOrdinateurMCTS.decision_continuer),
+        elle est réutilisée telle quelle.
+
+        Args:
+            suite (fonction): La fonction à exécuter pour la suite du programme.
+                Prend en argument le lancer créé et le joueur.
+        """
+        if self.partie is None:
+            super().choisir_lancer(suite)
+            return
+        racine = self.racine
+        if racine is None or racine.empreinte != self.partie.empreinte() or racine.total == 0:
+            racine = self.rechercher(permettre_arret=False)
+        self.dernier_choix = racine.plus_visitee(permettre_arret=False)
+        lancer = self.creer_lancer(*racine.actions[self.dernier_choix])
+        suite(lancer, self)
+
+    def rechercher(self, permettre_arret):
+        """
+        Fait la recherche à partir de l'état actuel, dans le temps alloué. Si cet état a
+        déjà été atteint dans l'arbre du lancer précédent, son noeud est réutilisé.
+
+        Args:
+            permettre_arret (bool): Si False, le joueur doit lancer (ARRET n'est pas considérée)
+
+        Returns:
+            Noeud: La racine de l'arbre, après la recherche
+        """
+        fin = time.perf_counter() + self.budget_recherche
+        etat = self.partie.instantane()
+        if self.simulation is None:
+            self.simulation = creer_partie_simulee(self.arene.dimension, len(self.partie.liste_joueurs),
+                                                   self.generateur_recherche, Joueur)
+        racine = None
+        if self.racine is not None and self.dernier_choix is not None:
+            racine = self.racine.enfants[self.dernier_choix].get(etat)
+        if racine is None or (not permettre_arret and ARRET in racine.actions):
+            racine = self.creer_noeud(self.partie, etat, permettre_arret, self.nombre_lancers, self.budget)
+        self.racine, self.dernier_choix = racine, None
+
+        moi = self.partie.liste_joueurs.index(self)
+        taille_lot = SIMULATIONS_PAR_PAQUET * self.processus if self.processus > 0 else 1
+        while time.perf_counter() < fin:
+            chemins, simulations = [], []
+            for _ in range(taille_lot):
+                chemin, etat_feuille = self.descendre(racine)
+                chemins.append(chemin)
+                simulations.append((etat_feuille, self.generateur_recherche.getrandbits(64)))
+            for chemin, valeur in zip(chemins, self.simuler(moi, simulations)):
+                for noeud, i in chemin:
+                    noeud.valeurs[i] += valeur
+        return racine
+
+    def creer_noeud(self, partie, etat, permettre_arret, nombre_lancers, budget):
+        """
+        Crée le noeud d'un état, dont les lancers sont les meilleurs selon l'espérance de dés rendus
+        (un lancer au hasard, comme JoueurOrdinateur, si aucun n'a pu être évalué).
+        Les mêmes plateaux reviennent souvent (par exemple après une table rase): les lancers
+        choisis pour un plateau dont tous les lancers ont pu être évalués sont donc réutilisés
+        (JoueurOrdinateurMCTS.candidats).
+        Les empreintes sont celles que la partie tient déjà à jour (Arene.empreinte et
+        Gladeateur.empreinte): le plateau n'est parcouru que si ses lancers sont à choisir.
+
+        Args:
+            partie (Gladeateur): Une partie dans l'état du noeud (la vraie partie ou la partie simulée)
+            etat (InstantanePartie): L'état du noeud
+            permettre_arret (bool): Si True, ARRET fait partie des actions
+            nombre_lancers (int): Le nombre de lancers à considérer
+            budget (float): Le temps alloué au choix des lancers, en secondes
+
+        Returns:
+            Noeud: Le nouveau noeud
+        """
+        empreinte_arene = partie.arene.empreinte
+        lancers = self.candidats.consulter(empreinte_arene, nombre_lancers)
+        if lancers is None:
+            plateau = {}
+            for valeur, plan in enumerate(etat.plateau, start=1):
+                for indice in iterer_bits(plan):
+                    plateau[self.arene.case_indice(indice)] = valeur
+            evalues = []
+            candidats = self.evaluer_lancers(plateau, budget)
+            while True:
+                try:
+                    evalues.append(next(candidats))
+                except StopIteration as arret:
+                    complete = arret.value
+                    break
+            meilleurs = nlargest(nombre_lancers, evalues, key=lambda candidat: candidat[1:])
+            lancers = [lancer for lancer, _, _ in meilleurs]
+            # Une liste écourtée par le temps alloué (surtout des lancers peu puissants) ne sert
+            # qu'à ce noeud: elle n'est pas gardée pour les prochaines visites du plateau.
+            if complete:
+                self.candidats.enregistrer(empreinte_arene, nombre_lancers, lancers)
+        actions = lancers[:nombre_lancers]
+        if len(actions) == 0:
+            actions.append(self.lancer_au_hasard())
+        if permettre_arret:
+            actions.insert(0, ARRET)
+        return Noeud(etat, partie.empreinte(), actions)
+
+    def lancer_au_hasard(self):
+        """
+        Choisit un lancer permis au hasard, comme JoueurOrdinateur, mais avec le générateur
+        de la recherche pour ne pas changer les tirages de la partie.
+
+        Returns:
+            tuple: Le lancer (coordonnées, angle, puissance)
+        """
+        generateur = self.generateur_recherche
+        coordonnees = (generateur.randint(0, self.arene.dimension - 1), generateur.randint(0, self.arene.dimension - 1))
+        return coordonnees, generateur.choice(list(ANGLES.keys())), generateur.randint(1, self.puissance_maximale())
+
+    def descendre(self, racine):
+        """
+        Descend dans l'arbre jusqu'à un état à simuler: la fin du tour, ou un état visité
+        pour la première fois. Les visites sont comptées à la descente, et les valeurs
+        ajoutées une fois les parties simulées.
+
+        Args:
+            racine (Noeud): La racine de l'arbre
+
+        Returns:
+            (list, InstantanePartie): Les paires (noeud, action) parcourues et l'état à simuler
+        """
+        chemin = []
+        noeud = racine
+        while True:
+            i = noeud.selectionner(self.exploration)
+            noeud.visites[i] += 1
+            noeud.total += 1
+            chemin.append((noeud, i))
+            if noeud.actions[i] == ARRET:
+                self.simulation.restaurer(noeud.etat)
+                terminer_tour(self.simulation)
+                return chemin, self.simulation.instantane()
+
+            etat, fin_tour = self.simuler_lancer(noeud.etat, noeud.actions[i])
+            if fin_tour:
+                return chemin, etat
+            enfants = noeud.enfants[i]
+            if etat not in enfants:
+                enfants[etat] = None
+                return chemin, etat
+            if enfants[etat] is None:
+                # La partie simulée est encore dans l'état que simuler_lancer vient d'obtenir.
+                enfants[etat] = self.creer_noeud(self.simulation, etat, True, max(1, self.nombre_lancers // 2), 0.002)
+            noeud = enfants[etat]
+
+    def simuler_lancer(self, etat, action):
+        """
+        Effectue un lancer dans la partie simulée, restaurée à l'état donné, suivi du rangement.
+        Si le tour se termine, l'état obtenu est celui du début du tour suivant.
+
+        Args:
+            etat (InstantanePartie): L'état de départ
+            action (tuple): Le lancer (coordonnées, angle, puissance)
+
+        Returns:
+            (InstantanePartie, bool): L'état obtenu, et True si le tour s'est terminé
+        """
+        partie = self.simulation
+        partie.restaurer(etat)
+        partie.premier_lancer = False
+        joueur = partie.joueur_en_cours()
+        partie.arene.effectuer_lancer(joueur.creer_lancer(*action))
+        correspondance = partie.arene.rangement(joueur)
+        fin_tour = correspondance or partie.arene.est_vide() or joueur.est_elimine()
+        if fin_tour:
+            terminer_tour(partie)
+        return partie.instantane(), fin_tour
+
+    def simuler(self, moi, simulations):
+        """
+        Joue les parties simulées, réparties en paquets sur le bassin de processus
+        (ou ici même, s'il n'y a aucun processus).
+
+        Args:
+            moi (int): L'index du joueur pour qui les parties sont évaluées
+            simulations (list): Les (état, graine) à simuler
+
+        Returns:
+            list: Les valeurs des parties, dans l'ordre
+        """
+        dimension = self.arene.dimension
+        if self.processus == 0:
+            return simuler_paquet((dimension, moi, self.limite_lancers, simulations))
+        paquets = [(dimension, moi, self.limite_lancers, simulations[debut:debut + SIMULATIONS_PAR_PAQUET])
+                   for debut in range(0, len(simulations), SIMULATIONS_PAR_PAQUET)]
+        valeurs = []
+        for valeurs_paquet in obtenir_bassin(self.processus).map(simuler_paquet, paquets):
+            valeurs.extend(valeurs_paquet)
+        return valeurs
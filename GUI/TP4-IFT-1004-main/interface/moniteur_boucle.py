@@ -0,0 +1,248 @@
+"""
+Module contenant la classe MoniteurBoucle, qui surveille la boucle d'événements de Tk.
+
+Tout s'exécute dans le fil principal de Tk: les décisions des joueurs ordinateurs, les
+dessins du canvas et les suites planifiées avec after. Quand l'un d'eux est long, la
+fenêtre gèle. Le moniteur planifie un battement (after) à intervalle régulier et mesure
+son retard (la dérive) par rapport au moment demandé. Pendant qu'un battement est en
+retard, un fil de surveillance échantillonne la pile du fil principal: un blocage qui
+dépasse le seuil est attribué au rappel (callback) de Tk qui s'exécutait, ainsi qu'à la
+fonction du jeu la plus souvent au sommet de la pile (par exemple CanvasArene.dessiner_canvas
+ou JoueurOrdinateur.choisir_lancer).
+
+Les derniers blocages et les pires sont conservés pour la fenêtre de débogage
+(interface.fenetre_moniteur).
+"""
+
+import os
+import sys
+import threading
+from collections import Counter, deque, namedtuple
+from time import perf_counter, sleep
+
+# L'intervalle entre deux battements, en millisecondes.
+PERIODE_BATTEMENT = 50
+
+# Le retard au-delà duquel un battement révèle un blocage, en millisecondes.
+SEUIL_BLOCAGE = 100
+
+# L'intervalle entre deux échantillons de la pile du fil principal, en millisecondes.
+PERIODE_ECHANTILLON = 5
+
+# Le nombre de blocages conservés (les derniers, et les pires).
+TAILLE_HISTORIQUE = 20
+
+# Le dossier du jeu (jeu/ et interface/): seules ses fonctions servent à attribuer un blocage.
+FICHIER_MONITEUR = os.path.abspath(__file__)
+DOSSIER_JEU = os.path.dirname(os.path.dirname(FICHIER_MONITEUR))
+
+# Un blocage de la boucle d'événements:
+#   moment: le moment du battement en retard (time.perf_counter), en secondes
+#   duree: la durée du blocage (depuis le moment où le battement était dû), en millisecondes
+#   rappel: le rappel de Tk (la fonction du jeu la plus externe de la pile) le plus souvent
+#       échantillonné (None si aucun échantillon)
+#   fonction: la fonction du jeu la plus souvent au sommet de la pile (None si aucun échantillon)
+#   pile: la pile du jeu de l'échantillon le plus fréquent, de la plus externe à la plus interne
+#   echantillons: le nombre d'échantillons pris pendant le blocage
+Blocage = namedtuple('Blocage', ['moment', 'duree', 'rappel', 'fonction', 'pile', 'echantillons'])
+
+
+def nom_fonction(cadre):
+    """
+    Args:
+        cadre (frame): Un cadre de la pile
+
+    Returns:
+        str: Le nom qualifié de sa fonction (par exemple CanvasArene.dessiner_canvas)
+    """
+    code = cadre.f_code
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+def pile_du_jeu(cadre):
+    """
+    Donne les fonctions du jeu d'une pile, sans celles du moniteur ni le code au niveau d'un
+    module (par exemple l'appel à mainloop de principal_tp4.py).
+
+    Args:
+        cadre (frame): Le cadre le plus interne de la pile
+
+    Returns:
+        tuple: Les noms des fonctions, de la plus externe à la plus interne
+    """
+    noms = []
+    while cadre is not None:
+        fichier = cadre.f_code.co_filename
+        if fichier.startswith(DOSSIER_JEU) and fichier != FICHIER_MONITEUR and cadre.f_code.co_name != '<module>':
+            noms.append(nom_fonction(cadre))
+        cadre = cadre.f_back
+    return tuple(reversed(noms))
+
+
+class MoniteurBoucle:
+    """ Mesure la dérive d'un battement planifié avec after et attribue les blocages.
+
+    Attributes:
+        widget (Misc): Le widget Tk qui planifie les battements.
+        periode (int): L'intervalle entre deux battements, en millisecondes.
+        seuil (float): Le retard à partir duquel on parle de blocage, en millisecondes.
+        periode_echantillon (int): L'intervalle entre deux échantillons de la pile, en millisecondes.
+        identifiant_fil (int): L'identifiant du fil principal (celui de Tk).
+        prevu (float): Le moment où le prochain battement est dû (None si le moniteur est arrêté).
+        echantillons (Counter): Les piles échantillonnées depuis le dernier battement.
+        verrou (threading.Lock): Protège echantillons et prevu, partagés avec le fil de surveillance.
+        identifiant_minuteur: L'identifiant du prochain battement.
+        battements (int): Le nombre de battements reçus.
+        derive_totale (float): La somme des dérives, en millisecondes.
+        derive_maximale (float): La plus grande dérive, en millisecondes.
+        recents (deque): Les derniers blocages.
+        pires (list): Les pires blocages, du plus long au plus court.
+        taille (int): Le nombre de blocages conservés dans recents et pires.
+    """
+
+    def __init__(self, widget, periode=PERIODE_BATTEMENT, seuil=SEUIL_BLOCAGE,
+                 periode_echantillon=PERIODE_ECHANTILLON, taille=TAILLE_HISTORIQUE):
+        """
+        Constructeur de la classe MoniteurBoucle. Le moniteur ne démarre qu'avec MoniteurBoucle.demarrer.
+
+        Args:
+            widget (Misc): Le widget Tk qui planifie les battements
+            periode (int, optional): L'intervalle entre deux battements, en millisecondes. Défaut: 50
+            seuil (float, optional): Le retard d'un blocage, en millisecondes. Défaut: 100
+            periode_echantillon (int, optional): L'intervalle entre deux échantillons, en millisecondes. Défaut: 5
+            taille (int, optional): Le nombre de blocages conservés. Défaut: 20
+        """
+        self.widget = widget
+        self.periode = periode
+        self.seuil = seuil
+        self.periode_echantillon = periode_echantillon
+        self.identifiant_fil = threading.get_ident()
+        self.prevu = None
+        self.echantillons = Counter()
+        self.verrou = threading.Lock()
+        self.identifiant_minuteur = None
+        self.taille = taille
+        self.reinitialiser()
+
+    def reinitialiser(self):
+        """
+        Oublie les statistiques et les blocages mesurés.
+        """
+        self.battements = 0
+        self.derive_totale = 0.0
+        self.derive_maximale = 0.0
+        self.recents = deque(maxlen=self.taille)
+        self.pires = []
+
+    def demarrer(self):
+        """
+        Planifie le premier battement et démarre le fil de surveillance.
+        """
+        if self.prevu is not None:
+            return
+        self.planifier()
+        threading.Thread(target=self.surveiller, name="MoniteurBoucle", daemon=True).start()
+
+    def arreter(self):
+        """
+        Arrête les battements; le fil de surveillance s'arrête de lui-même.
+        """
+        if self.identifiant_minuteur is not None:
+            self.widget.after_cancel(self.identifiant_minuteur)
+            self.identifiant_minuteur = None
+        with self.verrou:
+            self.prevu = None
+
+    def planifier(self):
+        """
+        Planifie le prochain battement et retient le moment où il est dû.
+        """
+        with self.verrou:
+            self.prevu = perf_counter() + self.periode / 1000
+            self.echantillons = Counter()
+        self.identifiant_minuteur = self.widget.after(self.periode, self.battement)
+
+    def battement(self):
+        """
+        Mesure la dérive du battement, enregistre un blocage au besoin, puis planifie le suivant.
+        """
+        maintenant = perf_counter()
+        with self.verrou:
+            derive = (maintenant - self.prevu) * 1000
+            echantillons = self.echantillons
+        self.battements += 1
+        self.derive_totale += max(0.0, derive)
+        self.derive_maximale = max(self.derive_maximale, derive)
+        if derive >= self.seuil:
+            self.enregistrer(Blocage(maintenant, derive, *self.attribuer(echantillons)))
+        self.planifier()
+
+    def attribuer(self, echantillons):
+        """
+        Args:
+            echantillons (Counter): Les piles échantillonnées pendant le blocage
+
+        Returns:
+            tuple: Le rappel le plus souvent échantillonné, la fonction la plus souvent au sommet
+                de la pile pendant ce rappel, la pile la plus fréquente qui s'y termine, et le
+                nombre d'échantillons
+        """
+        if len(echantillons) == 0:
+            return None, None, (), 0
+        rappels = Counter()
+        for pile, nombre in echantillons.items():
+            rappels[pile[0]] += nombre
+        rappel = rappels.most_common(1)[0][0]
+        fonctions = Counter()
+        for pile, nombre in echantillons.items():
+            if pile[0] == rappel:
+                fonctions[pile[-1]] += nombre
+        fonction = fonctions.most_common(1)[0][0]
+        pile = max((pile for pile in echantillons if pile[0] == rappel and pile[-1] == fonction),
+                   key=echantillons.get)
+        return rappel, fonction, pile, sum(echantillons.values())
+
+    def enregistrer(self, blocage):
+        """
+        Ajoute un blocage aux derniers et, s'il est parmi les pires, aux pires.
+
+        Args:
+            blocage (Blocage): Le blocage
+        """
+        self.recents.append(blocage)
+        self.pires.append(blocage)
+        self.pires.sort(key=lambda b: b.duree, reverse=True)
+        del self.pires[self.taille:]
+
+    def derive_moyenne(self):
+        """
+        Returns:
+            float: La dérive moyenne des battements, en millisecondes
+        """
+        return self.derive_totale / self.battements if self.battements > 0 else 0.0
+
+    def surveiller(self):
+        """
+        Boucle du fil de surveillance: tant qu'un battement est en retard, échantillonne la
+        pile du fil principal toutes les periode_echantillon millisecondes. S'arrête avec le
+        moniteur (ou le fil principal).
+        """
+        while True:
+            with self.verrou:
+                prevu = self.prevu
+            if prevu is None:
+                return
+            # Tant que le battement n'est pas dû, il n'y a rien à échantillonner: on dort jusque-là.
+            attente = prevu - perf_counter()
+            sleep(max(self.periode_echantillon / 1000, attente))
+            if attente > 0:
+                continue
+            cadre = sys._current_frames().get(self.identifiant_fil)
+            if cadre is None:
+                return
+            pile = pile_du_jeu(cadre)
+            del cadre
+            if len(pile) > 0:
+                with self.verrou:
+                    if self.prevu == prevu:
+                        self.echantillons[pile] += 1
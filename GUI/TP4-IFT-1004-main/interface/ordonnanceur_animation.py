@@ -0,0 +1,169 @@
+"""
+Module contenant la classe OrdonnanceurAnimation, qui anime les trajectoires des lancers
+sur un CanvasArene avec un seul minuteur, ainsi que sa classe utilitaire AnimationLancers.
+
+Toutes les animations en cours avancent au même tic: les flèches dues depuis le dernier tic
+sont ajoutées ensemble, puis le canvas est mis à jour une seule fois. L'avancement dépend
+du temps écoulé plutôt que du nombre de tics: sous la charge, les images intermédiaires
+sont sautées, mais chaque animation se termine à l'heure prévue.
+"""
+
+from time import perf_counter
+
+# La durée visée d'une image, en millisecondes (environ 60 images par seconde).
+DUREE_IMAGE = 16
+
+
+class AnimationLancers:
+    """ Représente l'animation de plusieurs trajectoires à la fois: chacune est dessinée
+    flèche par flèche, à vitesse constante, sur la durée de l'animation.
+
+    Attributes:
+        trajectoires (list): Les trajectoires à dessiner (listes de coordonnées).
+        debut (float): Le moment du début de l'animation, en secondes (time.perf_counter).
+        duree (float): La durée de l'animation, en secondes.
+        suite (fonction): La fonction à exécuter à la fin de l'animation.
+        fleches_dessinees (list): Le nombre de flèches déjà dessinées pour chaque trajectoire.
+    """
+
+    def __init__(self, trajectoires, debut, duree, suite):
+        """
+        Constructeur de la classe AnimationLancers.
+
+        Args:
+            trajectoires (list): Les trajectoires à dessiner
+            debut (float): Le moment du début de l'animation, en secondes
+            duree (float): La durée de l'animation, en secondes
+            suite (fonction): La fonction à exécuter à la fin de l'animation
+        """
+        self.trajectoires = trajectoires
+        self.debut = debut
+        self.duree = duree
+        self.suite = suite
+        self.fleches_dessinees = [0] * len(trajectoires)
+
+    def progression(self, maintenant):
+        """
+        Args:
+            maintenant (float): Le moment présent, en secondes
+
+        Returns:
+            float: La fraction de l'animation écoulée, entre 0 et 1
+        """
+        if self.duree <= 0:
+            return 1.0
+        return min(1.0, (maintenant - self.debut) / self.duree)
+
+    def fleches_dues(self, maintenant):
+        """
+        Donne les flèches qui doivent être ajoutées au moment présent, et les compte
+        comme dessinées.
+
+        Args:
+            maintenant (float): Le moment présent, en secondes
+
+        Returns:
+            list: Les flèches, sous la forme (départ, arrivée)
+        """
+        progression = self.progression(maintenant)
+        fleches = []
+        for i, trajectoire in enumerate(self.trajectoires):
+            dues = int(progression * (len(trajectoire) - 1))
+            for j in range(self.fleches_dessinees[i], dues):
+                fleches.append((trajectoire[j], trajectoire[j + 1]))
+            self.fleches_dessinees[i] = max(dues, self.fleches_dessinees[i])
+        return fleches
+
+    def est_terminee(self, maintenant):
+        """
+        Args:
+            maintenant (float): Le moment présent, en secondes
+
+        Returns:
+            bool: True si la durée de l'animation est écoulée
+        """
+        return self.progression(maintenant) >= 1.0
+
+
+class OrdonnanceurAnimation:
+    """ Fait avancer toutes les animations d'un canvas avec un seul minuteur (after).
+
+    Attributes:
+        canvas (CanvasArene): Le canvas où les flèches sont dessinées.
+        duree_image (int): La durée visée d'une image, en millisecondes.
+        animations (list): Les animations en cours.
+        identifiant_minuteur: L'identifiant du prochain tic (None si aucun n'est prévu).
+        dernier_tic (float): Le moment du dernier tic, en secondes.
+        images (int): Le nombre d'images produites.
+        images_sautees (int): Le nombre d'images sautées parce qu'un tic est arrivé en retard.
+    """
+
+    def __init__(self, canvas, duree_image=DUREE_IMAGE):
+        """
+        Constructeur de la classe OrdonnanceurAnimation.
+
+        Args:
+            canvas (CanvasArene): Le canvas où les flèches sont dessinées
+            duree_image (int, optional): La durée visée d'une image, en millisecondes. Défaut: 16
+        """
+        self.canvas = canvas
+        self.duree_image = duree_image
+        self.animations = []
+        self.identifiant_minuteur = None
+        self.dernier_tic = None
+        self.images = 0
+        self.images_sautees = 0
+
+    def animer(self, trajectoires, duree, suite):
+        """
+        Ajoute une animation, qui commence au prochain tic, et démarre le minuteur au besoin.
+
+        Args:
+            trajectoires (list): Les trajectoires à dessiner
+            duree (int): La durée de l'animation, en millisecondes
+            suite (fonction): La fonction à exécuter à la fin de l'animation
+        """
+        self.animations.append(AnimationLancers(trajectoires, perf_counter(), duree / 1000, suite))
+        if self.identifiant_minuteur is None:
+            self.dernier_tic = None
+            self.identifiant_minuteur = self.canvas.after(0, self.tic)
+
+    def tic(self):
+        """
+        Produit une image: ajoute les flèches dues de toutes les animations, met le canvas à
+        jour une seule fois, replanifie le prochain tic en retranchant le temps de travail
+        de la durée d'une image, puis exécute la suite des animations terminées.
+        """
+        maintenant = perf_counter()
+        if self.dernier_tic is not None:
+            retard = (maintenant - self.dernier_tic) * 1000 - self.duree_image
+            if retard >= self.duree_image:
+                self.images_sautees += int(retard // self.duree_image)
+        self.dernier_tic = maintenant
+
+        terminees = []
+        for animation in self.animations:
+            for depart, arrivee in animation.fleches_dues(maintenant):
+                self.canvas.dessiner_fleche(depart, arrivee)
+            if animation.est_terminee(maintenant):
+                terminees.append(animation)
+        self.canvas.update_idletasks()
+        self.images += 1
+
+        self.animations = [animation for animation in self.animations if animation not in terminees]
+        if len(self.animations) > 0:
+            travail = (perf_counter() - maintenant) * 1000
+            self.identifiant_minuteur = self.canvas.after(max(1, round(self.duree_image - travail)), self.tic)
+        else:
+            self.identifiant_minuteur = None
+        for animation in terminees:
+            animation.suite()
+
+    def arreter(self):
+        """
+        Arrête le minuteur et abandonne les animations en cours, sans exécuter leur suite.
+        """
+        if self.identifiant_minuteur is not None:
+            self.canvas.after_cancel(self.identifiant_minuteur)
+            self.identifiant_minuteur = None
+        self.animations = []
@@ -0,0 +1,105 @@
+"""
+Module contenant la classe CacheSprites, qui garde une image pré-rendue (PhotoImage) de
+chaque face de dé dessinée (mode d'affichage 2), pour la taille de case courante.
+
+Un dé dessiné devient ainsi un seul item d'image dans le canvas, plutôt qu'un rectangle
+et jusqu'à six ovales recréés à chaque dessin.
+"""
+
+from tkinter import PhotoImage
+
+# La position du centre de chaque point, en dixièmes du côté du dé (colonne, rangée).
+POINTS_FACES = {
+    "⚁": ((2, 2), (8, 8)),
+    "⚂": ((2, 2), (8, 8), (5, 5)),
+    "⚃": ((2, 2), (8, 8), (2, 8), (8, 2)),
+    "⚄": ((2, 2), (8, 8), (2, 8), (8, 2), (5, 5)),
+    "⚅": ((2, 2), (8, 8), (2, 8), (8, 2), (2, 5), (8, 5)),
+}
+
+# L'épaisseur du contour du dé, en pixels (la moitié intérieure du contour de 3 pixels des dés en texte).
+EPAISSEUR_CONTOUR = 2
+
+BLANC = '#ffffff'
+NOIR = '#000000'
+
+
+class CacheSprites:
+    """ Garde les images des faces de dés pour une taille de dé. Les images sont créées
+    à la première demande; changer de taille vide le cache.
+
+    Attributes:
+        master (Widget): Le widget auquel les images sont associées.
+        taille (int): Le côté des images en cache, en pixels (None si le cache est vide).
+        images (dict): Les images, par représentation de face (Arene.afficher_de).
+    """
+
+    def __init__(self, master):
+        """
+        Constructeur de la classe CacheSprites.
+
+        Args:
+            master (Widget): Le widget auquel les images sont associées
+        """
+        self.master = master
+        self.taille = None
+        self.images = {}
+
+    def contient(self, texte_de):
+        """
+        Args:
+            texte_de (str): La représentation d'un dé (Arene.afficher_de)
+
+        Returns:
+            bool: True si cette face est dessinée par une image
+        """
+        return texte_de in POINTS_FACES
+
+    def obtenir(self, texte_de, taille):
+        """
+        Donne l'image d'une face, en la créant au besoin.
+
+        Args:
+            texte_de (str): La représentation de la face (⚁ à ⚅)
+            taille (int): Le côté du dé, en pixels
+
+        Returns:
+            PhotoImage: L'image de la face
+        """
+        if taille != self.taille:
+            self.images = {}
+            self.taille = taille
+        image = self.images.get(texte_de)
+        if image is None:
+            image = self.rendre(texte_de, taille)
+            self.images[texte_de] = image
+        return image
+
+    def rendre(self, texte_de, taille):
+        """
+        Dessine une face pixel par pixel: un carré blanc à contour noir, et un disque
+        noir par point.
+
+        Args:
+            texte_de (str): La représentation de la face (⚁ à ⚅)
+            taille (int): Le côté du dé, en pixels
+
+        Returns:
+            PhotoImage: L'image de la face
+        """
+        l = max(1, taille // 10)
+        centres = [(colonne * l, rangee * l) for colonne, rangee in POINTS_FACES[texte_de]]
+        rangees = []
+        for py in range(taille):
+            pixels = []
+            for px in range(taille):
+                if min(px, py, taille - 1 - px, taille - 1 - py) < EPAISSEUR_CONTOUR:
+                    pixels.append(NOIR)
+                elif any((px + 0.5 - cx) ** 2 + (py + 0.5 - cy) ** 2 <= l * l for cx, cy in centres):
+                    pixels.append(NOIR)
+                else:
+                    pixels.append(BLANC)
+            rangees.append('{' + ' '.join(pixels) + '}')
+        image = PhotoImage(master=self.master, width=taille, height=taille)
+        image.put(' '.join(rangees), to=(0, 0))
+        return image
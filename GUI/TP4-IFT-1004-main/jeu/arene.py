@@ -4,6 +4,28 @@ La classe Arène
 Représente la zone où les dés sont lancés
 """
 
+import random
+
+from jeu.de import De
+from jeu.traceur import tracer
+from jeu.zobrist import cle_de
+
+
+def iterer_bits(masque):
+    """
+    Donne les indices des bits à 1 d'un masque, du plus petit au plus grand.
+
+    Args:
+        masque (int): Le masque à parcourir
+
+    Returns:
+        generator: Les indices des bits à 1
+    """
+    while masque:
+        bit = masque & -masque
+        yield bit.bit_length() - 1
+        masque ^= bit
+
 
 class Arene:
     """ Représente la zone de jeu où les dés sont lancés.
@@ -13,9 +35,17 @@ class Arene:
         des (dict): Les dés présents sur l'arène, sous la forme de paires <emplacement, dé>
                     où emplacement est un tuple de coordonnées (x,y) et dé est une istance de la classe Dé.
         mode_affichage (int): Le mode d'affichage (1 pour [X,2,3,4,5,6] ou 2 pour [X,⚁,⚂,⚃,⚄,⚅])
+        generateur (random.Random): Le générateur aléatoire de la partie, utilisé pour lancer
+                    les dés et partagé avec les lancers et les joueurs.
+        emplacements_par_valeur (dict): Index secondaire associant chaque valeur (1 pour les X,
+                    puis 2 à 6) à l'ensemble des emplacements où se trouve un dé de cette valeur.
+                    Il est tenu à jour à chaque changement; le nombre de dés d'une valeur est
+                    la taille de son ensemble.
+        empreinte (int): L'empreinte de Zobrist du plateau (jeu.zobrist), le XOR des clés
+                    de tous les dés présents. Elle est tenue à jour à chaque changement.
     """
 
-    def __init__(self, dimension, de_initial, mode_affichage):
+    def __init__(self, dimension, de_initial, mode_affichage, generateur=random):
         """
         Constructeur de la classe Arene.
         Le dé initial est centré et sa valeur ne doit pas être X.
@@ -24,13 +54,42 @@ class Arene:
             dimension (int): La dimension, largeur comme hauteur, de l'Arene.
             de_initial (De): L'unique dé présent dans l'arène au départ
             mode_affichage (int): Le mode d'affichage (1 pour [X,2,3,4,5,6] ou 2 pour [X,⚁,⚂,⚃,⚄,⚅])
+            generateur (random.Random, optional): Le générateur aléatoire de la partie
+                (par exemple un GenerateurAleatoire semé, pour rejouer une partie).
+                Défaut: le générateur global du module random.
         """
         self.dimension = dimension
-        de_initial.lancer()
+        self.generateur = generateur
+        de_initial.lancer(self.generateur)
         while de_initial.valeur == 1:
-            de_initial.lancer()
-        self.des = {(self.dimension // 2, self.dimension // 2): de_initial}
+            de_initial.lancer(self.generateur)
+        self.des = {}
         self.mode_affichage = mode_affichage
+        self.emplacements_par_valeur = {valeur: set() for valeur in range(1, 7)}
+        self.empreinte = 0
+        emplacement_initial = (self.dimension // 2, self.dimension // 2)
+        self.des[emplacement_initial] = de_initial
+        self._actualiser_case(emplacement_initial, None, de_initial.valeur)
+
+    def _actualiser_case(self, emplacement, ancienne_valeur, nouvelle_valeur):
+        """
+        Appelée chaque fois que la valeur d'une case change: dé placé, relancé ou retiré.
+        Déplace l'emplacement d'un ensemble à l'autre dans l'index des valeurs, et remplace
+        la clé de l'ancien dé par celle du nouveau dans l'empreinte.
+        Les représentations alternatives de l'arène la redéfinissent (en appelant celle-ci)
+        pour garder leur structure synchronisée avec le dictionnaire de dés.
+
+        Args:
+            emplacement ((int, int)): La case modifiée
+            ancienne_valeur (int): La valeur avant le changement (None si la case était vide)
+            nouvelle_valeur (int): La valeur après le changement (None si la case est vidée)
+        """
+        if ancienne_valeur is not None:
+            self.emplacements_par_valeur[ancienne_valeur].discard(emplacement)
+            self.empreinte ^= cle_de(emplacement, ancienne_valeur)
+        if nouvelle_valeur is not None:
+            self.emplacements_par_valeur[nouvelle_valeur].add(emplacement)
+            self.empreinte ^= cle_de(emplacement, nouvelle_valeur)
 
     def dans_arene(self, emplacement):
         """
@@ -56,7 +115,7 @@ class Arene:
         Args:
             lancer (Lancer): contient les informations sur le lancer à effectuer
         """
-        self.relancer_des_accroches(lancer.trajectoire[:-1])
+        self.relancer_des_accroches(lancer.cases_traversees())
         self.placer_nouveau_de(lancer.de, lancer.trajectoire[-1])
 
     def relancer_des_accroches(self, trajectoire):
@@ -64,12 +123,27 @@ class Arene:
         Pour chaque emplacement de la trajectoire, relancer le dé (De.lancer) qui
         se trouve à cet emplacement, s'il y en a un.
 
+        Les dés accrochés sont obtenus par l'intersection des cases de la trajectoire
+        avec les cases occupées, puis relancés dans l'ordre des coordonnées: le résultat
+        ne dépend donc pas de la représentation de l'arène.
+
         Args:
-            trajectoire (list): Liste des coordonnées où l'on doit relancer
+            trajectoire (list ou set): Les coordonnées où l'on doit relancer
+        """
+        for emplacement in sorted(self.des.keys() & trajectoire):
+            self.relancer_de(emplacement)
+
+    def relancer_de(self, emplacement):
         """
-        for emplacement in trajectoire:
-            if emplacement in self.des:
-                self.des[emplacement].lancer()
+        Relance le dé (De.lancer) situé à l'emplacement.
+
+        Args:
+            emplacement ((int, int)): L'emplacement du dé à relancer
+        """
+        de = self.des[emplacement]
+        ancienne_valeur = de.valeur
+        de.lancer(self.generateur)
+        self._actualiser_case(emplacement, ancienne_valeur, de.valeur)
 
     def placer_nouveau_de(self, de, emplacement_final):
         """
@@ -85,8 +159,11 @@ class Arene:
             emplacement_final ((int, int)): Les coordonnées où ajouter le dé
         """
         if self.dans_arene(emplacement_final):
-            de.lancer()
+            ancien_de = self.des.get(emplacement_final)
+            ancienne_valeur = None if ancien_de is None else ancien_de.valeur
+            de.lancer(self.generateur)
             self.des[emplacement_final] = de
+            self._actualiser_case(emplacement_final, ancienne_valeur, de.valeur)
 
     def effectuer_plusieurs_lancers(self, liste_lancers):
         """
@@ -107,6 +184,9 @@ class Arene:
         On retourne ensuite un booléen indiquant si une correspondance
         a eu lieu (Arene.correspondance_existe)
 
+        Grâce à l'index des valeurs (Arene.emplacements_par_valeur), le rangement ne touche
+        qu'aux dés retirés, sans parcourir le reste de l'arène.
+
         Args:
             joueur_en_cours (Joueur): le joueur qui vient de lancer
 
@@ -120,18 +200,12 @@ class Arene:
 
     def retirer_les_x(self):
         """
-        Parmi toutes les entrées du dictionnaire de dés, retire
-        (Arene.retirer_de) celles dont la valeur est 1.
+        Retire (Arene.retirer_de) les dés dont la valeur est 1, c'est-à-dire
+        tous ceux de l'ensemble des X dans l'index des valeurs.
 
-        Astuce: commencez par identifier les emplacements avec les X en les mettant
-        dans une liste, puis retirez-les dans un deuxième temps, car faire des suppressions
-        dans un dictionnaire en même temps que l'on itère dessus est déconseillé.
+        L'ensemble est copié avant les retraits, car chaque retrait le modifie.
         """
-        a_retirer_X = []
-        for emplacement in self.des.keys():
-            valeur_de = self.des[emplacement].valeur
-            if valeur_de == 1:
-                a_retirer_X.append(emplacement)
+        a_retirer_X = list(self.emplacements_par_valeur[1])
         for emplacement in a_retirer_X:
             self.retirer_de(emplacement)
 
@@ -143,25 +217,22 @@ class Arene:
         Exemple: si l'arène contient 3 dés (un 5 et deux 3),
         alors on retourne {2:0, 3:2, 4:0, 5:1, 6:0}
 
+        Les comptes sont les tailles des ensembles de l'index des valeurs: ils ne changent
+        pas lorsque des dés sont ensuite retirés.
+
         Returns:
             dict: Le dictionnaire associant valeurs de dés et nombre d'occurence
         """
-        comptes = {
-            2: 0, 3: 0, 4: 0, 5: 0, 6: 0
-        }
-        for de in self.des.values():
-            valeur_de = de.valeur
-            comptes[valeur_de] += 1
-        return comptes
+        return {valeur: len(self.emplacements_par_valeur[valeur]) for valeur in range(2, 7)}
 
     def retirer_correspondances(self, comptes, joueur_en_cours):
         """
-        Parmi toutes les entrées du dictionnaire de dés, rend au joueur
-        (Arene.rendre_au_joueur) celles dont la valeur est présente plus d'une fois.
+        Rend au joueur (Arene.rendre_au_joueur) les dés dont la valeur est présente
+        plus d'une fois. Les emplacements sont pris directement dans l'index des valeurs,
+        donc seuls les dés rendus sont touchés.
 
-        Astuce: commencez par identifier les emplacements des dés à enlever en les mettant
-        dans une liste, puis retirez-les dans un deuxième temps, car faire des suppressions
-        dans un dictionnaire en même temps que l'on itère dessus est déconseillé.
+        Les emplacements sont d'abord copiés dans une liste, car chaque retrait
+        modifie l'index.
 
         Args:
             comptes (dict): Nombre d'occurences de chaque valeur de dé
@@ -169,10 +240,9 @@ class Arene:
 
         """
         a_retirer_correspondance = []
-        for emplacement in self.des.keys():
-            valeur_de = self.des[emplacement].valeur
-            if comptes[valeur_de] > 1:
-                a_retirer_correspondance.append(emplacement)
+        for valeur, compte in comptes.items():
+            if compte > 1:
+                a_retirer_correspondance.extend(self.emplacements_par_valeur[valeur])
         for emplacement in a_retirer_correspondance:
             self.rendre_au_joueur(emplacement, joueur_en_cours)
 
@@ -203,25 +273,27 @@ class Arene:
 
     def retirer_de(self, emplacement):
         """
-        Retire un dé définitivement. Utilisez le mot-clé del.
+        Retire un dé définitivement.
 
         Args:
             emplacement ((int, int)): L'emplacement du dé à éliminer.
         """
-        del self.des[emplacement]
+        de = self.des.pop(emplacement)
+        self._actualiser_case(emplacement, de.valeur, None)
 
     def rendre_au_joueur(self, emplacement, joueur):
         """
-        Rend le dé situé à l'emplacement au joueur (Joueur.rendre_de),
-        et retire le dé de l'arène (Arene.retirer_de). L'ordre des appels est important!
+        Retire le dé de l'arène (Arene.retirer_de), puis le rend au joueur (Joueur.rendre_de).
+        L'ordre des appels est important: le joueur range le dé (sa valeur devient None),
+        alors que l'arène a besoin de sa valeur pour tenir son index des valeurs à jour.
 
         Args:
             emplacement ((int, int)): L'emplacement du dé à rendre
             joueur (Joueur): Le joueur à qui rendre le dé
         """
         de = self.des[emplacement]
-        joueur.rendre_de(de)
         self.retirer_de(emplacement)
+        joueur.rendre_de(de)
 
     def afficher_de(self, emplacement):
         """
@@ -235,3 +307,66 @@ class Arene:
             str: La chaîne représentant le dé
         """
         return self.des[emplacement].affichage_string(self.mode_affichage)
+
+    def indice_case(self, emplacement):
+        """
+        Donne l'indice du bit correspondant à une case dans un masque des cases de l'arène:
+        la case (x, y) correspond au bit x * dimension + y.
+
+        Args:
+            emplacement ((int, int)): La case
+
+        Returns:
+            int: L'indice du bit
+        """
+        return emplacement[0] * self.dimension + emplacement[1]
+
+    def case_indice(self, indice):
+        """
+        Donne la case correspondant à l'indice d'un bit.
+
+        Args:
+            indice (int): L'indice du bit
+
+        Returns:
+            (int, int): La case
+        """
+        return divmod(indice, self.dimension)
+
+    def instantane(self):
+        """
+        Donne l'état du plateau sous une forme compacte et immuable: un tuple de six masques
+        de bits, un par valeur (X, 2, 3, 4, 5, 6), où le bit de chaque case occupée par un dé
+        de cette valeur est à 1 (Arene.indice_case). L'instantané ne contient aucune référence
+        vers l'arène ou ses dés: il se conserve et se partage sans rien copier, et il a la
+        même forme peu importe la représentation de l'arène.
+
+        Returns:
+            tuple: Les six masques de bits (X, 2, 3, 4, 5, 6)
+        """
+        plans = [0] * 6
+        for emplacement, de in self.des.items():
+            plans[de.valeur - 1] |= 1 << self.indice_case(emplacement)
+        return tuple(plans)
+
+    def restaurer(self, instantane):
+        """
+        Remet le plateau dans l'état d'un instantané (Arene.instantane).
+        Les dés présents sont retirés, puis un nouveau dé est créé pour chaque bit à 1.
+
+        Args:
+            instantane (tuple): Les six masques de bits (X, 2, 3, 4, 5, 6)
+        """
+        for emplacement in list(self.des):
+            self.retirer_de(emplacement)
+        for valeur, plan in enumerate(instantane, start=1):
+            for indice in iterer_bits(plan):
+                emplacement = self.case_indice(indice)
+                de = De()
+                de.valeur = valeur
+                self.des[emplacement] = de
+                self._actualiser_case(emplacement, None, valeur)
+
+
+# Points de trace (jeu.traceur), sans effet tant que le traceur n'est pas activé.
+tracer(Arene, ['effectuer_lancer', 'rangement'], 'arene')
@@ -0,0 +1,143 @@
+"""
+La classe AreneBitboard
+
+Variante de l'Arène où chaque valeur de dé est aussi représentée par un entier Python
+servant de masque de bits sur les dimension² cases de l'arène.
+"""
+
+import random
+
+from jeu.arene import Arene, iterer_bits
+from jeu.traceur import tracer
+
+
+class AreneBitboard(Arene):
+    """ Arène dont le rangement se fait par opérations sur des masques de bits.
+
+    La case (x, y) correspond au bit x * dimension + y (Arene.indice_case). Tester l'occupation,
+    croiser une trajectoire avec les dés présents, retirer les X et repérer les correspondances
+    se font en quelques opérations bit à bit, et l'instantané du plateau (Arene.instantane)
+    n'est qu'une copie des plans.
+
+    Le dictionnaire Arene.des est conservé, pour les instances de De à rendre aux joueurs
+    et pour que Gladeateur et CanvasArene fonctionnent sans changement, tout comme l'index
+    des valeurs et l'empreinte d'Arene: une AreneBitboard prend donc plus de mémoire qu'une
+    Arene. Ce sont ses instantanés, six entiers, qui sont compacts à garder en grand nombre.
+
+    Attributes:
+        plans (list): Six masques de bits, un par valeur: plans[0] pour les X, plans[1] pour les 2, etc.
+    """
+
+    def __init__(self, dimension, de_initial, mode_affichage, generateur=random):
+        """
+        Constructeur de la classe AreneBitboard. Les plans doivent exister avant l'appel
+        au constructeur parent, puisque celui-ci place le dé initial.
+
+        Args:
+            dimension (int): La dimension, largeur comme hauteur, de l'Arene.
+            de_initial (De): L'unique dé présent dans l'arène au départ
+            mode_affichage (int): Le mode d'affichage (1 pour [X,2,3,4,5,6] ou 2 pour [X,⚁,⚂,⚃,⚄,⚅])
+            generateur (random.Random, optional): Le générateur aléatoire de la partie.
+                Défaut: le générateur global du module random.
+        """
+        self.plans = [0] * 6
+        super().__init__(dimension, de_initial, mode_affichage, generateur)
+
+    def _actualiser_case(self, emplacement, ancienne_valeur, nouvelle_valeur):
+        """
+        Tient à jour l'index des valeurs (Arene._actualiser_case) et déplace le bit
+        de la case d'un plan à l'autre.
+
+        Args:
+            emplacement ((int, int)): La case modifiée
+            ancienne_valeur (int): La valeur avant le changement (None si la case était vide)
+            nouvelle_valeur (int): La valeur après le changement (None si la case est vidée)
+        """
+        super()._actualiser_case(emplacement, ancienne_valeur, nouvelle_valeur)
+        bit = 1 << self.indice_case(emplacement)
+        if ancienne_valeur is not None:
+            self.plans[ancienne_valeur - 1] &= ~bit
+        if nouvelle_valeur is not None:
+            self.plans[nouvelle_valeur - 1] |= bit
+
+    def occupation(self):
+        """
+        Donne le masque des cases occupées par un dé, peu importe sa valeur.
+
+        Returns:
+            int: Le masque des cases occupées
+        """
+        masque = 0
+        for plan in self.plans:
+            masque |= plan
+        return masque
+
+    def effectuer_lancer(self, lancer):
+        """
+        Relance les dés accrochés, obtenus en croisant le masque de la trajectoire
+        (Lancer.masque_traversees) avec le masque des cases occupées, puis place le dé
+        du lancer au dernier emplacement de la trajectoire.
+
+        Args:
+            lancer (Lancer): contient les informations sur le lancer à effectuer
+        """
+        accroches = lancer.masque_traversees(self.dimension) & self.occupation()
+        for indice in iterer_bits(accroches):
+            self.relancer_de(self.case_indice(indice))
+        self.placer_nouveau_de(lancer.de, lancer.trajectoire[-1])
+
+    def retirer_les_x(self):
+        """
+        Retire tous les dés du plan des X.
+        """
+        for indice in iterer_bits(self.plans[0]):
+            self.retirer_de(self.case_indice(indice))
+
+    def compter_valeurs(self):
+        """
+        Retourne un dictionnaire associant les numéros 2, 3, 4, 5 et 6
+        au nombre de dés ayant ces valeurs, soit le nombre de bits à 1 de chaque plan
+        (compté par bin plutôt que int.bit_count, qui demande Python 3.10).
+
+        Returns:
+            dict: Le dictionnaire associant valeurs de dés et nombre d'occurence
+        """
+        return {valeur: bin(self.plans[valeur - 1]).count('1') for valeur in range(2, 7)}
+
+    def retirer_correspondances(self, comptes, joueur_en_cours):
+        """
+        Rend au joueur tous les dés des plans dont la valeur est présente plus d'une fois.
+
+        Args:
+            comptes (dict): Nombre d'occurences de chaque valeur de dé
+            joueur_en_cours (Joueur): le joueur à qui rendre les dés
+        """
+        a_rendre = 0
+        for valeur, compte in comptes.items():
+            if compte > 1:
+                a_rendre |= self.plans[valeur - 1]
+        for indice in iterer_bits(a_rendre):
+            self.rendre_au_joueur(self.case_indice(indice), joueur_en_cours)
+
+    def est_vide(self):
+        """
+        Vérifie si l'arène est vide, c'est-à-dire si tous les plans sont nuls.
+
+        Returns:
+            bool: True si aucun dé n'est présent, False sinon.
+        """
+        return not any(self.plans)
+
+    def instantane(self):
+        """
+        Donne l'état du plateau (Arene.instantane): les six plans, qui sont déjà tenus à jour,
+        dans un tuple immuable.
+
+        Returns:
+            tuple: Les six masques de bits (X, 2, 3, 4, 5, 6)
+        """
+        return tuple(self.plans)
+
+
+# Points de trace (jeu.traceur), sans effet tant que le traceur n'est pas activé.
+tracer(AreneBitboard, ['effectuer_lancer'], 'arene')
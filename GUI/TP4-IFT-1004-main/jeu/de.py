@@ -4,7 +4,7 @@ La classe Dé.
 Représente un dé à 6 faces.
 """
 
-from random import randint
+import random
 
 
 class De:
@@ -39,11 +39,15 @@ class De:
         elif mode == 2:
             return chr(9855 + self.valeur)
 
-    def lancer(self):
+    def lancer(self, generateur=random):
         """
         Modifie aléatoirement la valeur du dé.
+
+        Args:
+            generateur (random.Random, optional): Le générateur aléatoire de la partie.
+                Défaut: le générateur global du module random.
         """
-        self.valeur = randint(1, 6)
+        self.valeur = generateur.randint(1, 6)
 
     def ranger(self):
         """
@@ -0,0 +1,157 @@
+"""
+La classe DistributionLancer
+
+Calcule exactement, plutôt que par échantillonnage, où un lancer peut mener.
+
+À chaque pas, Lancer.deviation choisit la direction indépendamment des pas précédents:
+tout droit (7 chances sur 8), ou déviée d'un huitième de tour vers la droite ou vers
+la gauche (1 chance sur 16 chacune). Le déplacement après k pas ne dépend donc que de
+l'angle et de k, et pas de l'emplacement de départ: on le calcule une seule fois par
+(angle, puissance), par programmation dynamique, puis on le translate à l'emplacement
+de départ voulu.
+
+Comme chaque direction possible avance toujours dans le même sens (par exemple, vers
+le nord, chaque pas diminue x de 1), une trajectoire ne passe jamais deux fois par la
+même case: la probabilité de traverser une case est donc la somme, sur les pas, des
+probabilités de s'y trouver.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+
+from jeu.lancer import ANGLES
+
+# Les déviations possibles à chaque pas, comme dans Lancer.deviation,
+# sous la forme (matrice de rotation, chances sur 16).
+DEVIATIONS = (
+    (((1, 0), (0, 1)), 14),  # pas de déviation
+    (((1, 1), (-1, 1)), 1),  # rotation sens horaire
+    (((1, -1), (1, 1)), 1),  # rotation sens anti-horaire
+)
+
+# Le nombre maximal de paires (angle, puissance) gardées en mémoire.
+TAILLE_CACHE = 512
+
+
+class DistributionLancer:
+    """ La distribution exacte des cases atteintes par un lancer.
+
+    Attributes:
+        arrivee (dict): Probabilité que le dé s'arrête sur chaque case de l'arène,
+            sous la forme de paires <emplacement, probabilité>.
+        passage (dict): Probabilité que le dé traverse chaque case de l'arène avant de s'arrêter
+            (ce sont les cases où un dé présent serait relancé), sous la même forme.
+        hors_arene (float): Probabilité que le dé s'arrête hors de l'arène.
+    """
+
+    def __init__(self, arrivee, passage, hors_arene):
+        """
+        Constructeur de la classe DistributionLancer.
+
+        Args:
+            arrivee (dict): Probabilités d'arrêt, par case
+            passage (dict): Probabilités de passage, par case
+            hors_arene (float): Probabilité que le dé s'arrête hors de l'arène
+        """
+        self.arrivee = arrivee
+        self.passage = passage
+        self.hors_arene = hors_arene
+
+
+def signe(x):
+    """
+    Fonction utilitaire retournant -1 pour un nombre négatif, 0 pour 0 et +1 pour un
+    nombre positif (comme Lancer.signe).
+
+    Args:
+        x (int):
+
+    Returns:
+        int: +1 si l'entrée est positive, 0 si elle est 0, et -1 si elle est négative.
+    """
+    return (x > 0) - (x < 0)
+
+
+def directions_possibles(angle, exacte=False):
+    """
+    Donne les directions que peut prendre un pas, avec leur probabilité.
+
+    Args:
+        angle (str): Le point cardinal du lancer
+        exacte (bool): Si True, les probabilités sont des fractions exactes plutôt que des réels.
+
+    Returns:
+        list: Les paires (direction, probabilité)
+    """
+    dir_x, dir_y = ANGLES[angle]
+    directions = []
+    for rotation, chances in DEVIATIONS:
+        direction = (signe(rotation[0][0] * dir_x + rotation[0][1] * dir_y),
+                     signe(rotation[1][0] * dir_x + rotation[1][1] * dir_y))
+        directions.append((direction, Fraction(chances, 16) if exacte else chances / 16))
+    return directions
+
+
+@lru_cache(maxsize=TAILLE_CACHE)
+def distributions_relatives(angle, puissance, exacte=False):
+    """
+    Calcule, relativement à l'emplacement de départ, la distribution de l'arrêt du dé
+    et la probabilité de passage sur chaque case. Le résultat est gardé en mémoire
+    (cache LRU borné): il ne dépend ni du départ ni de la dimension de l'arène.
+
+    Args:
+        angle (str): Le point cardinal du lancer
+        puissance (int): La puissance du lancer
+        exacte (bool): Si True, les probabilités sont des fractions exactes plutôt que des réels.
+
+    Returns:
+        (tuple, tuple): Les paires (déplacement, probabilité) pour l'arrêt, puis pour le passage
+    """
+    directions = directions_possibles(angle, exacte)
+    courante = {(0, 0): Fraction(1) if exacte else 1.0}
+    passage = {}
+    for _ in range(puissance):
+        for deplacement, probabilite in courante.items():
+            passage[deplacement] = passage.get(deplacement, 0) + probabilite
+        suivante = {}
+        for (x, y), probabilite in courante.items():
+            for (dx, dy), probabilite_pas in directions:
+                deplacement = (x + dx, y + dy)
+                suivante[deplacement] = suivante.get(deplacement, 0) + probabilite * probabilite_pas
+        courante = suivante
+    return tuple(courante.items()), tuple(passage.items())
+
+
+def distribution_lancer(emplacement_depart, angle, puissance, dimension, exacte=False):
+    """
+    Calcule la distribution exacte d'un lancer dans une arène.
+
+    Args:
+        emplacement_depart ((int, int)): Les coordonnées où le dé atterit d'abord
+        angle (str): Le point cardinal vers lequel le dé roule
+        puissance (int): Le nombre de pas du lancer
+        dimension (int): La dimension de l'arène
+        exacte (bool, optional): Si True, les probabilités sont des fractions exactes. Défaut: False
+
+    Returns:
+        DistributionLancer: Les probabilités d'arrêt et de passage, par case de l'arène
+    """
+    arrivee_relative, passage_relatif = distributions_relatives(angle, puissance, exacte)
+    depart_x, depart_y = emplacement_depart
+
+    arrivee = {}
+    hors_arene = 0
+    for (dx, dy), probabilite in arrivee_relative:
+        x, y = depart_x + dx, depart_y + dy
+        if 0 <= x < dimension and 0 <= y < dimension:
+            arrivee[(x, y)] = probabilite
+        else:
+            hors_arene += probabilite
+
+    passage = {}
+    for (dx, dy), probabilite in passage_relatif:
+        x, y = depart_x + dx, depart_y + dy
+        if 0 <= x < dimension and 0 <= y < dimension:
+            passage[(x, y)] = probabilite
+
+    return DistributionLancer(arrivee, passage, hors_arene)
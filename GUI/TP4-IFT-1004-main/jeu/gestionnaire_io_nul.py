@@ -0,0 +1,172 @@
+"""
+La classe GestionnaireIONul
+
+Un GestionnaireIO qui n'affiche rien, pour jouer des parties complètes sans Tk
+(par exemple entre joueurs ordinateurs, à la vitesse du processeur).
+
+Gladeateur enchaîne ses étapes par des callbacks (suite). Dans l'interface, chaque
+suite passe par Tk.after, ce qui vide la pile entre deux étapes. Si on appelait plutôt
+chaque suite directement, la pile grandirait à chaque lancer jusqu'à un RecursionError.
+Ce gestionnaire met donc les suites dans une file, qui est vidée par une boucle
+(GestionnaireIONul.executer): la profondeur de pile reste constante, peu importe la
+longueur de la partie.
+"""
+
+from collections import deque
+
+
+class GestionnaireIONul:
+    """ GestionnaireIO sans affichage, qui pilote lui-même la boucle de jeu.
+
+    Attributes:
+        actions (deque): Les suites en attente d'exécution, dans l'ordre.
+        limite_lancers (int): Nombre maximal de lancers avant d'interrompre la partie (None si aucune limite).
+        vainqueur (Joueur): Le joueur victorieux, une fois la partie terminée (None sinon).
+        interrompue (bool): True si la partie a été arrêtée par la limite de lancers.
+        nombre_lancers (int): Nombre de lancers effectués, incluant ceux des tables rases.
+        nombre_tours (int): Nombre de fins de tour.
+        nombre_tables_rases (int): Nombre de tables rases.
+    """
+
+    def __init__(self, limite_lancers=None):
+        """
+        Constructeur de la classe GestionnaireIONul.
+
+        Args:
+            limite_lancers (int, optional): Nombre maximal de lancers avant d'interrompre
+                la partie. Défaut: None (aucune limite).
+        """
+        self.actions = deque()
+        self.limite_lancers = limite_lancers
+        self.vainqueur = None
+        self.interrompue = False
+        self.nombre_lancers = 0
+        self.nombre_tours = 0
+        self.nombre_tables_rases = 0
+
+    def executer(self, gladeateur):
+        """
+        Joue la partie au complet: démarre la boucle de jeu, puis exécute les suites
+        une à une jusqu'à ce qu'il n'en reste plus (victoire ou interruption).
+
+        Args:
+            gladeateur (Gladeateur): La partie à jouer. Son gestionnaire_io doit être cette instance.
+
+        Returns:
+            Joueur: Le joueur victorieux (None si la partie a été interrompue)
+        """
+        self.planifier(gladeateur.jouer_partie)
+        while len(self.actions) > 0:
+            self.actions.popleft()()
+        return self.vainqueur
+
+    def planifier(self, suite):
+        """
+        Ajoute une suite à la file, sauf si la partie a été interrompue.
+
+        Args:
+            suite (fonction): La fonction à exécuter plus tard
+        """
+        if not self.interrompue:
+            self.actions.append(suite)
+
+    def temps_attente(self):
+        """
+        Retourne le temps entre deux actions. Il n'y a rien à regarder, donc aucun délai.
+
+        Returns:
+            int: 0
+        """
+        return 0
+
+    def afficher_jeu(self, arene, suite):
+        """
+        N'affiche pas l'arène, et planifie la suite.
+
+        Args:
+            arene (Arene): L'arène à afficher
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.planifier(suite)
+
+    def afficher_table_rase(self, suite):
+        """
+        Compte la table rase, et planifie la suite.
+
+        Args:
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.nombre_tables_rases += 1
+        self.planifier(suite)
+
+    def afficher_fin_tour(self, suite):
+        """
+        Compte la fin du tour, et planifie la suite.
+
+        Args:
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.nombre_tours += 1
+        self.planifier(suite)
+
+    def afficher_rangement(self, suite):
+        """
+        Planifie la suite.
+
+        Args:
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.planifier(suite)
+
+    def afficher_tour(self, joueur, suite):
+        """
+        Planifie la suite.
+
+        Args:
+            joueur (Joueur): Le joueur dont c'est le tour
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.planifier(suite)
+
+    def afficher_lancer(self, lancer, suite):
+        """
+        Compte le lancer, et planifie la suite. Si la limite de lancers est atteinte,
+        la partie est interrompue.
+
+        Args:
+            lancer (Lancer): Le lancer à afficher
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.compter_lancers(1)
+        self.planifier(suite)
+
+    def afficher_plusieurs_lancers(self, lancers, suite):
+        """
+        Compte les lancers, et planifie la suite.
+
+        Args:
+            lancers (list): Les lancers à afficher
+            suite (fonction): La fonction à exécuter suite à l'affichage
+        """
+        self.compter_lancers(len(lancers))
+        self.planifier(suite)
+
+    def afficher_victoire(self, joueur):
+        """
+        Retient le joueur victorieux. Aucune suite n'est planifiée: la boucle s'arrête.
+
+        Args:
+            joueur (Joueur): Le joueur ayant remporté la partie
+        """
+        self.vainqueur = joueur
+
+    def compter_lancers(self, nombre):
+        """
+        Ajoute des lancers au compte, et interrompt la partie si la limite est dépassée.
+
+        Args:
+            nombre (int): Le nombre de lancers à ajouter
+        """
+        self.nombre_lancers += nombre
+        if self.limite_lancers is not None and self.nombre_lancers > self.limite_lancers:
+            self.interrompue = True
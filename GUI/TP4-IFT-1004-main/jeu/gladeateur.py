@@ -9,6 +9,19 @@ Ainsi, il est déconseillé de modifier cette classe car cela pourrait facilemen
 briser le fonctionnement du jeu.
 """
 
+from collections import namedtuple
+
+from jeu.de import De
+from jeu.traceur import tracer
+from jeu.zobrist import CLE_PREMIER_LANCER, cle_joueur, cle_tour
+
+# L'état d'une partie (Gladeateur.instantane), immuable et sans référence vers les objets du jeu:
+#   plateau: l'instantané de l'arène (Arene.instantane)
+#   des_joueurs: le nombre de dés de chaque joueur, dans l'ordre de Gladeateur.liste_joueurs
+#   joueur_index: l'index du joueur en cours
+#   premier_lancer: True si le joueur en cours n'a pas encore lancé
+InstantanePartie = namedtuple('InstantanePartie', ['plateau', 'des_joueurs', 'joueur_index', 'premier_lancer'])
+
 
 class Gladeateur:
     """ Représente une partie du jeu.
@@ -19,9 +32,10 @@ class Gladeateur:
         gestionnaire_io (GestionnaireIO): L'instance gérant les entrées/sorties
         joueur_index (int): L'index du joueur actif.
         premier_lancer (bool): False si le joueur actif a fait son premier lancé de dé, False sinon.
+        journal (EcrivainJournal): L'écrivain du journal de la partie (None si la partie n'est pas journalisée).
     """
 
-    def __init__(self, liste_joueurs, arene, gestionnaire_io):
+    def __init__(self, liste_joueurs, arene, gestionnaire_io, journal=None):
         """
         Constructeur de la classe Gladeateur.
         Reçoit en paramètre le gestionnaire_io, une classe qui permet au Gladeateur
@@ -32,17 +46,24 @@ class Gladeateur:
             liste_joueurs (list): La liste des joueurs
             arene (Arene): L'arène du jeu
             gestionnaire_io (GestionnaireIO): L'instance gérant les entrées/sorties
+            journal (EcrivainJournal, optional): L'écrivain du journal de la partie (jeu.journal_partie).
+                Défaut: None (pas de journal)
         """
         self.liste_joueurs = liste_joueurs
         self.arene = arene
         self.gestionnaire_io = gestionnaire_io
         self.joueur_index = 0
         self.premier_lancer = True
+        self.journal = journal
+        for joueur in self.liste_joueurs:
+            joueur.rejoindre_partie(self)
 
     def jouer_partie(self):
         """
         Point d'entrée de la boucle de jeu. On commence par une sélection d'action.
         """
+        if self.journal is not None:
+            self.journal.ecrire_partie(self)
         self.selection_action()
 
     def selection_action(self):
@@ -54,6 +75,8 @@ class Gladeateur:
         # Si le jeu est terminé, on affiche le joueur victorieux et on arrête
         vainqueur = self.calculer_victoire()
         if self.calculer_victoire() is not None:
+            if self.journal is not None:
+                self.journal.ecrire_victoire(self.liste_joueurs.index(vainqueur))
             self.gestionnaire_io.afficher_victoire(vainqueur)
         else:
             # Sinon, on détermine l'action à faire pour le joueur en cours
@@ -107,7 +130,7 @@ class Gladeateur:
             lancer (Lancer): le lancer à effectuer
             joueur (Joueur): le joueur dont c'est le tour
         """
-        self.arene.effectuer_lancer(lancer)
+        self.effectuer_lancer(lancer)
         self.afficher_arene(None, lambda: self.tour_normal_c(joueur))
 
     def tour_normal_c(self, joueur):
@@ -118,7 +141,7 @@ class Gladeateur:
         Args:
             joueur (Joueur): le joueur dont c'est le tour
         """
-        correspondance = self.arene.rangement(joueur)
+        correspondance = self.ranger(joueur)
         if correspondance:
             prochaine_action = self.fin_du_tour_a
         else:
@@ -137,6 +160,8 @@ class Gladeateur:
         """
         self.premier_lancer = True
         self.changer_joueur()
+        if self.journal is not None:
+            self.journal.ecrire_fin_tour(self.joueur_index)
         self.selection_action()
 
     def table_rase_a(self, joueur):
@@ -156,6 +181,8 @@ class Gladeateur:
         Args:
             joueur (Joueur): Le joueur qui subit la table rase.
         """
+        if self.journal is not None:
+            self.journal.ecrire_table_rase(self.joueur_index)
         lancers = joueur.table_rase()
         self.gestionnaire_io.afficher_plusieurs_lancers(lancers,
                                                         lambda: self.table_rase_c(joueur, lancers))
@@ -172,11 +199,56 @@ class Gladeateur:
         Returns:
 
         """
-        self.arene.effectuer_plusieurs_lancers(lancers)
-        self.arene.rangement(joueur)
+        if self.journal is None:
+            self.arene.effectuer_plusieurs_lancers(lancers)
+        else:
+            for lancer in lancers:
+                self.effectuer_lancer(lancer)
+        self.ranger(joueur)
         self.changer_joueur()
+        if self.journal is not None:
+            self.journal.ecrire_fin_tour(self.joueur_index)
         self.selection_action()
 
+    def effectuer_lancer(self, lancer):
+        """
+        Effectue le lancer sur l'arène (Arene.effectuer_lancer). Si la partie est journalisée,
+        écrit aussi le lancer, avec les valeurs prises par les dés accrochés (dans l'ordre
+        des cases, comme Arene.relancer_des_accroches) et par le dé lancé.
+
+        Args:
+            lancer (Lancer): le lancer à effectuer
+        """
+        if self.journal is None:
+            self.arene.effectuer_lancer(lancer)
+            return
+        accroches = sorted(self.arene.des.keys() & lancer.cases_traversees())
+        self.arene.effectuer_lancer(lancer)
+        arrivee = lancer.trajectoire[-1]
+        valeur_arrivee = self.arene.des[arrivee].valeur if self.arene.dans_arene(arrivee) else 0
+        self.journal.ecrire_lancer(lancer, [self.arene.des[emplacement].valeur for emplacement in accroches],
+                                   valeur_arrivee)
+
+    def ranger(self, joueur):
+        """
+        Fait le rangement de l'arène (Arene.rangement). Si la partie est journalisée,
+        écrit aussi son résultat.
+
+        Args:
+            joueur (Joueur): le joueur à qui rendre les dés
+
+        Returns:
+            bool: True si une correspondance a eu lieu, False sinon.
+        """
+        if self.journal is None:
+            return self.arene.rangement(joueur)
+        x_retires = len(self.arene.emplacements_par_valeur[1])
+        des_avant = len(joueur.des)
+        correspondance = self.arene.rangement(joueur)
+        self.journal.ecrire_rangement(self.liste_joueurs.index(joueur), correspondance,
+                                      x_retires, len(joueur.des) - des_avant)
+        return correspondance
+
     def afficher_arene(self, joueur, suite):
         """
         Affiche l'arène.
@@ -242,3 +314,57 @@ class Gladeateur:
             return None
         else:
             return joueur_vainqueur
+
+    def empreinte(self):
+        """
+        Donne l'empreinte de Zobrist de l'état complet de la partie: celle du plateau
+        (Arene.empreinte, tenue à jour à chaque changement), combinée aux clés du nombre
+        de dés de chaque joueur, du joueur en cours et du premier lancer.
+        Deux parties dans le même état ont la même empreinte, peu importe le chemin suivi.
+
+        Returns:
+            int: L'empreinte de 64 bits
+        """
+        empreinte = self.arene.empreinte ^ cle_tour(self.joueur_index)
+        for index, joueur in enumerate(self.liste_joueurs):
+            empreinte ^= cle_joueur(index, len(joueur.des))
+        if self.premier_lancer:
+            empreinte ^= CLE_PREMIER_LANCER
+        return empreinte
+
+    def instantane(self):
+        """
+        Donne l'état de la partie (InstantanePartie), en temps proportionnel au nombre de dés
+        de l'arène. Les dés des joueurs ne sont que comptés: dans leurs mains, leur valeur
+        n'a pas d'importance (De.ranger). L'instantané ne garde aucune référence vers l'arène,
+        les joueurs ou l'interface: il peut être conservé, comparé ou envoyé à un autre
+        processus, et des milliers de branches peuvent partager les mêmes tuples.
+
+        Returns:
+            InstantanePartie: L'état de la partie
+        """
+        return InstantanePartie(self.arene.instantane(),
+                                tuple(len(joueur.des) for joueur in self.liste_joueurs),
+                                self.joueur_index, self.premier_lancer)
+
+    def restaurer(self, instantane):
+        """
+        Remet la partie dans l'état d'un instantané (Gladeateur.instantane): le plateau
+        (Arene.restaurer), le nombre de dés de chaque joueur, le joueur en cours et le premier
+        lancer. Les joueurs gardent leurs propres dés autant que possible; s'il en manque,
+        de nouveaux dés sont créés.
+
+        Args:
+            instantane (InstantanePartie): L'état de la partie
+        """
+        self.arene.restaurer(instantane.plateau)
+        for joueur, nombre_des in zip(self.liste_joueurs, instantane.des_joueurs):
+            del joueur.des[nombre_des:]
+            joueur.des.extend(De() for _ in range(nombre_des - len(joueur.des)))
+        self.joueur_index = instantane.joueur_index
+        self.premier_lancer = instantane.premier_lancer
+
+
+# Points de trace (jeu.traceur), sans effet tant que le traceur n'est pas activé.
+tracer(Gladeateur, ['selection_action', 'tour_normal_a', 'tour_normal_b', 'tour_normal_c',
+                    'table_rase_a', 'table_rase_b', 'table_rase_c', 'fin_du_tour_a', 'fin_du_tour_b'], 'jeu')
@@ -0,0 +1,87 @@
+"""
+La classe GenerateurAleatoire
+
+Un générateur de nombres aléatoires propre à une partie, qu'on peut semer pour
+rejouer une partie à l'identique et diviser en sous-flux indépendants pour
+jouer plusieurs parties en parallèle.
+"""
+
+import random
+from hashlib import sha256
+
+
+class GenerateurAleatoire(random.Random):
+    """ Générateur aléatoire semé, identifié par une graine et un chemin de sous-flux.
+
+    Il s'utilise partout où le module random était utilisé (randint, choice, random, ...).
+    L'état interne est dérivé par hachage de la graine et du chemin: deux chemins
+    différents donnent deux flux indépendants, qui ne se chevauchent pas en pratique.
+
+    Attributes:
+        graine (int): La graine d'origine, partagée par tous les sous-flux.
+        chemin (tuple): Les clés menant de la graine à ce flux ((), pour le flux racine).
+    """
+
+    def __init__(self, graine=None, chemin=()):
+        """
+        Constructeur de la classe GenerateurAleatoire.
+
+        Args:
+            graine (int, optional): La graine. Défaut: None (graine tirée au hasard par le système)
+            chemin (tuple, optional): Les clés du sous-flux. Défaut: () (flux racine)
+        """
+        if graine is None:
+            graine = random.SystemRandom().getrandbits(64)
+        self.graine = graine
+        self.chemin = tuple(chemin)
+        super().__init__(self.entropie())
+
+    def entropie(self):
+        """
+        Calcule l'entier de 256 bits servant à initialiser ce flux.
+
+        Returns:
+            int: L'entropie dérivée de la graine et du chemin
+        """
+        empreinte = sha256(repr((self.graine, self.chemin)).encode()).digest()
+        return int.from_bytes(empreinte, 'big')
+
+    def sous_flux(self, *cles):
+        """
+        Crée un flux indépendant, identifié par des clés (par exemple le numéro d'une partie,
+        puis le numéro d'un joueur). Le même chemin donne toujours le même flux,
+        peu importe l'ordre dans lequel les sous-flux sont créés.
+
+        Args:
+            *cles (int ou str): Les clés du sous-flux, relatives à ce flux
+
+        Returns:
+            GenerateurAleatoire: Le sous-flux
+        """
+        return GenerateurAleatoire(self.graine, self.chemin + cles)
+
+    def vers_numpy(self, sauts=0):
+        """
+        Crée un générateur NumPy (PCG64) dérivé de ce flux, pour les tirages en lot.
+        PCG64 permet de sauter directement loin devant dans la séquence: des processus
+        qui reçoivent des nombres de sauts différents n'utilisent jamais les mêmes nombres.
+
+        Args:
+            sauts (int, optional): Nombre de sauts de 2^127 tirages. Défaut: 0
+
+        Returns:
+            numpy.random.Generator: Le générateur NumPy
+        """
+        import numpy as np
+
+        generateur_binaire = np.random.PCG64(np.random.SeedSequence(self.entropie()))
+        if sauts > 0:
+            generateur_binaire = generateur_binaire.jumped(sauts)
+        return np.random.Generator(generateur_binaire)
+
+    def __reduce__(self):
+        """
+        Permet de copier ou de transmettre le générateur à un autre processus
+        en conservant sa graine, son chemin et son état.
+        """
+        return self.__class__, (self.graine, self.chemin), self.getstate()
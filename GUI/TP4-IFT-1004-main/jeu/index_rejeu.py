@@ -0,0 +1,296 @@
+"""
+La classe IndexRejeu
+
+Index d'une partie journalisée (jeu.journal_partie) qui permet de se rendre à n'importe
+quelle étape de la partie sans la rejouer depuis le début.
+
+La partie est rejouée une seule fois, à la construction de l'index. Pour chaque événement,
+on conserve un delta: les cases qui ont changé, avec leur valeur avant et après. On conserve
+aussi une image clé du plateau (Arene.instantane) toutes les INTERVALLE_IMAGES_CLES étapes.
+Pour se rendre à une étape éloignée, on part de l'image clé la plus proche et on applique
+au plus INTERVALLE_IMAGES_CLES / 2 deltas, vers l'avant ou vers l'arrière. Un delta
+s'applique dans les deux sens, puisqu'il contient les valeurs avant et après.
+"""
+
+from collections import namedtuple
+
+from jeu.arene import Arene, iterer_bits
+from jeu.de import De
+from jeu.journal_partie import EvenementLancer, EvenementPartie, RejoueurPartie, lire_journal
+
+# Le nombre d'étapes entre deux images clés du plateau.
+INTERVALLE_IMAGES_CLES = 256
+
+# L'état de la partie après un événement. Les changements sont des triplets
+# (emplacement, valeur avant, valeur après), où None représente une case vide.
+EtapeRejeu = namedtuple('EtapeRejeu', ['evenement', 'changements', 'des_joueurs', 'joueur_index',
+                                       'nombre_lancers', 'trajectoire'])
+
+
+class AreneEnregistreuse(Arene):
+    """ Arène qui retient les changements de cases faits depuis la dernière collecte,
+    pour construire les deltas d'un IndexRejeu.
+
+    Attributes:
+        changements (dict): La valeur avant et la valeur après de chaque case modifiée,
+            sous la forme de paires <emplacement, [avant, après]>.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructeur de la classe AreneEnregistreuse. Les changements doivent exister avant
+        l'appel au constructeur parent, puisque celui-ci place le dé initial.
+
+        Args:
+            *args: Les arguments du constructeur d'Arene (dimension, dé initial, mode d'affichage, générateur)
+            **kwargs: Les arguments nommés du constructeur d'Arene
+        """
+        self.changements = {}
+        super().__init__(*args, **kwargs)
+
+    def _actualiser_case(self, emplacement, ancienne_valeur, nouvelle_valeur):
+        """
+        Tient à jour l'index des valeurs (Arene._actualiser_case) et retient le changement.
+        Si la case a déjà changé depuis la dernière collecte, on garde sa valeur d'avant
+        le premier changement et on remplace seulement sa valeur d'après.
+
+        Args:
+            emplacement ((int, int)): La case modifiée
+            ancienne_valeur (int): La valeur avant le changement (None si la case était vide)
+            nouvelle_valeur (int): La valeur après le changement (None si la case est vidée)
+        """
+        super()._actualiser_case(emplacement, ancienne_valeur, nouvelle_valeur)
+        changement = self.changements.get(emplacement)
+        if changement is None:
+            self.changements[emplacement] = [ancienne_valeur, nouvelle_valeur]
+        else:
+            changement[1] = nouvelle_valeur
+
+    def collecter_changements(self):
+        """
+        Donne les changements nets depuis la dernière collecte: une case relancée qui a
+        repris sa valeur n'y figure pas.
+
+        Returns:
+            tuple: Les triplets (emplacement, valeur avant, valeur après)
+        """
+        changements = tuple((emplacement, avant, apres)
+                            for emplacement, (avant, apres) in self.changements.items() if avant != apres)
+        self.changements = {}
+        return changements
+
+
+class IndexRejeu:
+    """ Représente une partie journalisée, parcourable dans les deux sens.
+
+    Les étapes sont numérotées à partir de 0 (le plateau de départ); l'étape i est l'état
+    après le i-ème événement du journal. L'index tient à jour sa propre arène, qui est
+    toujours dans l'état de l'étape courante: c'est celle-là qu'on affiche.
+
+    Attributes:
+        evenement_partie (EvenementPartie): Le début de la partie.
+        intervalle (int): Le nombre d'étapes entre deux images clés.
+        etapes (list): Les étapes (EtapeRejeu) de la partie.
+        images_cles (list): L'instantané du plateau aux étapes 0, intervalle, 2 * intervalle, etc.
+        etapes_lancers (list): L'étape de chaque lancer, dans l'ordre.
+        arene (Arene): L'arène dans l'état de l'étape courante.
+        position (int): L'étape courante.
+    """
+
+    def __init__(self, evenement_partie, evenements, intervalle=INTERVALLE_IMAGES_CLES, mode_affichage=1):
+        """
+        Constructeur de la classe IndexRejeu. Rejoue la partie pour en construire l'index.
+
+        Args:
+            evenement_partie (EvenementPartie): Le début de la partie
+            evenements (iterable): Les événements de la partie, jusqu'à sa victoire
+            intervalle (int, optional): Le nombre d'étapes entre deux images clés. Défaut: 256
+            mode_affichage (int, optional): Le mode d'affichage de l'arène. Défaut: 1
+        """
+        if intervalle < 1:
+            raise ValueError("L'intervalle entre les images clés doit être d'au moins 1.")
+        self.evenement_partie = evenement_partie
+        self.intervalle = intervalle
+        rejoueur = RejoueurPartie(evenement_partie, AreneEnregistreuse)
+        rejoueur.arene.collecter_changements()
+        self.etapes = [self.creer_etape(rejoueur, evenement_partie, ())]
+        self.images_cles = [rejoueur.arene.instantane()]
+        self.etapes_lancers = []
+        for evenement in evenements:
+            if isinstance(evenement, EvenementPartie):
+                break
+            rejoueur.appliquer(evenement)
+            trajectoire = None
+            if isinstance(evenement, EvenementLancer):
+                trajectoire = tuple(rejoueur.dernier_lancer.trajectoire)
+                self.etapes_lancers.append(len(self.etapes))
+            self.etapes.append(self.creer_etape(rejoueur, evenement, rejoueur.arene.collecter_changements(),
+                                                trajectoire))
+            if (len(self.etapes) - 1) % intervalle == 0:
+                self.images_cles.append(rejoueur.arene.instantane())
+            if rejoueur.terminee:
+                break
+
+        self.arene = Arene(evenement_partie.dimension, De(), mode_affichage)
+        self.arene.restaurer(self.images_cles[0])
+        self.position = 0
+
+    def creer_etape(self, rejoueur, evenement, changements, trajectoire=None):
+        """
+        Résume l'état du rejoueur après un événement.
+
+        Returns:
+            EtapeRejeu: L'étape
+        """
+        return EtapeRejeu(evenement, changements, tuple(len(joueur.des) for joueur in rejoueur.joueurs),
+                          rejoueur.joueur_index, rejoueur.nombre_lancers, trajectoire)
+
+    def nombre_etapes(self):
+        """
+        Returns:
+            int: Le nombre d'étapes, incluant le plateau de départ
+        """
+        return len(self.etapes)
+
+    def etape_courante(self):
+        """
+        Returns:
+            EtapeRejeu: L'étape courante
+        """
+        return self.etapes[self.position]
+
+    def etape_du_lancer(self, numero_lancer):
+        """
+        Donne l'étape d'un lancer (le premier lancer est le numéro 1), ou l'étape de départ
+        pour le lancer 0.
+
+        Args:
+            numero_lancer (int): Le numéro du lancer
+
+        Returns:
+            int: L'étape juste après ce lancer
+        """
+        if numero_lancer <= 0 or len(self.etapes_lancers) == 0:
+            return 0
+        return self.etapes_lancers[min(numero_lancer, len(self.etapes_lancers)) - 1]
+
+    def fixer_case(self, emplacement, valeur):
+        """
+        Donne une valeur à une case de l'arène, sans tirage.
+
+        Args:
+            emplacement ((int, int)): La case
+            valeur (int): La nouvelle valeur, ou None pour vider la case
+        """
+        de = self.arene.des.get(emplacement)
+        if valeur is None:
+            if de is not None:
+                self.arene.retirer_de(emplacement)
+        elif de is None:
+            de = De()
+            de.valeur = valeur
+            self.arene.des[emplacement] = de
+            self.arene._actualiser_case(emplacement, None, valeur)
+        elif de.valeur != valeur:
+            ancienne_valeur = de.valeur
+            de.valeur = valeur
+            self.arene._actualiser_case(emplacement, ancienne_valeur, valeur)
+
+    def appliquer_image_cle(self, numero_image):
+        """
+        Met l'arène dans l'état d'une image clé, en ne touchant qu'aux cases qui diffèrent.
+
+        Args:
+            numero_image (int): Le numéro de l'image clé
+
+        Returns:
+            set: Les cases modifiées
+        """
+        actuel = self.arene.instantane()
+        cible = self.images_cles[numero_image]
+        differences = 0
+        for plan_actuel, plan_cible in zip(actuel, cible):
+            differences |= plan_actuel ^ plan_cible
+        cases = set()
+        for indice in iterer_bits(differences):
+            bit = 1 << indice
+            valeur = None
+            for numero_valeur, plan in enumerate(cible, start=1):
+                if plan & bit:
+                    valeur = numero_valeur
+                    break
+            emplacement = self.arene.case_indice(indice)
+            self.fixer_case(emplacement, valeur)
+            cases.add(emplacement)
+        self.position = numero_image * self.intervalle
+        return cases
+
+    def aller_a(self, cible):
+        """
+        Met l'arène dans l'état d'une étape. Si l'étape est à plus d'une demi-période d'images
+        clés, on passe d'abord par l'image clé la plus proche; on applique ensuite les deltas,
+        vers l'avant ou vers l'arrière.
+
+        Args:
+            cible (int): L'étape visée (ramenée entre 0 et la dernière étape)
+
+        Returns:
+            set: Les cases modifiées, à redessiner
+        """
+        cible = max(0, min(cible, len(self.etapes) - 1))
+        cases = set()
+        if abs(cible - self.position) > self.intervalle // 2:
+            numero_image = min((cible + self.intervalle // 2) // self.intervalle, len(self.images_cles) - 1)
+            cases |= self.appliquer_image_cle(numero_image)
+        while self.position < cible:
+            self.position += 1
+            for emplacement, _, apres in self.etapes[self.position].changements:
+                self.fixer_case(emplacement, apres)
+                cases.add(emplacement)
+        while self.position > cible:
+            for emplacement, avant, _ in self.etapes[self.position].changements:
+                self.fixer_case(emplacement, avant)
+                cases.add(emplacement)
+            self.position -= 1
+        return cases
+
+    def avancer(self):
+        """
+        Passe à l'étape suivante.
+
+        Returns:
+            set: Les cases modifiées
+        """
+        return self.aller_a(self.position + 1)
+
+    def reculer(self):
+        """
+        Revient à l'étape précédente.
+
+        Returns:
+            set: Les cases modifiées
+        """
+        return self.aller_a(self.position - 1)
+
+
+def indexer_journal(fichier, numero_partie=0, intervalle=INTERVALLE_IMAGES_CLES, mode_affichage=1):
+    """
+    Construit l'index d'une des parties d'un journal.
+
+    Args:
+        fichier (str ou fichier): Le journal
+        numero_partie (int, optional): Le numéro de la partie dans le journal. Défaut: 0 (la première)
+        intervalle (int, optional): Le nombre d'étapes entre deux images clés. Défaut: 256
+        mode_affichage (int, optional): Le mode d'affichage de l'arène. Défaut: 1
+
+    Returns:
+        IndexRejeu: L'index de la partie
+    """
+    evenements = lire_journal(fichier)
+    numero = -1
+    for evenement in evenements:
+        if isinstance(evenement, EvenementPartie):
+            numero += 1
+            if numero == numero_partie:
+                return IndexRejeu(evenement, evenements, intervalle, mode_affichage)
+    raise ValueError("Le journal ne contient pas de partie numéro {}.".format(numero_partie))
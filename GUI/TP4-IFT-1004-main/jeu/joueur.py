@@ -5,7 +5,6 @@ Représente un joueur.
 Ne peut exister en soi, sert plutôt de classe abstraite pour des types de joueurs concrets.
 """
 
-from random import randint, choice
 from jeu.lancer import ANGLES, Lancer
 
 
@@ -22,6 +21,17 @@ class Joueur:
         self.numero_joueur = numero_joueur
         self.des = des_initiaux
         self.arene = arene
+        self.partie = None
+
+    def rejoindre_partie(self, partie):
+        """
+        Retient la partie à laquelle le joueur participe (appelée par Gladeateur),
+        pour les joueurs qui doivent connaître l'état de tous les joueurs pour décider.
+
+        Args:
+            partie (Gladeateur): La partie
+        """
+        self.partie = partie
 
     def choisir_continuer(self, forcer_continuer, suite_continuer, suite_terminer):
         """
@@ -79,7 +89,7 @@ class Joueur:
         Returns:
             Lancer: Le lancer créé
         """
-        return Lancer(self.des.pop(), coordonnees, angle, puissance)
+        return Lancer(self.des.pop(), coordonnees, angle, puissance, self.arene.generateur)
 
     def choisir_lancer(self, suite):
         """
@@ -141,8 +151,8 @@ class Joueur:
         Returns:
             (int, int): Le centre de l'arène
         """
-        return randint(0, self.arene.dimension - 1), \
-               randint(0, self.arene.dimension - 1)
+        return self.arene.generateur.randint(0, self.arene.dimension - 1), \
+               self.arene.generateur.randint(0, self.arene.dimension - 1)
 
     def piger_angle(self):
         """
@@ -151,7 +161,7 @@ class Joueur:
         Returns:
             str: Le point cardinal pigé
         """
-        return choice(list(ANGLES.keys()))
+        return self.arene.generateur.choice(list(ANGLES.keys()))
 
     def piger_puissance(self):
         """
@@ -160,7 +170,7 @@ class Joueur:
         Returns:
             int: La puissance pigée
         """
-        return randint(1, max(1, self.arene.dimension // 4))
+        return self.arene.generateur.randint(1, max(1, self.arene.dimension // 4))
 
     def __str__(self):
         """
@@ -0,0 +1,525 @@
+"""
+Le journal binaire des parties
+
+Un journal est une suite d'enregistrements compacts (module struct), écrits au fil de la
+partie par Gladeateur lorsqu'il reçoit un EcrivainJournal. Un même fichier peut contenir
+plusieurs parties à la suite (par exemple toutes celles d'un tournoi).
+
+Le fichier commence par MAGIE, puis chaque enregistrement commence par un octet de type:
+  - PARTIE: la graine (entier signé de longueur quelconque, précédé de sa longueur en
+    octets, 0 si elle est inconnue) et le chemin du générateur, la dimension, les joueurs
+    (numéro, nombre de dés, stratégie) et les dés présents au départ;
+  - LANCER: le départ, l'angle, la puissance, les déviations (2 bits par pas), la valeur
+    prise par chaque dé accroché (4 bits par dé) et la valeur du dé lancé (0 s'il est sorti);
+  - RANGEMENT: le joueur, s'il y a eu correspondance, le nombre de X retirés et de dés rendus;
+  - TABLE_RASE: le joueur qui la subit;
+  - FIN_TOUR: le joueur dont c'est maintenant le tour;
+  - VICTOIRE: le joueur victorieux.
+Un lancer typique occupe une douzaine d'octets.
+
+Comme chaque valeur tirée au hasard est dans le journal, RejoueurPartie reconstruit l'arène
+après chaque événement sans générateur aléatoire: il redonne les valeurs enregistrées aux
+vraies règles du jeu (Lancer, Arene.effectuer_lancer, Arene.rangement), dans l'ordre où
+elles ont été tirées.
+"""
+
+import os
+import struct
+from ast import literal_eval
+from collections import deque, namedtuple
+
+from jeu.arene import Arene
+from jeu.de import De
+from jeu.joueur import Joueur
+from jeu.lancer import ANGLES, DEVIATION_ANTIHORAIRE, DEVIATION_AUCUNE, DEVIATION_HORAIRE, Lancer
+
+MAGIE = b'GLADJ\x02'
+
+# Les types d'enregistrement.
+PARTIE = 1
+LANCER = 2
+RANGEMENT = 3
+TABLE_RASE = 4
+FIN_TOUR = 5
+VICTOIRE = 6
+
+# Les formats des parties fixes des enregistrements (le type est lu séparément).
+FORMAT_PARTIE = struct.Struct('<HB')         # dimension, nombre de joueurs
+FORMAT_JOUEUR = struct.Struct('<BHB')        # numéro, nombre de dés, longueur du nom de la stratégie
+FORMAT_CASE = struct.Struct('<HHB')          # x, y, valeur
+FORMAT_LANCER = struct.Struct('<HHBHH')      # x, y, angle et valeur d'arrivée, puissance, nombre d'accrochés
+FORMAT_RANGEMENT = struct.Struct('<BBHH')    # joueur, correspondance, X retirés, dés rendus
+FORMAT_JOUEUR_INDEX = struct.Struct('<B')    # joueur (table rase, fin du tour, victoire)
+
+# L'ordre des points cardinaux, pour les coder sur 3 bits.
+LISTE_ANGLES = list(ANGLES)
+
+# L'index de joueur signifiant « aucun » (victoire d'une partie interrompue).
+AUCUN_JOUEUR = 0xFF
+
+# Le tirage de Lancer.deviation qui produit chaque code de déviation.
+TIRAGES_DEVIATION = {DEVIATION_HORAIRE: 0, DEVIATION_ANTIHORAIRE: 1, DEVIATION_AUCUNE: 2}
+
+EvenementPartie = namedtuple('EvenementPartie', ['graine', 'chemin', 'dimension', 'joueurs', 'plateau'])
+EvenementLancer = namedtuple('EvenementLancer', ['depart', 'angle', 'puissance', 'deviations',
+                                                 'valeurs_accroches', 'valeur_arrivee'])
+EvenementRangement = namedtuple('EvenementRangement', ['joueur_index', 'correspondance', 'x_retires', 'des_rendus'])
+EvenementTableRase = namedtuple('EvenementTableRase', ['joueur_index'])
+EvenementFinTour = namedtuple('EvenementFinTour', ['joueur_index'])
+EvenementVictoire = namedtuple('EvenementVictoire', ['joueur_index'])
+
+
+def empaqueter(valeurs, bits):
+    """
+    Empaquette de petits entiers dans des octets, du bit de poids faible au bit de poids fort.
+
+    Args:
+        valeurs (list): Les entiers, chacun sur le nombre de bits donné
+        bits (int): Le nombre de bits par entier (un diviseur de 8)
+
+    Returns:
+        bytes: Les octets
+    """
+    par_octet = 8 // bits
+    octets = bytearray((len(valeurs) + par_octet - 1) // par_octet)
+    for i, valeur in enumerate(valeurs):
+        octets[i // par_octet] |= valeur << (i % par_octet * bits)
+    return bytes(octets)
+
+
+def depaqueter(octets, nombre, bits):
+    """
+    Inverse de empaqueter.
+
+    Args:
+        octets (bytes): Les octets
+        nombre (int): Le nombre d'entiers à extraire
+        bits (int): Le nombre de bits par entier
+
+    Returns:
+        tuple: Les entiers
+    """
+    par_octet = 8 // bits
+    masque = (1 << bits) - 1
+    return tuple(octets[i // par_octet] >> (i % par_octet * bits) & masque for i in range(nombre))
+
+
+def encoder_graine(graine):
+    """
+    Code une graine entière, de taille et de signe quelconques, précédée de sa longueur.
+
+    Args:
+        graine (int): La graine (None si elle est inconnue)
+
+    Returns:
+        bytes: La longueur en octets (0 pour une graine inconnue), puis l'entier signé, petit-boutiste
+
+    Raises:
+        ValueError: Si la graine ne tient pas en 255 octets
+    """
+    if graine is None:
+        return bytes([0])
+    longueur = graine.bit_length() // 8 + 1
+    if longueur > 255:
+        raise ValueError("La graine est trop grande pour le journal ({} octets, au plus 255).".format(longueur))
+    return bytes([longueur]) + graine.to_bytes(longueur, 'little', signed=True)
+
+
+class EcrivainJournal:
+    """ Écrit le journal d'une ou de plusieurs parties dans un fichier binaire.
+
+    Les enregistrements sont accumulés dans un tampon, qui n'est écrit dans le fichier
+    que lorsqu'il dépasse sa taille (ou à EcrivainJournal.vider et EcrivainJournal.fermer).
+
+    Attributes:
+        fichier: Le fichier binaire (ou tout objet ayant une méthode write).
+        tampon (bytearray): Les enregistrements pas encore écrits.
+        taille_tampon (int): La taille au-delà de laquelle le tampon est écrit.
+        proprietaire (bool): True si le fichier a été ouvert par l'écrivain, qui doit le fermer.
+    """
+
+    def __init__(self, fichier, taille_tampon=1 << 16, entete=True):
+        """
+        Constructeur de la classe EcrivainJournal.
+
+        Args:
+            fichier (str ou fichier): Le chemin du fichier à créer, ou un fichier binaire déjà ouvert
+            taille_tampon (int, optional): La taille du tampon, en octets. Défaut: 64 Kio
+            entete (bool, optional): Si False, MAGIE n'est pas écrite (pour produire des
+                enregistrements à ajouter à un autre journal). Défaut: True
+        """
+        self.proprietaire = isinstance(fichier, (str, os.PathLike))
+        self.fichier = open(fichier, 'wb') if self.proprietaire else fichier
+        self.tampon = bytearray(MAGIE if entete else b'')
+        self.taille_tampon = taille_tampon
+
+    def ajouter(self, octets):
+        """
+        Ajoute des octets au tampon, et l'écrit s'il est plein.
+
+        Args:
+            octets (bytes): Les octets à ajouter
+        """
+        self.tampon += octets
+        if len(self.tampon) >= self.taille_tampon:
+            self.vider()
+
+    def ecrire_partie(self, partie):
+        """
+        Écrit l'enregistrement de début d'une partie.
+
+        Args:
+            partie (Gladeateur): La partie qui commence
+        """
+        arene = partie.arene
+        graine = getattr(arene.generateur, 'graine', None)
+        chemin = repr(getattr(arene.generateur, 'chemin', ())).encode()
+        octets = bytearray([PARTIE])
+        octets += encoder_graine(graine)
+        octets += FORMAT_PARTIE.pack(arene.dimension, len(partie.liste_joueurs))
+        octets += bytes([len(chemin)]) + chemin
+        for joueur in partie.liste_joueurs:
+            strategie = type(joueur).__name__.encode()
+            octets += FORMAT_JOUEUR.pack(joueur.numero_joueur, len(joueur.des), len(strategie)) + strategie
+        octets += struct.pack('<H', len(arene.des))
+        for (x, y), de in sorted(arene.des.items()):
+            octets += FORMAT_CASE.pack(x, y, de.valeur)
+        self.ajouter(octets)
+
+    def ecrire_lancer(self, lancer, valeurs_accroches, valeur_arrivee):
+        """
+        Écrit un lancer et les valeurs qu'il a fait tirer.
+
+        Args:
+            lancer (Lancer): Le lancer effectué
+            valeurs_accroches (list): Les nouvelles valeurs des dés accrochés, dans l'ordre des cases
+            valeur_arrivee (int): La valeur du dé lancé (0 s'il s'est arrêté hors de l'arène)
+        """
+        x, y = lancer.trajectoire[0]
+        code = LISTE_ANGLES.index(lancer.angle) << 3 | valeur_arrivee
+        self.ajouter(bytes([LANCER])
+                     + FORMAT_LANCER.pack(x, y, code, lancer.puissance, len(valeurs_accroches))
+                     + empaqueter(lancer.deviations, 2) + empaqueter(valeurs_accroches, 4))
+
+    def ecrire_rangement(self, joueur_index, correspondance, x_retires, des_rendus):
+        """
+        Écrit le résultat d'un rangement.
+
+        Args:
+            joueur_index (int): L'index du joueur à qui les dés ont été rendus
+            correspondance (bool): True s'il y a eu correspondance
+            x_retires (int): Le nombre de X retirés
+            des_rendus (int): Le nombre de dés rendus
+        """
+        self.ajouter(bytes([RANGEMENT]) + FORMAT_RANGEMENT.pack(joueur_index, correspondance, x_retires, des_rendus))
+
+    def ecrire_table_rase(self, joueur_index):
+        """
+        Écrit le début d'une table rase.
+
+        Args:
+            joueur_index (int): L'index du joueur qui la subit
+        """
+        self.ajouter(bytes([TABLE_RASE]) + FORMAT_JOUEUR_INDEX.pack(joueur_index))
+
+    def ecrire_fin_tour(self, joueur_index):
+        """
+        Écrit un changement de joueur.
+
+        Args:
+            joueur_index (int): L'index du joueur dont c'est maintenant le tour
+        """
+        self.ajouter(bytes([FIN_TOUR]) + FORMAT_JOUEUR_INDEX.pack(joueur_index))
+
+    def ecrire_victoire(self, joueur_index):
+        """
+        Écrit la fin de la partie, puis écrit le tampon.
+
+        Args:
+            joueur_index (int): L'index du joueur victorieux (None s'il n'y en a pas)
+        """
+        self.ajouter(bytes([VICTOIRE]) + FORMAT_JOUEUR_INDEX.pack(
+            AUCUN_JOUEUR if joueur_index is None else joueur_index))
+        self.vider()
+
+    def vider(self):
+        """
+        Écrit le tampon dans le fichier.
+        """
+        if len(self.tampon) > 0:
+            self.fichier.write(self.tampon)
+            self.tampon = bytearray()
+
+    def fermer(self):
+        """
+        Écrit le tampon, puis ferme le fichier s'il a été ouvert par l'écrivain.
+        """
+        self.vider()
+        if self.proprietaire:
+            self.fichier.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.fermer()
+
+
+class LecteurOctets:
+    """ Lit un fichier binaire par blocs, et en donne exactement le nombre d'octets demandé.
+
+    Attributes:
+        fichier: Le fichier binaire.
+        taille_bloc (int): Le nombre d'octets lus à la fois.
+        tampon (bytes): Les octets lus, pas encore donnés.
+        position (int): La position du prochain octet à donner dans le tampon.
+    """
+
+    def __init__(self, fichier, taille_bloc):
+        """
+        Constructeur de la classe LecteurOctets.
+
+        Args:
+            fichier: Le fichier binaire
+            taille_bloc (int): Le nombre d'octets lus à la fois
+        """
+        self.fichier = fichier
+        self.taille_bloc = taille_bloc
+        self.tampon = b''
+        self.position = 0
+
+    def lire(self, nombre, fin_permise=False):
+        """
+        Donne les prochains octets.
+
+        Args:
+            nombre (int): Le nombre d'octets voulu
+            fin_permise (bool): Si True, la fin du fichier à cet endroit n'est pas une erreur
+
+        Returns:
+            bytes: Les octets (vide si le fichier est terminé et que fin_permise est True)
+        """
+        while len(self.tampon) - self.position < nombre:
+            bloc = self.fichier.read(max(self.taille_bloc, nombre))
+            if not bloc:
+                if fin_permise and self.position == len(self.tampon):
+                    return b''
+                raise ValueError("Le journal est tronqué.")
+            self.tampon = self.tampon[self.position:] + bloc
+            self.position = 0
+        octets = self.tampon[self.position:self.position + nombre]
+        self.position += nombre
+        return octets
+
+
+def lire_journal(fichier, taille_bloc=1 << 16):
+    """
+    Lit un journal, un événement à la fois, sans le charger au complet en mémoire.
+
+    Args:
+        fichier (str ou fichier): Le chemin du journal, ou un fichier binaire déjà ouvert
+        taille_bloc (int, optional): Le nombre d'octets lus à la fois. Défaut: 64 Kio
+
+    Returns:
+        generator: Les événements (EvenementPartie, EvenementLancer, etc.), dans l'ordre
+    """
+    if isinstance(fichier, (str, os.PathLike)):
+        with open(fichier, 'rb') as fichier_ouvert:
+            yield from lire_journal(fichier_ouvert, taille_bloc)
+        return
+
+    lecteur = LecteurOctets(fichier, taille_bloc)
+    if lecteur.lire(len(MAGIE)) != MAGIE:
+        raise ValueError("Ce fichier n'est pas un journal de partie.")
+    while True:
+        type_evenement = lecteur.lire(1, fin_permise=True)
+        if not type_evenement:
+            return
+        type_evenement = type_evenement[0]
+
+        if type_evenement == LANCER:
+            x, y, code, puissance, nombre_accroches = FORMAT_LANCER.unpack(lecteur.lire(FORMAT_LANCER.size))
+            deviations = depaqueter(lecteur.lire((puissance + 3) // 4), puissance, 2)
+            valeurs_accroches = depaqueter(lecteur.lire((nombre_accroches + 1) // 2), nombre_accroches, 4)
+            yield EvenementLancer((x, y), LISTE_ANGLES[code >> 3], puissance, deviations,
+                                  valeurs_accroches, code & 0b111)
+        elif type_evenement == RANGEMENT:
+            joueur_index, correspondance, x_retires, des_rendus = \
+                FORMAT_RANGEMENT.unpack(lecteur.lire(FORMAT_RANGEMENT.size))
+            yield EvenementRangement(joueur_index, bool(correspondance), x_retires, des_rendus)
+        elif type_evenement in (TABLE_RASE, FIN_TOUR, VICTOIRE):
+            joueur_index, = FORMAT_JOUEUR_INDEX.unpack(lecteur.lire(FORMAT_JOUEUR_INDEX.size))
+            if type_evenement == TABLE_RASE:
+                yield EvenementTableRase(joueur_index)
+            elif type_evenement == FIN_TOUR:
+                yield EvenementFinTour(joueur_index)
+            else:
+                yield EvenementVictoire(None if joueur_index == AUCUN_JOUEUR else joueur_index)
+        elif type_evenement == PARTIE:
+            longueur_graine = lecteur.lire(1)[0]
+            graine = int.from_bytes(lecteur.lire(longueur_graine), 'little', signed=True) if longueur_graine else None
+            dimension, nombre_joueurs = FORMAT_PARTIE.unpack(lecteur.lire(FORMAT_PARTIE.size))
+            chemin = literal_eval(lecteur.lire(lecteur.lire(1)[0]).decode())
+            joueurs = []
+            for _ in range(nombre_joueurs):
+                numero, nombre_des, longueur = FORMAT_JOUEUR.unpack(lecteur.lire(FORMAT_JOUEUR.size))
+                joueurs.append((numero, nombre_des, lecteur.lire(longueur).decode()))
+            nombre_cases, = struct.unpack('<H', lecteur.lire(2))
+            plateau = []
+            for _ in range(nombre_cases):
+                x, y, valeur = FORMAT_CASE.unpack(lecteur.lire(FORMAT_CASE.size))
+                plateau.append(((x, y), valeur))
+            yield EvenementPartie(graine, chemin, dimension,
+                                  tuple(joueurs), tuple(plateau))
+        else:
+            raise ValueError("Type d'enregistrement inconnu: {}".format(type_evenement))
+
+
+class TirageEnregistre:
+    """ Remplace le générateur aléatoire lors d'un rejeu: redonne, dans l'ordre,
+    les valeurs tirées pendant la partie.
+
+    Attributes:
+        valeurs (deque): Les valeurs à redonner.
+    """
+
+    def __init__(self):
+        """
+        Constructeur de la classe TirageEnregistre.
+        """
+        self.valeurs = deque()
+
+    def randint(self, a, b):
+        """
+        Redonne la prochaine valeur enregistrée, à la place d'un tirage entre a et b.
+
+        Returns:
+            int: La valeur enregistrée
+        """
+        if len(self.valeurs) == 0:
+            raise ValueError("Le journal ne contient pas assez de valeurs pour ce lancer.")
+        return self.valeurs.popleft()
+
+
+class RejoueurPartie:
+    """ Reconstruit l'état d'une partie, événement par événement, à partir de son journal.
+
+    Attributes:
+        evenement_partie (EvenementPartie): Le début de la partie rejouée.
+        tirage (TirageEnregistre): Le générateur de l'arène, qui redonne les valeurs du journal.
+        arene (Arene): L'arène reconstruite.
+        joueurs (list): Un Joueur par joueur de la partie, qui ne sert qu'à compter ses dés.
+        joueur_index (int): L'index du joueur en cours.
+        nombre_lancers (int): Le nombre de lancers rejoués.
+        dernier_lancer (Lancer): Le dernier lancer rejoué (None avant le premier).
+        vainqueur (int): L'index du joueur victorieux, une fois la partie terminée.
+        terminee (bool): True une fois l'événement de victoire rejoué.
+    """
+
+    def __init__(self, evenement_partie, classe_arene=Arene, mode_affichage=1):
+        """
+        Constructeur de la classe RejoueurPartie.
+
+        Args:
+            evenement_partie (EvenementPartie): Le début de la partie à rejouer
+            classe_arene (type, optional): La représentation d'arène à utiliser. Défaut: Arene
+            mode_affichage (int, optional): Le mode d'affichage de l'arène. Défaut: 1
+        """
+        self.evenement_partie = evenement_partie
+        self.tirage = TirageEnregistre()
+        dimension = evenement_partie.dimension
+        # Le dé initial du constructeur est aussitôt remplacé par le plateau du journal.
+        self.tirage.valeurs.append(2)
+        self.arene = classe_arene(dimension, De(), mode_affichage, self.tirage)
+        plans = [0] * 6
+        for (x, y), valeur in evenement_partie.plateau:
+            plans[valeur - 1] |= 1 << (x * dimension + y)
+        self.arene.restaurer(tuple(plans))
+        self.joueurs = [Joueur(numero, [De() for _ in range(nombre_des)], self.arene)
+                        for numero, nombre_des, _ in evenement_partie.joueurs]
+        self.joueur_index = 0
+        self.nombre_lancers = 0
+        self.dernier_lancer = None
+        self.vainqueur = None
+        self.terminee = False
+
+    def appliquer(self, evenement):
+        """
+        Rejoue un événement sur l'arène et les joueurs.
+
+        Args:
+            evenement: L'événement à rejouer (EvenementLancer, EvenementRangement, etc.)
+        """
+        if isinstance(evenement, EvenementLancer):
+            self.appliquer_lancer(evenement)
+        elif isinstance(evenement, EvenementRangement):
+            self.appliquer_rangement(evenement)
+        elif isinstance(evenement, (EvenementTableRase, EvenementFinTour)):
+            self.joueur_index = evenement.joueur_index
+        elif isinstance(evenement, EvenementVictoire):
+            self.vainqueur = evenement.joueur_index
+            self.terminee = True
+        elif isinstance(evenement, EvenementPartie):
+            raise ValueError("Une nouvelle partie commence: il faut un nouveau RejoueurPartie.")
+
+    def appliquer_lancer(self, evenement):
+        """
+        Rejoue un lancer: le joueur en cours lance un de ses dés, avec les déviations et
+        les valeurs du journal plutôt qu'avec des tirages.
+
+        Args:
+            evenement (EvenementLancer): Le lancer à rejouer
+        """
+        for deviation in evenement.deviations:
+            self.tirage.valeurs.append(TIRAGES_DEVIATION[deviation])
+        self.tirage.valeurs.extend(evenement.valeurs_accroches)
+        if evenement.valeur_arrivee != 0:
+            self.tirage.valeurs.append(evenement.valeur_arrivee)
+
+        joueur = self.joueurs[self.joueur_index]
+        de = joueur.des.pop() if len(joueur.des) > 0 else De()
+        lancer = Lancer(de, evenement.depart, evenement.angle, evenement.puissance, self.tirage)
+        self.arene.effectuer_lancer(lancer)
+        if len(self.tirage.valeurs) > 0:
+            raise ValueError("Le journal ne correspond pas à l'arène: des valeurs n'ont pas été utilisées.")
+        self.nombre_lancers += 1
+        self.dernier_lancer = lancer
+
+    def appliquer_rangement(self, evenement):
+        """
+        Rejoue un rangement (Arene.rangement), et vérifie qu'il donne le même résultat
+        que dans le journal.
+
+        Args:
+            evenement (EvenementRangement): Le rangement à rejouer
+        """
+        joueur = self.joueurs[evenement.joueur_index]
+        x_retires = len(self.arene.emplacements_par_valeur[1])
+        des_avant = len(joueur.des)
+        correspondance = self.arene.rangement(joueur)
+        if (correspondance, x_retires, len(joueur.des) - des_avant) != \
+                (evenement.correspondance, evenement.x_retires, evenement.des_rendus):
+            raise ValueError("Le journal ne correspond pas à l'arène: le rangement diffère.")
+
+
+def rejouer(evenements, classe_arene=Arene):
+    """
+    Rejoue tous les événements d'un journal, partie après partie.
+
+    Args:
+        evenements (iterable): Les événements (par exemple lire_journal(chemin))
+        classe_arene (type, optional): La représentation d'arène à utiliser. Défaut: Arene
+
+    Returns:
+        generator: Les paires (événement, rejoueur), une fois l'événement rejoué.
+            Le rejoueur est le même pour tous les événements d'une partie.
+    """
+    rejoueur = None
+    for evenement in evenements:
+        if isinstance(evenement, EvenementPartie):
+            rejoueur = RejoueurPartie(evenement, classe_arene)
+        elif rejoueur is None:
+            raise ValueError("Le journal ne commence pas par une partie.")
+        else:
+            rejoueur.appliquer(evenement)
+        yield evenement, rejoueur
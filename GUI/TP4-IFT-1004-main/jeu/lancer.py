@@ -4,7 +4,7 @@ La classe Lancer
 Représente un lancer de dé.
 """
 
-from random import randint
+import random
 
 # Le dictionnaire associant les points cardinaux à leur direction.
 # À importer lorsqu'on veut connaître les points cardinaux possibles.
@@ -19,16 +19,26 @@ ANGLES = {
     'O': (0, -1)
 }
 
+# Les codes des déviations possibles à chaque pas, tels que retenus dans Lancer.deviations.
+DEVIATION_AUCUNE = 0
+DEVIATION_HORAIRE = 1
+DEVIATION_ANTIHORAIRE = 2
+
 
 class Lancer:
     """ Représente un lancer de dé.
 
     Attributes:
             de (De): le dé lancé
+        angle (str): Le point cardinal vers lequel le dé roule.
+        puissance (int): Le nombre de pas du lancer.
         trajectoire (list): La trajectoire du dé, sous forme de liste de coordonnées.
+        deviations (list): Le code de la déviation de chaque pas (DEVIATION_AUCUNE,
+            DEVIATION_HORAIRE ou DEVIATION_ANTIHORAIRE), pour journaliser le lancer.
+        generateur (random.Random): Le générateur aléatoire utilisé pour les déviations.
     """
 
-    def __init__(self, de, emplacement_depart, angle, puissance):
+    def __init__(self, de, emplacement_depart, angle, puissance, generateur=random):
         """
         Constructeur de la classe Lancer.
         Un lancer démarre à un emplacement initial dans l'arène et roule dans
@@ -40,8 +50,14 @@ class Lancer:
             emplacement_depart ((int, int)): Les coordonnées de l'emplacement où le dé atterit d'abord
             angle (str): Le point cardinal vers lequel le dé roule
             puissance (int): Le nombre de case approximatif que le dé parcourt
+            generateur (random.Random, optional): Le générateur aléatoire de la partie.
+                Défaut: le générateur global du module random.
         """
         self.de = de
+        self.angle = angle
+        self.puissance = puissance
+        self.deviations = []
+        self.generateur = generateur
         self.trajectoire = self.obtenir_trajectoire(emplacement_depart, angle, puissance)
 
     def obtenir_trajectoire(self, emplacement_depart, angle, puissance):
@@ -62,6 +78,35 @@ class Lancer:
             trajectoire.append(emplacement)
         return trajectoire
 
+    def cases_traversees(self):
+        """
+        Donne les cases traversées par le dé avant son arrêt (toute la trajectoire sauf
+        le dernier emplacement) sous forme d'ensemble, pour des tests d'appartenance
+        en temps constant et des intersections avec les cases occupées de l'arène.
+
+        Returns:
+            frozenset: Les coordonnées des cases traversées
+        """
+        return frozenset(self.trajectoire[:-1])
+
+    def masque_traversees(self, dimension):
+        """
+        Donne les cases traversées par le dé avant son arrêt sous forme de masque de bits:
+        la case (x, y) d'une arène de la dimension donnée correspond au bit x * dimension + y.
+        Les cases hors de l'arène sont ignorées.
+
+        Args:
+            dimension (int): La dimension de l'arène
+
+        Returns:
+            int: Le masque des cases traversées
+        """
+        masque = 0
+        for x, y in self.trajectoire[:-1]:
+            if 0 <= x < dimension and 0 <= y < dimension:
+                masque |= 1 << (x * dimension + y)
+        return masque
+
     def obtenir_direction(self, angle):
         """
         À partir d'un point cardinal, retourne la différence entre l'emplacement précédent et
@@ -82,6 +127,7 @@ class Lancer:
         À chaque déplacement du dé dans l'arène, il y a une chance sur 16
         que celui-ci se mette à aller plus vers sa gauche, une chance sur 16
         qu'il aille plus vers la droite, et 7 chances sur 8 qu'il ne dévie pas.
+        La déviation obtenue est ajoutée à Lancer.deviations.
 
         Args:
             dir_base ((int, int)): La direction de base, avant déviation
@@ -89,13 +135,16 @@ class Lancer:
         Returns:
             (int, int): La direction, une fois (possiblement) déviée
         """
-        devier = randint(0, 15)
+        devier = self.generateur.randint(0, 15)
         if devier == 0:  # rotation sens horaire
             rotation = ((1, 1), (-1, 1))
+            self.deviations.append(DEVIATION_HORAIRE)
         elif devier == 1:  # rotation sens anti-horaire
             rotation = ((1, -1), (1, 1))
+            self.deviations.append(DEVIATION_ANTIHORAIRE)
         else:  # pas de déviation
             rotation = ((1, 0), (0, 1))
+            self.deviations.append(DEVIATION_AUCUNE)
 
         dir_x = self.signe(rotation[0][0] * dir_base[0] + rotation[0][1] * dir_base[1])
         dir_y = self.signe(rotation[1][0] * dir_base[0] + rotation[1][1] * dir_base[1])
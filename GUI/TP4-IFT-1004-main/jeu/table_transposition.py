@@ -0,0 +1,130 @@
+"""
+La classe TableTransposition
+
+Mémoire bornée des évaluations de positions déjà rencontrées, indexée par empreinte
+de Zobrist (jeu.zobrist), pour qu'un joueur qui cherche n'évalue pas deux fois la même
+position (ce qui arrive souvent, par exemple après une table rase).
+"""
+
+# Les politiques de remplacement possibles, lorsqu'une case de la table est déjà occupée.
+POLITIQUES = ('profondeur', 'toujours')
+
+
+class TableTransposition:
+    """ Table de hachage de taille fixe, dont chaque case contient au plus une entrée.
+
+    L'entrée d'une empreinte est rangée dans la case empreinte % taille. Lorsque cette case
+    est déjà occupée par une autre empreinte, la politique décide:
+      - 'profondeur': la nouvelle entrée ne remplace l'ancienne que si elle a été calculée
+        avec au moins autant d'effort (profondeur, nombre de simulations, etc.);
+      - 'toujours': la nouvelle entrée remplace toujours l'ancienne.
+    Une entrée pour la même empreinte est toujours mise à jour.
+
+    Attributes:
+        taille (int): Le nombre de cases de la table.
+        politique (str): La politique de remplacement ('profondeur' ou 'toujours').
+        cases (list): Les entrées, sous la forme (empreinte, profondeur, donnees), ou None.
+        consultations (int): Le nombre de consultations.
+        succes (int): Le nombre de consultations ayant trouvé une entrée utilisable.
+        collisions (int): Le nombre de consultations tombées sur la case d'une autre empreinte.
+        remplacements (int): Le nombre d'entrées écrasées par celles d'une autre empreinte.
+        rejets (int): Le nombre d'entrées refusées par la politique 'profondeur'.
+    """
+
+    def __init__(self, taille=1 << 16, politique='profondeur'):
+        """
+        Constructeur de la classe TableTransposition.
+
+        Args:
+            taille (int, optional): Le nombre de cases de la table. Défaut: 65536
+            politique (str, optional): La politique de remplacement. Défaut: 'profondeur'
+        """
+        if taille < 1:
+            raise ValueError("La table doit avoir au moins une case.")
+        if politique not in POLITIQUES:
+            raise ValueError("Politique inconnue: {} (choix: {})".format(politique, ', '.join(POLITIQUES)))
+        self.taille = taille
+        self.politique = politique
+        self.cases = [None] * taille
+        self.consultations = 0
+        self.succes = 0
+        self.collisions = 0
+        self.remplacements = 0
+        self.rejets = 0
+
+    def consulter(self, empreinte, profondeur_minimale=0):
+        """
+        Cherche l'entrée d'une empreinte.
+
+        Args:
+            empreinte (int): L'empreinte de la position
+            profondeur_minimale (int, optional): L'effort minimal pour que l'entrée soit utilisable. Défaut: 0
+
+        Returns:
+            Les données de l'entrée, ou None s'il n'y en a pas d'utilisable
+        """
+        self.consultations += 1
+        entree = self.cases[empreinte % self.taille]
+        if entree is None:
+            return None
+        if entree[0] != empreinte:
+            self.collisions += 1
+            return None
+        if entree[1] < profondeur_minimale:
+            return None
+        self.succes += 1
+        return entree[2]
+
+    def enregistrer(self, empreinte, profondeur, donnees):
+        """
+        Enregistre l'entrée d'une empreinte, selon la politique de remplacement.
+
+        Args:
+            empreinte (int): L'empreinte de la position
+            profondeur (int): L'effort consacré au calcul des données
+            donnees: Les données à conserver
+
+        Returns:
+            bool: True si l'entrée a été enregistrée
+        """
+        indice = empreinte % self.taille
+        entree = self.cases[indice]
+        if entree is not None and entree[0] != empreinte:
+            if self.politique == 'profondeur' and profondeur < entree[1]:
+                self.rejets += 1
+                return False
+            self.remplacements += 1
+        self.cases[indice] = (empreinte, profondeur, donnees)
+        return True
+
+    def vider(self):
+        """
+        Retire toutes les entrées, sans remettre les statistiques à zéro.
+        """
+        self.cases = [None] * self.taille
+
+    def taux_succes(self):
+        """
+        Donne la proportion des consultations ayant trouvé une entrée utilisable.
+
+        Returns:
+            float: Le taux de succès (0 s'il n'y a eu aucune consultation)
+        """
+        return self.succes / self.consultations if self.consultations > 0 else 0.0
+
+    def statistiques(self):
+        """
+        Donne les statistiques d'utilisation de la table.
+
+        Returns:
+            dict: Les compteurs, le taux de succès et le taux de remplissage
+        """
+        return {
+            'consultations': self.consultations,
+            'succes': self.succes,
+            'taux_succes': self.taux_succes(),
+            'collisions': self.collisions,
+            'remplacements': self.remplacements,
+            'rejets': self.rejets,
+            'remplissage': sum(1 for entree in self.cases if entree is not None) / self.taille,
+        }
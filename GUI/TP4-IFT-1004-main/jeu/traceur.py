@@ -0,0 +1,197 @@
+"""
+Le traceur: mesure, sur demande, le temps passé dans les étapes de la partie et dans
+l'affichage, et l'écrit au format Chrome Trace Event (JSON), lisible par chrome://tracing
+ou https://ui.perfetto.dev.
+
+Les modules déclarent leurs points de trace (tracer) au chargement, mais rien n'est modifié
+tant que le traceur n'est pas activé: sans traceur, les méthodes sont les originales, sans
+aucun coût. activer remplace chaque méthode déclarée par une version qui enregistre un
+intervalle (temps réel et temps processeur du fil); desactiver remet les originales.
+
+Pour les méthodes d'affichage qui reçoivent une suite (le dernier argument), on enregistre
+aussi l'attente entre la fin de l'appel et l'exécution de la suite (Tk.after, animations):
+on distingue ainsi le temps du moteur, celui des dessins, et celui passé à attendre.
+"""
+
+import json
+import os
+import threading
+from functools import wraps
+from time import perf_counter_ns, thread_time_ns
+
+# La catégorie des intervalles d'attente d'une suite.
+CATEGORIE_ATTENTE = 'attente'
+
+
+class Traceur:
+    """ Accumule les intervalles mesurés, puis les écrit au format Chrome Trace Event.
+
+    Attributes:
+        evenements (list): Les intervalles (nom, catégorie, fil, début, durée, début cpu, durée cpu),
+            en nanosecondes, le début relatif à l'origine du traceur.
+        origine (int): Le moment de la création du traceur (time.perf_counter_ns).
+        pid (int): Le processus tracé.
+    """
+
+    def __init__(self):
+        """
+        Constructeur de la classe Traceur.
+        """
+        self.evenements = []
+        self.origine = perf_counter_ns()
+        self.pid = os.getpid()
+
+    def ajouter(self, nom, categorie, debut, fin, debut_cpu=None, fin_cpu=None):
+        """
+        Ajoute un intervalle.
+
+        Args:
+            nom (str): Le nom de l'intervalle
+            categorie (str): Sa catégorie (jeu, arene, affichage, attente)
+            debut (int): Son début (time.perf_counter_ns)
+            fin (int): Sa fin (time.perf_counter_ns)
+            debut_cpu (int, optional): Le temps processeur du fil au début (time.thread_time_ns). Défaut: None
+            fin_cpu (int, optional): Le temps processeur du fil à la fin. Défaut: None
+        """
+        self.evenements.append((nom, categorie, threading.get_ident(), debut - self.origine, fin - debut,
+                                debut_cpu, None if debut_cpu is None else fin_cpu - debut_cpu))
+
+    def trace_chrome(self):
+        """
+        Returns:
+            dict: Les intervalles au format Chrome Trace Event (événements complets « X »,
+                en microsecondes, avec le temps processeur dans tts et tdur)
+        """
+        evenements = []
+        for nom, categorie, fil, debut, duree, debut_cpu, duree_cpu in self.evenements:
+            evenement = {'name': nom, 'cat': categorie, 'ph': 'X', 'pid': self.pid, 'tid': fil,
+                         'ts': debut / 1000, 'dur': duree / 1000}
+            if debut_cpu is not None:
+                evenement['tts'] = debut_cpu / 1000
+                evenement['tdur'] = duree_cpu / 1000
+                evenement['args'] = {'cpu_ms': duree_cpu / 1e6}
+            evenements.append(evenement)
+        return {'traceEvents': evenements, 'displayTimeUnit': 'ms'}
+
+    def exporter(self, chemin):
+        """
+        Écrit la trace dans un fichier JSON.
+
+        Args:
+            chemin (str): Le fichier
+        """
+        with open(chemin, 'w', encoding='utf-8') as fichier:
+            json.dump(self.trace_chrome(), fichier)
+
+
+# Les points de trace déclarés: (classe, nom de la méthode, catégorie, attente).
+points_trace = []
+
+# Le traceur actif (None si le traçage est désactivé), et les méthodes originales qu'il a remplacées.
+traceur_actif = None
+originaux = []
+
+
+def tracer(classe, noms_methodes, categorie, attente=False):
+    """
+    Déclare des points de trace. Si le traceur est déjà actif, ils sont instrumentés tout de suite.
+
+    Args:
+        classe (type): La classe qui définit les méthodes
+        noms_methodes (list): Les noms des méthodes à tracer
+        categorie (str): La catégorie de leurs intervalles
+        attente (bool, optional): Si True, le dernier argument des méthodes est une suite,
+            dont l'attente est aussi mesurée. Défaut: False
+    """
+    for nom in noms_methodes:
+        point = (classe, nom, categorie, attente)
+        points_trace.append(point)
+        if traceur_actif is not None:
+            instrumenter(point)
+
+
+def envelopper_suite(traceur, nom, suite, etat):
+    """
+    Enveloppe une suite pour mesurer son attente: de la fin de l'appel qui l'a reçue
+    (etat['fin']) jusqu'à son exécution. Une suite exécutée avant la fin de cet appel
+    (affichage synchrone) n'a pas d'attente.
+
+    Args:
+        traceur (Traceur): Le traceur
+        nom (str): Le nom de l'appel qui a reçu la suite
+        suite (fonction): La suite
+        etat (dict): Partagé avec l'appel, qui y inscrit sa fin
+
+    Returns:
+        fonction: La suite enveloppée
+    """
+    @wraps(suite)
+    def suite_tracee(*args, **kwargs):
+        if etat['fin'] is not None:
+            traceur.ajouter('attente ' + nom, CATEGORIE_ATTENTE, etat['fin'], perf_counter_ns())
+        return suite(*args, **kwargs)
+    return suite_tracee
+
+
+def instrumenter(point):
+    """
+    Remplace une méthode déclarée par sa version tracée et retient l'originale.
+
+    Args:
+        point (tuple): Le point de trace (classe, nom, catégorie, attente)
+    """
+    classe, nom_methode, categorie, attente = point
+    methode = classe.__dict__[nom_methode]
+    traceur = traceur_actif
+    nom = '{}.{}'.format(classe.__name__, nom_methode)
+
+    @wraps(methode)
+    def methode_tracee(*args, **kwargs):
+        etat = None
+        if attente and len(args) > 1 and callable(args[-1]):
+            etat = {'fin': None}
+            args = args[:-1] + (envelopper_suite(traceur, nom, args[-1], etat),)
+        debut, debut_cpu = perf_counter_ns(), thread_time_ns()
+        try:
+            return methode(*args, **kwargs)
+        finally:
+            fin = perf_counter_ns()
+            traceur.ajouter(nom, categorie, debut, fin, debut_cpu, thread_time_ns())
+            if etat is not None:
+                etat['fin'] = fin
+
+    originaux.append((classe, nom_methode, methode))
+    setattr(classe, nom_methode, methode_tracee)
+
+
+def activer(traceur=None):
+    """
+    Active le traçage de tous les points déclarés.
+
+    Args:
+        traceur (Traceur, optional): Le traceur qui reçoit les intervalles. Défaut: un nouveau Traceur
+
+    Returns:
+        Traceur: Le traceur actif
+    """
+    global traceur_actif
+    desactiver()
+    traceur_actif = Traceur() if traceur is None else traceur
+    for point in points_trace:
+        instrumenter(point)
+    return traceur_actif
+
+
+def desactiver():
+    """
+    Désactive le traçage: les méthodes originales sont remises en place.
+
+    Returns:
+        Traceur: Le traceur qui était actif (None s'il n'y en avait pas)
+    """
+    global traceur_actif
+    while len(originaux) > 0:
+        classe, nom_methode, methode = originaux.pop()
+        setattr(classe, nom_methode, methode)
+    traceur, traceur_actif = traceur_actif, None
+    return traceur
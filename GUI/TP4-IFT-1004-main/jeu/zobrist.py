@@ -0,0 +1,106 @@
+"""
+Les clés de Zobrist
+
+Fonctions donnant une clé aléatoire de 64 bits à chaque élément de l'état d'une partie:
+un dé d'une valeur donnée sur une case, le nombre de dés d'un joueur, le joueur en cours
+et le premier lancer du tour. L'empreinte d'un état est le ou exclusif (XOR) des clés de
+ses éléments: changer un élément se fait donc en temps constant, en retirant son ancienne
+clé et en ajoutant la nouvelle (le XOR est sa propre inverse).
+
+Comme la dimension de l'arène n'est pas bornée, les clés ne sont pas tirées d'avance dans
+une table: elles sont calculées en mélangeant les coordonnées et la valeur par la fonction
+de mélange de SplitMix64, ce qui donne toujours la même clé pour le même élément, d'un
+processus à l'autre.
+"""
+
+from functools import lru_cache
+
+MASQUE_64 = (1 << 64) - 1
+
+# Les domaines séparent les clés des différents types d'éléments.
+DOMAINE_DE = 1
+DOMAINE_JOUEUR = 2
+DOMAINE_TOUR = 3
+DOMAINE_PREMIER_LANCER = 4
+
+
+def melanger(x):
+    """
+    Fonction de mélange de SplitMix64: donne un entier de 64 bits d'apparence aléatoire,
+    où chaque bit de l'entrée influence chaque bit de la sortie.
+
+    Args:
+        x (int): L'entier à mélanger
+
+    Returns:
+        int: L'entier mélangé, sur 64 bits
+    """
+    z = (x + 0x9E3779B97F4A7C15) & MASQUE_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASQUE_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASQUE_64
+    return z ^ (z >> 31)
+
+
+@lru_cache(maxsize=1 << 16)
+def cle_de(emplacement, valeur):
+    """
+    Donne la clé d'un dé d'une valeur sur une case.
+
+    Args:
+        emplacement ((int, int)): La case
+        valeur (int): La valeur du dé (1 pour X, 2 à 6)
+
+    Returns:
+        int: La clé de 64 bits
+    """
+    x, y = emplacement
+    return melanger(melanger(melanger(melanger(DOMAINE_DE) ^ x) ^ y) ^ valeur)
+
+
+@lru_cache(maxsize=1 << 10)
+def cle_joueur(index, nombre_des):
+    """
+    Donne la clé du nombre de dés d'un joueur.
+
+    Args:
+        index (int): L'index du joueur dans la liste des joueurs
+        nombre_des (int): Le nombre de dés du joueur
+
+    Returns:
+        int: La clé de 64 bits
+    """
+    return melanger(melanger(melanger(DOMAINE_JOUEUR) ^ index) ^ nombre_des)
+
+
+def cle_tour(joueur_index):
+    """
+    Donne la clé du joueur en cours.
+
+    Args:
+        joueur_index (int): L'index du joueur en cours
+
+    Returns:
+        int: La clé de 64 bits
+    """
+    return melanger(melanger(DOMAINE_TOUR) ^ joueur_index)
+
+
+# La clé ajoutée lorsque le joueur en cours n'a pas encore lancé.
+CLE_PREMIER_LANCER = melanger(DOMAINE_PREMIER_LANCER)
+
+
+def empreinte_plateau(plateau):
+    """
+    Calcule l'empreinte d'un plateau à partir de zéro (Arene.empreinte la tient plutôt à jour
+    à chaque changement).
+
+    Args:
+        plateau (dict): Les valeurs des dés, par emplacement
+
+    Returns:
+        int: L'empreinte de 64 bits
+    """
+    empreinte = 0
+    for emplacement, valeur in plateau.items():
+        empreinte ^= cle_de(emplacement, valeur)
+    return empreinte
@@ -1,11 +1,28 @@
+import argparse
+
 from interface.fenetre_principale import FenetrePrincipale
+from jeu import traceur
 
 ########################################
 # Point d'entrée du TP4
 ########################################
 
-fenetre_principale = FenetrePrincipale()
-fenetre_principale.mainloop()
+# Le joueur JoueurOrdinateurMCTS simule des parties dans d'autres processus, qui peuvent
+# importer ce module: la fenêtre ne doit donc être créée que si on l'exécute directement.
+if __name__ == '__main__':
+    parseur = argparse.ArgumentParser(description="Les GlaDÉateurs.")
+    parseur.add_argument('--trace', metavar='FICHIER',
+                         help="Tracer les étapes du jeu et de l'affichage (jeu.traceur) dans ce fichier "
+                              "JSON, écrit à la fermeture de la fenêtre")
+    arguments = parseur.parse_args()
+    if arguments.trace is not None:
+        traceur.activer()
+
+    fenetre_principale = FenetrePrincipale()
+    fenetre_principale.mainloop()
+
+    if arguments.trace is not None:
+        traceur.desactiver().exporter(arguments.trace)
 
 # défi dessiner dé dans canvas_arene ligne 114
 # défi lecture fichier dans fenetre_introduction ligne 206
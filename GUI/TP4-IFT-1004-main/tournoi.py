@@ -0,0 +1,327 @@
+"""
+Tournoi entre joueurs ordinateurs.
+
+Joue plusieurs parties complètes sans interface graphique (GestionnaireIONul), réparties
+sur plusieurs processus, puis affiche les taux de victoire, la longueur des parties et
+le nombre de tours. Sert à ajuster les stratégies (par exemple JoueurOrdinateur.decision_continuer)
+par simulation.
+
+Chaque partie reçoit son propre flux aléatoire (GenerateurAleatoire.sous_flux), dérivé de
+la graine du tournoi et du numéro de la partie: les résultats sont donc identiques peu
+importe le nombre de processus.
+
+Avec --journal, chaque partie est aussi journalisée (jeu.journal_partie) dans un seul fichier
+binaire, dans l'ordre des parties.
+
+Avec --trace, les étapes du moteur sont tracées (jeu.traceur) et écrites au format Chrome
+Trace Event; les parties sont alors toutes jouées dans le processus courant.
+
+Exemple:
+    python tournoi.py --parties 2000 --joueurs ordinateur ordinateur:probabilite_arret=0.5
+"""
+
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import import_module
+from math import sqrt
+
+from jeu.de import De
+from jeu.gladeateur import Gladeateur
+from jeu.gestionnaire_io_nul import GestionnaireIONul
+from jeu.hasard import GenerateurAleatoire
+from jeu.journal_partie import EcrivainJournal
+from jeu import traceur
+
+# Les stratégies de joueur disponibles, sous la forme <nom, classe>.
+# La classe est donnée par son chemin, afin de ne l'importer que dans les processus qui s'en servent.
+STRATEGIES = {
+    'ordinateur': 'interface.joueur_ordinateur.JoueurOrdinateur',
+    'esperance': 'interface.joueur_ordinateur_esperance.JoueurOrdinateurEsperance',
+    'mcts': 'interface.joueur_ordinateur_mcts.JoueurOrdinateurMCTS',
+}
+
+# Les représentations d'arène disponibles, sous la forme <nom, classe>.
+ARENES = {
+    'dictionnaire': 'jeu.arene.Arene',
+    'bitboard': 'jeu.arene_bitboard.AreneBitboard',
+}
+
+
+def importer_classe(chemin):
+    """
+    Importe une classe à partir de son chemin complet (module.Classe).
+
+    Args:
+        chemin (str): Le chemin de la classe
+
+    Returns:
+        type: La classe importée
+    """
+    nom_module, nom_classe = chemin.rsplit('.', 1)
+    return getattr(import_module(nom_module), nom_classe)
+
+
+def convertir_valeur(texte):
+    """
+    Convertit un paramètre de stratégie en entier ou en réel si possible.
+
+    Args:
+        texte (str): La valeur écrite sur la ligne de commande
+
+    Returns:
+        int, float ou str: La valeur convertie
+    """
+    for conversion in (int, float):
+        try:
+            return conversion(texte)
+        except ValueError:
+            pass
+    return texte
+
+
+def analyser_strategie(specification):
+    """
+    Analyse une stratégie écrite sous la forme nom ou nom:parametre=valeur,parametre=valeur.
+
+    Args:
+        specification (str): La stratégie écrite sur la ligne de commande
+
+    Returns:
+        (str, dict): Le nom de la stratégie et ses paramètres
+    """
+    nom, _, texte_parametres = specification.partition(':')
+    if nom not in STRATEGIES:
+        raise argparse.ArgumentTypeError(
+            "Stratégie inconnue: {} (choix: {})".format(nom, ', '.join(STRATEGIES)))
+    parametres = {}
+    for paire in filter(None, texte_parametres.split(',')):
+        cle, egal, valeur = paire.partition('=')
+        if not egal:
+            raise argparse.ArgumentTypeError("Paramètre invalide: {}".format(paire))
+        parametres[cle] = convertir_valeur(valeur)
+    return nom, parametres
+
+
+def jouer_partie(tache):
+    """
+    Joue une partie complète du tournoi. Exécutée dans un processus du bassin.
+
+    Args:
+        tache (dict): La description de la partie (numéro, graine, joueurs, arène, etc.)
+
+    Returns:
+        dict: Le résultat de la partie
+    """
+    generateur = GenerateurAleatoire(tache['graine']).sous_flux(tache['numero'])
+    classe_arene = importer_classe(ARENES[tache['arene']])
+    arene = classe_arene(tache['dimension'], De(), 1, generateur)
+
+    # Les joueurs changent de place d'une partie à l'autre, pour ne pas avantager
+    # toujours la même stratégie en la faisant jouer en premier.
+    n_joueurs = len(tache['strategies'])
+    decalage = tache['numero'] % n_joueurs if tache['rotation'] else 0
+    ordre = [(decalage + i) % n_joueurs for i in range(n_joueurs)]
+    joueurs = []
+    for place, index_strategie in enumerate(ordre):
+        nom, parametres = tache['strategies'][index_strategie]
+        classe_joueur = importer_classe(STRATEGIES[nom])
+        des = [De() for _ in range(tache['nombre_des'])]
+        joueurs.append(classe_joueur(place + 1, des, arene, **parametres))
+
+    # Le journal est écrit en mémoire, puis renvoyé au processus principal avec le résultat.
+    journal = EcrivainJournal(io.BytesIO(), entete=False) if tache['journal'] else None
+    gestionnaire_io = GestionnaireIONul(tache['limite_lancers'])
+    debut = time.perf_counter()
+    vainqueur = gestionnaire_io.executer(Gladeateur(joueurs, arene, gestionnaire_io, journal))
+    duree = time.perf_counter() - debut
+
+    resultat = {
+        'numero': tache['numero'],
+        'vainqueur': None if vainqueur is None else ordre[joueurs.index(vainqueur)],
+        'lancers': gestionnaire_io.nombre_lancers,
+        'tours': gestionnaire_io.nombre_tours,
+        'tables_rases': gestionnaire_io.nombre_tables_rases,
+        'duree': duree,
+    }
+    if journal is not None:
+        if vainqueur is None:
+            journal.ecrire_victoire(None)
+        resultat['journal'] = journal.fichier.getvalue()
+    return resultat
+
+
+def jouer_tournoi(strategies, parties, dimension, nombre_des, graine, processus,
+                  arene='dictionnaire', limite_lancers=10000, rotation=True, journal=False):
+    """
+    Joue toutes les parties du tournoi, réparties sur un bassin de processus.
+
+    Args:
+        strategies (list): Les stratégies (nom, paramètres) des joueurs
+        parties (int): Le nombre de parties à jouer
+        dimension (int): La dimension de l'arène
+        nombre_des (int): Le nombre de dés par joueur
+        graine (int): La graine du tournoi
+        processus (int): Le nombre de processus (1 pour tout jouer dans le processus courant)
+        arene (str): La représentation d'arène à utiliser (une clé de ARENES)
+        limite_lancers (int): Nombre de lancers après lequel une partie est déclarée nulle
+        rotation (bool): Si True, l'ordre des joueurs change d'une partie à l'autre
+        journal (bool): Si True, chaque résultat contient aussi le journal de la partie (en octets)
+
+    Returns:
+        list: Les résultats des parties, dans l'ordre de leur numéro
+    """
+    taches = [{
+        'numero': numero,
+        'graine': graine,
+        'strategies': strategies,
+        'arene': arene,
+        'dimension': dimension,
+        'nombre_des': nombre_des,
+        'limite_lancers': limite_lancers,
+        'rotation': rotation,
+        'journal': journal,
+    } for numero in range(parties)]
+
+    if processus == 1:
+        return [jouer_partie(tache) for tache in taches]
+
+    # De gros paquets réduisent le coût des échanges entre processus, mais il en faut
+    # assez pour que tous les processus restent occupés jusqu'à la fin.
+    taille_paquet = max(1, parties // (processus * 8))
+    with ProcessPoolExecutor(max_workers=processus) as bassin:
+        return list(bassin.map(jouer_partie, taches, chunksize=taille_paquet))
+
+
+def resumer(strategies, resultats, duree):
+    """
+    Calcule les statistiques du tournoi.
+
+    Args:
+        strategies (list): Les stratégies (nom, paramètres) des joueurs
+        resultats (list): Les résultats des parties
+        duree (float): La durée totale du tournoi, en secondes
+
+    Returns:
+        dict: Les statistiques du tournoi
+    """
+    n_parties = len(resultats)
+    joueurs = []
+    for index, (nom, parametres) in enumerate(strategies):
+        victoires = sum(1 for resultat in resultats if resultat['vainqueur'] == index)
+        taux = victoires / n_parties
+        joueurs.append({
+            'strategie': nom,
+            'parametres': parametres,
+            'victoires': victoires,
+            'taux_victoire': taux,
+            # Intervalle de confiance à 95 % (approximation normale).
+            'marge_95': 1.96 * sqrt(taux * (1 - taux) / n_parties),
+        })
+
+    return {
+        'parties': n_parties,
+        'nulles': sum(1 for resultat in resultats if resultat['vainqueur'] is None),
+        'joueurs': joueurs,
+        'lancers_moyen': sum(resultat['lancers'] for resultat in resultats) / n_parties,
+        'lancers_max': max(resultat['lancers'] for resultat in resultats),
+        'tours_moyen': sum(resultat['tours'] for resultat in resultats) / n_parties,
+        'tables_rases_moyen': sum(resultat['tables_rases'] for resultat in resultats) / n_parties,
+        'duree_partie_moyenne': sum(resultat['duree'] for resultat in resultats) / n_parties,
+        'duree': duree,
+        'parties_par_seconde': n_parties / duree if duree > 0 else float('inf'),
+    }
+
+
+def afficher_resume(resume):
+    """
+    Affiche les statistiques du tournoi en console.
+
+    Args:
+        resume (dict): Les statistiques calculées par resumer
+    """
+    print("{} parties en {:.2f} s ({:.1f} parties/s), {} nulles".format(
+        resume['parties'], resume['duree'], resume['parties_par_seconde'], resume['nulles']))
+    print()
+    print("{:<4}{:<40}{:>10}{:>16}".format('#', 'Stratégie', 'Victoires', 'Taux'))
+    for index, joueur in enumerate(resume['joueurs']):
+        description = joueur['strategie']
+        if joueur['parametres']:
+            description += ' ' + ', '.join('{}={}'.format(cle, valeur)
+                                           for cle, valeur in joueur['parametres'].items())
+        print("{:<4}{:<40}{:>10}{:>9.1%} ±{:.1%}".format(
+            index + 1, description, joueur['victoires'], joueur['taux_victoire'], joueur['marge_95']))
+    print()
+    print("Lancers par partie: {:.1f} en moyenne, {} au maximum".format(
+        resume['lancers_moyen'], resume['lancers_max']))
+    print("Tours par partie: {:.1f} en moyenne".format(resume['tours_moyen']))
+    print("Tables rases par partie: {:.2f} en moyenne".format(resume['tables_rases_moyen']))
+    print("Durée d'une partie: {:.2f} ms en moyenne".format(1000 * resume['duree_partie_moyenne']))
+
+
+def analyser_arguments():
+    """
+    Lit les arguments de la ligne de commande.
+
+    Returns:
+        argparse.Namespace: Les arguments
+    """
+    parseur = argparse.ArgumentParser(description="Tournoi entre joueurs ordinateurs des GlaDÉateurs.")
+    parseur.add_argument('--joueurs', nargs='+', type=analyser_strategie,
+                         default=[('ordinateur', {}), ('ordinateur', {})],
+                         help="Stratégies des joueurs (2 à 5), sous la forme nom ou "
+                              "nom:parametre=valeur,... (choix: {})".format(', '.join(STRATEGIES)))
+    parseur.add_argument('--parties', type=int, default=1000, help="Nombre de parties")
+    parseur.add_argument('--dimension', type=int, default=5, help="Dimension de l'arène")
+    parseur.add_argument('--des', type=int, default=10, help="Nombre de dés par joueur")
+    parseur.add_argument('--graine', type=int, default=0, help="Graine du tournoi")
+    parseur.add_argument('--processus', type=int, default=os.cpu_count(),
+                         help="Nombre de processus (défaut: nombre de coeurs)")
+    parseur.add_argument('--arene', choices=sorted(ARENES), default='dictionnaire',
+                         help="Représentation de l'arène")
+    parseur.add_argument('--limite-lancers', type=int, default=10000,
+                         help="Nombre de lancers après lequel une partie est déclarée nulle")
+    parseur.add_argument('--sans-rotation', action='store_true',
+                         help="Garder toujours le même ordre de jeu")
+    parseur.add_argument('--json', action='store_true', help="Afficher le résumé en JSON")
+    parseur.add_argument('--journal', metavar='FICHIER', help="Journaliser toutes les parties dans ce fichier")
+    parseur.add_argument('--trace', metavar='FICHIER',
+                         help="Tracer les étapes du moteur dans ce fichier JSON (un seul processus)")
+    arguments = parseur.parse_args()
+
+    if not 2 <= len(arguments.joueurs) <= 5:
+        parseur.error("Il faut entre 2 et 5 joueurs.")
+    if arguments.dimension < 3:
+        parseur.error("La dimension doit être un entier >= 3.")
+    if not 1 <= arguments.des <= 15:
+        parseur.error("Le nombre de dés doit être un entier entre 1 et 15.")
+    if arguments.parties < 1 or arguments.processus < 1:
+        parseur.error("Le nombre de parties et de processus doit être positif.")
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = analyser_arguments()
+    if arguments.trace is not None:
+        traceur.activer()
+        arguments.processus = 1
+    debut = time.perf_counter()
+    resultats = jouer_tournoi(arguments.joueurs, arguments.parties, arguments.dimension,
+                              arguments.des, arguments.graine, arguments.processus,
+                              arguments.arene, arguments.limite_lancers,
+                              not arguments.sans_rotation, arguments.journal is not None)
+    duree = time.perf_counter() - debut
+    if arguments.trace is not None:
+        traceur.desactiver().exporter(arguments.trace)
+    if arguments.journal is not None:
+        with EcrivainJournal(arguments.journal) as ecrivain:
+            for resultat in resultats:
+                ecrivain.ajouter(resultat.pop('journal'))
+    resume = resumer(arguments.joueurs, resultats, duree)
+    if arguments.json:
+        print(json.dumps(resume, indent=2, ensure_ascii=False))
+    else:
+        afficher_resume(resume)